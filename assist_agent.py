@@ -1,17 +1,92 @@
 import argparse
-from local_assist_agent.main import run as run_agent
-from local_assist_agent.config import DEFAULT_SCOPES
+import sys
+from local_assist_agent.config import DEFAULT_SCOPES, USE_INDEX, SCAN_WORKERS, SEARCH_LIMIT
 
 def main():
+    if sys.argv[1:2] == ["query"]:
+        from local_assist_agent.logquery import main as query_main
+        return query_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser(description="Local Assist Agent (MVP)")
     parser.add_argument("prompt", nargs="?", help="e.g., 'delete the exe I downloaded yesterday'")
     parser.add_argument("--execute", action="store_true", help="Actually move to Trash (default: dry-run)")
     parser.add_argument("--scopes", type=str, help="Comma-separated allowed roots (optional)")
     parser.add_argument("--preview", action="store_true", help="Open OS file browser to selected files before deletion")
+    parser.add_argument("--preview-mode", choices=["auto", "perfile", "grouped", "shelf", "terminal"],
+                        help="How --preview shows files; 'terminal' prints type/size/first lines in place "
+                             "(implies --preview; default from config.PREVIEW_MODE)")
+    parser.add_argument("--report", action="store_true",
+                        help="Show a space breakdown (by type and age) of the candidates before selecting")
+    parser.add_argument("--index", action="store_true", default=USE_INDEX,
+                        help="Answer searches from the persistent metadata index (refreshed incrementally)")
+    parser.add_argument("--workers", type=int, default=SCAN_WORKERS,
+                        help="Traversal threads per device (default from config.SCAN_WORKERS; 1 = sequential)")
+    parser.add_argument("--limit", type=int, default=SEARCH_LIMIT,
+                        help="Keep only the N newest matches (bounded memory on huge trees)")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS",
+                        help="Stop searching after SECONDS and show what was found (Ctrl-C does the same)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the last search of this prompt that was cut short instead of starting over")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="Also descend into .git, node_modules, virtualenvs, caches (config.PRUNE_PATTERNS)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Run as a daemon keeping the index live with inotify (Linux); pair queries with --index")
+    parser.add_argument("--profile", nargs="?", const="agent-profile", metavar="PREFIX",
+                        help="Profile this run (in-process) into PREFIX.prof (cProfile) and PREFIX.folded (flamegraph)")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run the agent server on a Unix socket; later invocations are served warm")
+    parser.add_argument("--local", action="store_true",
+                        help="Run in this process even if an agent server is running")
+    parser.add_argument("--batch", type=str, metavar="JOBS_JSONL",
+                        help="Run a JSONL file of jobs non-interactively, sharing one scan (see local_assist_agent/batch.py)")
+    parser.add_argument("--results", type=str, metavar="OUT_JSONL", default="batch_results.jsonl",
+                        help="Where --batch writes one JSON result per job")
     args = parser.parse_args()
 
+    if args.index:
+        from local_assist_agent.skills.files import search_deadline
+        if search_deadline(args.deadline, use_index=True) is not None or args.resume:
+            parser.error("--deadline and --resume walk the scopes; they cannot be combined with --index")
+
     scopes = [p.strip() for p in args.scopes.split(",")] if args.scopes else DEFAULT_SCOPES
-    run_agent(args.prompt, execute=args.execute, scopes=scopes, preview=args.preview)
+    if args.preview_mode:
+        args.preview = True
+    if args.watch:
+        from local_assist_agent.watcher import watch
+        watch(scopes)
+        return
+    if args.batch:
+        from local_assist_agent.batch import run_batch
+        results = run_batch(args.batch, args.results, execute=args.execute, workers=args.workers)
+        print(f"{len(results)} job(s) -> {args.results}")
+        return
+    if args.serve:
+        from local_assist_agent.server import serve
+        serve(scopes)
+        return
+    search_opts = {"use_index": args.index, "workers": args.workers, "limit": args.limit,
+                   "prune": not args.no_prune, "deadline": args.deadline, "resume": args.resume}
+    if args.profile:
+        from local_assist_agent.main import run as run_agent
+        from local_assist_agent.tracing import profile
+        with profile(args.profile):
+            run_agent(args.prompt, execute=args.execute, scopes=scopes, preview=args.preview,
+                      search_opts=search_opts, report=args.report, preview_mode=args.preview_mode)
+        print(f"profile: {args.profile}.prof, {args.profile}.folded")
+        return
+    if not args.local:
+        from local_assist_agent.client import run_remote, ServerError
+        try:
+            if run_remote(args.prompt, execute=args.execute, scopes=scopes, preview=args.preview,
+                          search_opts=search_opts, report=args.report, preview_mode=args.preview_mode):
+                return
+        except ServerError as e:
+            # not retried locally: the server may already have acted on part of the request
+            print(f"Agent server error: {e} (use --local to run without the server)", file=sys.stderr)
+            sys.exit(1)
+    from local_assist_agent.main import run as run_agent
+    run_agent(args.prompt, execute=args.execute, scopes=scopes, preview=args.preview,
+              search_opts=search_opts, report=args.report, preview_mode=args.preview_mode)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,87 @@
+# Benchmark: single-pass scandir find_recent vs the legacy one-rglob-per-pattern walk.
+#
+# Usage:
+#   python benchmarks/bench_find_recent.py
+#   python benchmarks/bench_find_recent.py --dirs 400 --files-per-dir 50 --root /path/to/real/tree
+#
+import argparse, os, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from local_assist_agent.skills.files import find_recent
+from local_assist_agent.skills.scan import ScanStats
+
+PATTERNS = ["*.doc", "*.docx", "*.ppt", "*.pptx"]
+EXTS = [".doc", ".docx", ".ppt", ".pptx", ".pdf", ".txt", ".zip", ".exe", ".jpg", ".py"]
+
+
+def find_recent_rglob(roots, patterns, newer_than_days=None):
+    """The previous implementation: one rglob per pattern per root, then is_file()+stat()."""
+    cutoff = None if newer_than_days is None else time.time() - newer_than_days * 86400
+    hits = []
+    for root in roots:
+        rp = Path(root).expanduser()
+        if not rp.exists():
+            continue
+        for pat in patterns:
+            for p in rp.rglob(pat):
+                try:
+                    if not p.is_file():
+                        continue
+                    st = p.stat()
+                except Exception:
+                    continue
+                if cutoff is not None and st.st_mtime < cutoff:
+                    continue
+                hits.append((p, st.st_mtime, st.st_size))
+    hits.sort(key=lambda h: h[1], reverse=True)
+    return hits
+
+
+def build_tree(base: Path, n_dirs: int, files_per_dir: int):
+    for d in range(n_dirs):
+        sub = base / f"d{d % 20}" / f"s{d}"
+        sub.mkdir(parents=True, exist_ok=True)
+        for i in range(files_per_dir):
+            (sub / f"f{i}{EXTS[(d + i) % len(EXTS)]}").touch()
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description="find_recent traversal benchmark")
+    ap.add_argument("--dirs", type=int, default=200)
+    ap.add_argument("--files-per-dir", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--root", type=str, help="Benchmark an existing tree instead of a synthetic one")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.root or tmp
+        if not args.root:
+            build_tree(Path(tmp), args.dirs, args.files_per_dir)
+
+        legacy = find_recent_rglob([root], PATTERNS, newer_than_days=None)
+        stats = ScanStats()
+        current = find_recent([root], patterns=PATTERNS, days=None, stats=stats)
+        assert len(legacy) == len(current), (len(legacy), len(current))
+
+        t_legacy = best_of(lambda: find_recent_rglob([root], PATTERNS), args.repeat)
+        t_scan = best_of(lambda: find_recent([root], patterns=PATTERNS, days=None), args.repeat)
+
+    print(f"tree: {stats.dirs} dirs, {stats.files} files; {len(current)} matches for {', '.join(PATTERNS)}")
+    print(f"rglob x{len(PATTERNS)} : {t_legacy * 1000:8.1f} ms")
+    print(f"scandir x1 : {t_scan * 1000:8.1f} ms  ({t_legacy / max(t_scan, 1e-9):.1f}x, {stats.stat_calls} stat calls)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Benchmark: cold start (python -X importtime) of the CLI paths that should stay light.
+#
+# Usage:
+#   python benchmarks/bench_import.py
+#   python benchmarks/bench_import.py --repeat 10 --budget-ms 150
+#
+# Exits non-zero if a heavy dependency (rich, send2trash, numpy) is imported on a light
+# path, or if --budget-ms is given and a path's best wall time exceeds it.
+import argparse, os, subprocess, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY = ("rich", "send2trash", "numpy")
+PATHS = {
+    "import main": [sys.executable, "-X", "importtime", "-c", "import local_assist_agent.main"],
+    "--help": [sys.executable, "-X", "importtime", str(ROOT / "assist_agent.py"), "--help"],
+    "noop prompt": [sys.executable, "-X", "importtime", str(ROOT / "assist_agent.py"), "--local", "hello"],
+}
+
+
+def import_profile(cmd, home: str):
+    """Run `cmd` in a clean HOME; returns (wall seconds, {module: (self_us, cumulative_us)})."""
+    env = dict(os.environ, HOME=home, PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE="1")
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - t0
+    mods = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cum_us, name = (x.strip() for x in line[len("import time:"):].split("|"))
+        mods[name] = (int(self_us), int(cum_us))
+    return wall, mods
+
+
+def main():
+    ap = argparse.ArgumentParser(description="cold-start import benchmark")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=8, help="slowest modules to list per path")
+    ap.add_argument("--budget-ms", type=float, help="fail if a path's best wall time exceeds this")
+    args = ap.parse_args()
+
+    failed = False
+    for label, cmd in PATHS.items():
+        best, mods = float("inf"), {}
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as home:
+                wall, mods = import_profile(cmd, home)
+                created = os.listdir(home)
+            best = min(best, wall)
+        heavy = sorted({m.split(".")[0] for m in mods} & set(HEAVY))
+        total_ms = sum(s for s, _ in mods.values()) / 1000
+        print(f"{label:12s}: {best * 1000:7.1f} ms wall, {total_ms:6.1f} ms in imports, {len(mods)} modules"
+              + (f"  HEAVY: {', '.join(heavy)}" if heavy else ""))
+        for name, (_, cum) in sorted(mods.items(), key=lambda kv: -kv[1][1])[:args.top]:
+            print(f"    {cum / 1000:7.1f} ms  {name}")
+        if heavy or (args.budget_ms and best * 1000 > args.budget_ms):
+            failed = True
+        if label == "import main" and created:
+            print(f"    import created {created} in $HOME")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
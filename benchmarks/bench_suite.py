@@ -0,0 +1,242 @@
+# Benchmark suite over a deterministic synthetic tree: search, policies, planner, logging
+# and one full non-interactive executor run. Results are written as JSON for tracking
+# regressions across releases.
+#
+# Usage:
+#   python benchmarks/bench_suite.py --out bench.json
+#   python benchmarks/bench_suite.py --depth 4 --fanout 5 --files-per-dir 40 --repeat 7
+#   python benchmarks/bench_suite.py --compare old.json       # ratio vs an earlier run
+#
+import argparse, json, os, platform, statistics, subprocess, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synth import TreeSpec, build
+
+PROMPTS = [
+    'delete zip files older than 30 days containing "report" greater than 1 mb',
+    "remove the exe I downloaded within 7 days",
+    "clean up pdf and doc files under 100 kb",
+    "trash .pptx files older than 1 year",
+    "what's the weather",
+]
+
+
+def timeit(fn, repeat: int, number: int = 1) -> dict:
+    """Best/median milliseconds per call of fn over `repeat` rounds of `number` calls."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - t0) / number)
+    return {"best_ms": round(min(times) * 1000, 4), "median_ms": round(statistics.median(times) * 1000, 4),
+            "rounds": repeat, "calls_per_round": number}
+
+
+class _BenchSession:
+    """executor.session stand-in: output to /dev/null, scripted answers, fresh policies."""
+
+    def __init__(self, console):
+        self.console = console
+        self.asked = 0
+
+    def ask(self, prompt: str) -> str:
+        self.asked += 1
+        if prompt.startswith("Select"):
+            return "all"
+        if prompt.startswith("Type '") and "' to proceed" in prompt:
+            return prompt[len("Type '"):prompt.index("' to proceed")]
+        return "no"  # final 'yes' confirmation: never trash during a benchmark
+
+    def policy(self, scopes):
+        from local_assist_agent.policies import PolicyEngine
+        return PolicyEngine(scopes)
+
+
+def bench_search(root: str, repeat: int) -> dict:
+    from local_assist_agent.skills.files import find_recent
+    from local_assist_agent.skills.scan import ScanStats
+
+    pats = ["*.zip", "*.pdf", "*.doc", "*.docx"]
+    stats = ScanStats()
+    hits = find_recent([root], pats, days=None, stats=stats)
+    out = {
+        "find_recent": timeit(lambda: find_recent([root], pats, days=None), repeat),
+        "find_recent_limit_100": timeit(lambda: find_recent([root], pats, days=None, limit=100), repeat),
+        "find_recent_workers_4": timeit(lambda: find_recent([root], pats, days=None, workers=4), repeat),
+        "find_recent_all_files": timeit(lambda: find_recent([root], ["*"], days=None), repeat),
+    }
+    out["find_recent"].update(matches=len(hits), dirs=stats.dirs, files=stats.files, stat_calls=stats.stat_calls)
+    return out
+
+
+def bench_policies(root: str, repeat: int) -> dict:
+    from local_assist_agent.policies import PolicyEngine, in_allowed_scopes, requires_extra_confirmation
+    from local_assist_agent.skills.files import find_recent
+
+    hits = find_recent([root], ["*"], days=None)
+    paths = [h.path for h in hits]
+    scopes = [root]
+
+    def legacy():
+        for p in paths:
+            in_allowed_scopes(p, scopes)
+            requires_extra_confirmation(p)
+
+    return {
+        "policies_legacy": dict(timeit(legacy, repeat), paths=len(paths)),
+        "policy_engine_classify": dict(timeit(lambda: PolicyEngine(scopes).classify(hits), repeat), paths=len(hits)),
+        "risky_paths": sum(1 for v in PolicyEngine(scopes).classify(hits) if v.risky),
+    }
+
+
+def bench_planner(repeat: int) -> dict:
+    from local_assist_agent import planner
+
+    def cold():
+        planner._parse.cache_clear()
+        for p in PROMPTS:
+            planner.plan_from_prompt(p)
+
+    def warm():
+        for p in PROMPTS:
+            planner.plan_from_prompt(p)
+
+    return {
+        "plan_from_prompt_cold": dict(timeit(cold, repeat, 50), prompts=len(PROMPTS)),
+        "plan_from_prompt_warm": dict(timeit(warm, repeat, 50), prompts=len(PROMPTS)),
+    }
+
+
+def bench_logging(logdir: Path, repeat: int) -> dict:
+    from local_assist_agent import logging_utils as L
+
+    L.LOG_JSONL = logdir / "agent.jsonl"
+    L.LOG_FILE = logdir / "agent.log"
+    data = {"count": 3, "sample": ["/home/u/Downloads/a.zip", "/home/u/Downloads/b.zip"]}
+    n = 1000
+
+    def buffered():
+        for _ in range(n):
+            L.log_event("bench", "search.results", data)
+        L.flush()
+
+    def sync():
+        for _ in range(n // 10):
+            L.log_event("bench", "delete.result", data, sync=True)
+
+    return {
+        "log_event_buffered_1000": timeit(buffered, repeat),
+        "log_event_sync_100": timeit(sync, repeat),
+    }
+
+
+def bench_execute(root: str, repeat: int) -> dict:
+    from rich.console import Console
+    from local_assist_agent import executor
+    from local_assist_agent.planner import plan_from_prompt
+
+    plan = plan_from_prompt("delete zip and pdf files older than 7 days")
+    devnull = open(os.devnull, "w")
+    sess = _BenchSession(Console(file=devnull, width=120))
+
+    def run():
+        token = executor.session.set(sess)
+        try:
+            executor.execute(plan, do_execute=True, scopes=[root], run_id="bench")
+        finally:
+            executor.session.reset(token)
+
+    try:
+        out = {"execute_full_dry": timeit(run, repeat)}
+    finally:
+        devnull.close()
+    out["execute_full_dry"]["prompts_answered"] = sess.asked
+    return out
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _compare(new: dict, old_path: str):
+    old = json.loads(Path(old_path).read_text(encoding="utf-8"))["results"]
+    print(f"{'benchmark':32s} {'old ms':>10s} {'new ms':>10s} {'ratio':>7s}")
+    for name, r in new.items():
+        if isinstance(r, dict) and "best_ms" in r and "best_ms" in old.get(name, {}):
+            o = old[name]["best_ms"]
+            print(f"{name:32s} {o:10.3f} {r['best_ms']:10.3f} {r['best_ms'] / max(o, 1e-9):7.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="search/policy/planner/logging/executor benchmark suite")
+    ap.add_argument("--depth", type=int, default=TreeSpec.depth)
+    ap.add_argument("--fanout", type=int, default=TreeSpec.fanout)
+    ap.add_argument("--files-per-dir", type=int, default=TreeSpec.files_per_dir)
+    ap.add_argument("--risky-fraction", type=float, default=TreeSpec.risky_fraction)
+    ap.add_argument("--seed", type=int, default=TreeSpec.seed)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", type=str, help="Comma-separated groups: search,policies,planner,logging,execute")
+    ap.add_argument("--out", type=str, help="Write results JSON here (default: stdout)")
+    ap.add_argument("--compare", type=str, help="Earlier results JSON to compare against")
+    args = ap.parse_args()
+
+    spec = TreeSpec(depth=args.depth, fanout=args.fanout, files_per_dir=args.files_per_dir,
+                    risky_fraction=args.risky_fraction, seed=args.seed)
+    groups = set((args.only or "search,policies,planner,logging,execute").split(","))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = Path(tmp) / "tree"
+        t0 = time.perf_counter()
+        files = build(tree, spec, now=time.time())
+        build_s = time.perf_counter() - t0
+        root = str(tree.resolve())
+        logdir = Path(tmp) / "logs"
+        logdir.mkdir()
+        # executor runs log too; keep them out of the real ~/.local_assist_agent
+        from local_assist_agent import logging_utils as L
+        L.LOG_JSONL, L.LOG_FILE = logdir / "agent.jsonl", logdir / "agent.log"
+
+        if "search" in groups:
+            results.update(bench_search(root, args.repeat))
+        if "policies" in groups:
+            results.update(bench_policies(root, args.repeat))
+        if "planner" in groups:
+            results.update(bench_planner(args.repeat))
+        if "logging" in groups:
+            results.update(bench_logging(logdir, args.repeat))
+        if "execute" in groups:
+            results.update(bench_execute(root, args.repeat))
+        L.flush()
+
+    report = {
+        "meta": {
+            "when": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "tree": dict(spec.as_dict(), files=len(files), build_s=round(build_s, 3)),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+        print(f"wrote {args.out}")
+    else:
+        print(text)
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
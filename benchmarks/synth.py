@@ -0,0 +1,59 @@
+# Deterministic synthetic directory trees for the benchmarks.
+#
+# The same TreeSpec (seed included) always yields the same names, sizes and mtimes,
+# so timings from different releases are measured on identical trees.
+import os
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+EXTS = [".zip", ".exe", ".msi", ".pdf", ".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx",
+        ".txt", ".jpg", ".png", ".py", ".log", ""]
+RISKY_DIRS = [".ssh", "AppData", "Library", "bin", "etc"]
+WORDS = ["report", "invoice", "setup", "draft", "final", "notes", "photo", "backup", "data", "slides"]
+
+
+@dataclass
+class TreeSpec:
+    depth: int = 3                 # directory levels below the root
+    fanout: int = 4                # subdirectories per directory
+    files_per_dir: int = 25
+    size_median_kb: float = 64     # sizes are log-normal around this median
+    size_sigma: float = 2.0
+    age_mean_days: float = 60      # mtimes are exponential ages, capped at max_age_days
+    max_age_days: float = 3 * 365
+    risky_fraction: float = 0.05   # share of directories given a risky-looking name
+    seed: int = 1234
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def build(root: Path, spec: TreeSpec, now: float) -> List[Path]:
+    """Create the tree under `root`; returns the files. Contents are sparse (truncate)."""
+    rnd = random.Random(spec.seed)
+    files: List[Path] = []
+    level = [Path(root)]
+    for depth in range(spec.depth + 1):
+        nxt = []
+        for d in level:
+            d.mkdir(parents=True, exist_ok=True)
+            for i in range(spec.files_per_dir):
+                name = f"{rnd.choice(WORDS)}_{depth}_{i}{rnd.choice(EXTS)}"
+                p = d / name
+                size = int(rnd.lognormvariate(0, spec.size_sigma) * spec.size_median_kb * 1024)
+                with open(p, "wb") as f:
+                    f.truncate(size)
+                age = min(rnd.expovariate(1 / spec.age_mean_days), spec.max_age_days)
+                t = now - age * 86400
+                os.utime(p, (t, t))
+                files.append(p)
+            if depth < spec.depth:
+                for j in range(spec.fanout):
+                    if rnd.random() < spec.risky_fraction:
+                        nxt.append(d / rnd.choice(RISKY_DIRS) / f"d{j}")
+                    else:
+                        nxt.append(d / f"dir{depth}_{j}")
+        level = nxt
+    return files
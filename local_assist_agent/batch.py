@@ -0,0 +1,305 @@
+# Non-interactive batch runner: many prompts, one filesystem pass.
+#
+# jobs.jsonl, one job per line:
+#   {"id": "old-zips", "prompt": "delete zip files older than 30 days", "scopes": ["~/Downloads"],
+#    "select": "all" | "top N" | "largest N" | "name:<substr>" | "ext:zip,pdf",
+#    "execute": false, "confirm_risky": false, "confirm_bulk": false}
+#
+# All jobs are planned first. Their scopes are folded into one minimal root set and walked
+# once with the union of every job's patterns and the loosest age/size bounds, into a single
+# HitStore; each job is then answered from that store with its own filters. Jobs stop at
+# any confirmation they were not given up front, and nothing is trashed unless both the job
+# says "execute" and the runner was started with execute=True (--execute).
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import DEFAULT_SCOPES, MAX_DELETE_COUNT, MAX_TOTAL_DELETE_MB, SCAN_WORKERS
+from .planner import plan_many
+from .policies import PolicyEngine
+from .skills.files import _cutoffs, move_to_trash
+from .skills.query import CompiledQuery, dedupe
+from .skills.scan import ScanStats, walk, walk_parallel
+from .skills.prune import load_pruner
+from .skills.store import HitStore
+from . import logging_utils as L
+
+MAX_JOB_WORKERS = 8
+
+
+@dataclass
+class Job:
+    id: str
+    prompt: str
+    scopes: List[str]
+    select: str = "all"
+    execute: bool = False
+    confirm_risky: bool = False
+    confirm_bulk: bool = False
+    line: int = 0
+    run_id: str = field(default_factory=L.new_run_id)
+
+
+def _scopes(value) -> List[str]:
+    """A job's scopes: a list of path strings (a lone string is one scope), default scopes if absent."""
+    if not value:
+        return list(DEFAULT_SCOPES)
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(s, str) and s for s in value):
+        return list(value)
+    raise ValueError("'scopes' must be a path or a list of paths")
+
+
+def load_jobs(path) -> Tuple[List[Job], List[Tuple[int, dict]]]:
+    """Parse a jobs file; returns (jobs, [(line number, result)] for lines that could not be parsed)."""
+    jobs: List[Job] = []
+    bad: List[Tuple[int, dict]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                d = json.loads(line)
+                if not isinstance(d.get("prompt"), str):
+                    raise ValueError("missing 'prompt'")
+                jobs.append(Job(
+                    id=str(d.get("id") or f"line{n}"),
+                    prompt=d["prompt"],
+                    scopes=_scopes(d.get("scopes")),
+                    select=str(d.get("select") or "all"),
+                    execute=bool(d.get("execute")),
+                    confirm_risky=bool(d.get("confirm_risky")),
+                    confirm_bulk=bool(d.get("confirm_bulk")),
+                    line=n,
+                ))
+            except (ValueError, TypeError, AttributeError) as e:
+                bad.append((n, {"id": f"line{n}", "status": "error", "error": f"bad job: {e}"}))
+    return jobs, bad
+
+
+def _select(store: HitStore, idx: np.ndarray, spec: str) -> np.ndarray:
+    """Apply a selection spec to newest-first indices."""
+    s = spec.strip().lower()
+    if s == "all":
+        return idx
+    word, _, arg = s.partition(" ")
+    if word in ("top", "largest") and arg.strip().isdigit():
+        n = int(arg)
+        if word == "top":
+            return idx[:n]
+        return idx[np.argsort(-store.sizes[idx], kind="stable")[:n]]
+    key, sep, arg = s.partition(":")
+    if sep and key == "name":
+        return np.array([i for i in idx if arg in store.name_of(i).lower()], dtype=np.int64)
+    if sep and key == "ext":
+        return store.filter(idx, exts=[e.strip() for e in arg.split(",") if e.strip()])
+    raise ValueError(f"unknown selection {spec!r}")
+
+
+class SharedScan:
+    """One traversal serving many searches; each search is then a column filter over the store."""
+
+    def __init__(self, searches: List[Tuple[List[str], dict]], workers: Optional[int] = None):
+        self.stats = ScanStats()
+        bounds = [_cutoffs(p.get("days"), p.get("newer_than_days"), p.get("older_than_days"),
+                           p.get("min_size_kb"), p.get("max_size_kb")) for _, p in searches]
+        roots = [r for scopes, _ in searches for r in scopes]
+        patterns = [pat for _, p in searches for pat in (p.get("patterns") or ["*"])]
+        q = CompiledQuery(roots, patterns)
+        pruner = load_pruner(q.roots)
+        workers = SCAN_WORKERS if workers is None else workers
+        if workers > 1:
+            found = walk_parallel(q.targets(), workers, self.stats, pruner)
+        else:
+            found = (f for d, m in q.targets() for f in walk(d, m, self.stats, pruner))
+
+        # loosest bound per predicate: a bound only survives if every search has one
+        def loosest(i, pick):
+            vals = [b[i] for b in bounds]
+            return None if not vals or any(v is None for v in vals) else pick(vals)
+        lo_m, hi_m = loosest(0, min), loosest(1, max)
+        lo_s, hi_s = loosest(2, min), loosest(3, max)
+
+        self.store = HitStore.from_found(
+            (p, st) for p, st in dedupe(found)
+            if (lo_m is None or st.st_mtime >= lo_m) and (hi_m is None or st.st_mtime <= hi_m)
+            and (lo_s is None or st.st_size >= lo_s) and (hi_s is None or st.st_size <= hi_s))
+        self.roots = q.roots
+
+    def search(self, scopes: List[str], params: dict) -> np.ndarray:
+        """Newest-first indices of the store matching one search."""
+        store = self.store
+        newer, older, min_b, max_b = _cutoffs(params.get("days"), params.get("newer_than_days"),
+                                              params.get("older_than_days"), params.get("min_size_kb"),
+                                              params.get("max_size_kb"))
+        idx = store.filter(newer_cutoff=newer, older_cutoff=older, min_bytes=min_b, max_bytes=max_b)
+        q = CompiledQuery(scopes, params.get("patterns") or ["*"], params.get("name_hint"))
+        keys = [os.path.normcase(r).rstrip(os.sep) for r in q.roots]
+
+        # decide scope and matcher once per directory, then test names
+        per_dir: Dict[int, object] = {}
+        keep = []
+        for i in idx:
+            d = int(store.dir_ids[i])
+            m = per_dir.get(d, False)
+            if m is False:
+                key = os.path.normcase(store.dirs[d])
+                inside = any(key == k or key.startswith(k + os.sep) for k in keys)
+                m = per_dir[d] = q.matcher(store.dirs[d]) if inside else None
+            if m is not None and m(store.name_of(i)):
+                keep.append(i)
+        return store.newest_first(np.array(keep, dtype=np.int64))
+
+
+def _evaluate(job: Job, plan, shared: Optional[SharedScan]) -> dict:
+    """Everything up to (not including) trashing: search, policy, selection, confirmations."""
+    res = {"id": job.id, "run_id": job.run_id, "prompt": job.prompt}
+    other = [s.action for s in plan.steps
+             if s.action not in ("search_files", "select_targets", "move_to_trash", "noop")]
+    if other:
+        # e.g. find_duplicates / disk_usage: their choices need the interactive executor
+        res.update(status="unsupported", error=f"batch mode cannot run: {', '.join(other)}")
+        return res
+    search = next((s for s in plan.steps if s.action == "search_files"), None)
+    if search is None or shared is None:
+        L.log_event(job.run_id, "noop", {})
+        res["status"] = "noop"
+        return res
+    store = shared.store
+    idx = shared.search(job.scopes, search.params)
+    matched = len(idx)
+    L.log_event(job.run_id, "search.results", {
+        "count": matched, "matched": matched, "shared_scan": True,
+        "sample": [store.path_of(i) for i in idx[:5]],
+    })
+
+    policy = PolicyEngine(job.scopes)
+    idx = np.array([i for i in idx if policy.is_allowed(store[i])], dtype=np.int64)
+    try:
+        chosen = _select(store, idx, job.select)
+    except ValueError as e:
+        res.update(status="error", error=str(e), matched=matched)
+        return res
+    count = len(chosen)
+    total = int(store.sizes[chosen].sum()) if count else 0
+    res.update(matched=matched, selected=count, bytes=total)
+    if not count:
+        L.log_event(job.run_id, "selection.empty", {})
+        res["status"] = "empty"
+        return res
+    L.log_event(job.run_id, "selection.made", {"count": count, "select": job.select,
+                                               "paths": [store.path_of(i) for i in chosen[:50]]})
+
+    risky = sum(1 for i in chosen if policy.is_risky(store[i]))
+    if risky:
+        L.log_event(job.run_id, "confirm.risky", {"accepted": job.confirm_risky, "count": risky, "batch": True})
+        if not job.confirm_risky:
+            res.update(status="needs_confirmation", reason="risky", risky=risky)
+            return res
+    if count > MAX_DELETE_COUNT or total / (1024 * 1024) > MAX_TOTAL_DELETE_MB:
+        L.log_event(job.run_id, "confirm.bulk", {"accepted": job.confirm_bulk, "count": count,
+                                                 "total_mb": round(total / (1024 * 1024), 1), "batch": True})
+        if not job.confirm_bulk:
+            res.update(status="needs_confirmation", reason="bulk")
+            return res
+    res["_chosen"] = chosen
+    res["status"] = "selected"
+    return res
+
+
+def _job_failed(job: Job, res: dict, e: Exception) -> dict:
+    """Record an unexpected failure as this job's result; the rest of the batch goes on."""
+    error = f"{type(e).__name__}: {e}"
+    L.log_event(job.run_id, "error.job", {"error": error, "batch": True})
+    res.pop("_chosen", None)
+    res.update(status="error", error=error)
+    return res
+
+
+def _evaluate_job(job: Job, plan, shared: Optional[SharedScan]) -> dict:
+    try:
+        return _evaluate(job, plan, shared)
+    except Exception as e:
+        return _job_failed(job, {"id": job.id, "run_id": job.run_id, "prompt": job.prompt}, e)
+
+
+def run_batch(jobs_path, results_path, execute: bool = False, workers: Optional[int] = None) -> List[dict]:
+    """Run a jobs file end to end and write one JSON result per job (input order)."""
+    batch_id = L.new_run_id()
+    jobs, bad = load_jobs(jobs_path)
+    plans = plan_many(j.prompt for j in jobs)
+    for job, plan in zip(jobs, plans):
+        L.log_event(job.run_id, "input.prompt", {"prompt": job.prompt, "batch": batch_id, "job": job.id})
+        L.log_event(job.run_id, "plan.built",
+                    {"steps": [{"action": s.action, "params": s.params} for s in plan.steps]})
+
+    searches = [(j.scopes, s.params) for j, p in zip(jobs, plans) for s in p.steps if s.action == "search_files"]
+    shared = SharedScan(searches, workers) if searches else None
+    store = shared.store if shared else None
+
+    pool_size = max(1, min(MAX_JOB_WORKERS, len(jobs)))
+    with ThreadPoolExecutor(max_workers=pool_size) as pool:
+        results = list(pool.map(lambda jp: _evaluate_job(jp[0], jp[1], shared), zip(jobs, plans)))
+
+        # a file selected by several jobs belongs to the first of them (jobs-file order)
+        claimed = set()
+        for job, res in zip(jobs, results):
+            chosen = res.pop("_chosen", None)
+            if chosen is None:
+                continue
+            mine = np.array([i for i in chosen if int(i) not in claimed], dtype=np.int64)
+            claimed.update(int(i) for i in mine)
+            res["_chosen"] = mine
+
+        def finish(jr):
+            job, res = jr
+            try:
+                _finish(job, res)
+            except Exception as e:
+                _job_failed(job, res, e)
+
+        def _finish(job, res):
+            chosen = res.pop("_chosen", None)
+            if chosen is None:
+                return
+            paths = [store.path_of(i) for i in chosen]
+            res["paths"] = paths[:200]
+            if not (execute and job.execute):
+                L.log_event(job.run_id, "execute.dry_run", {"count": len(paths), "batch": True})
+                res["status"] = "dry_run"
+                return
+            L.log_event(job.run_id, "confirm.final", {"accepted": True, "batch": True}, sync=True)
+            ok, errs, outcomes = move_to_trash([Path(p) for p in paths])
+            nbytes = sum(int(store.sizes[i]) for i, o in zip(chosen, outcomes) if o.get("ok"))
+            L.log_event(job.run_id, "delete.result", {
+                "ok": ok, "bytes": nbytes, "errors": errs, "outcomes": outcomes[:200],
+            }, sync=True)
+            res.update(status="trashed", trashed=ok, trashed_bytes=nbytes, errors=errs)
+
+        list(pool.map(finish, zip(jobs, results)))
+
+    # rejected lines keep their place: results follow the jobs file line by line
+    results = [r for _, r in sorted([(j.line, r) for j, r in zip(jobs, results)] + bad, key=lambda t: t[0])]
+    tmp = Path(str(results_path) + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as out:
+        for r in results:
+            out.write(json.dumps(r, default=str) + "\n")
+    os.replace(tmp, results_path)
+
+    L.log_event(batch_id, "batch.summary", {
+        "jobs": len(results),
+        "roots": shared.roots if shared else [],
+        "files_seen": shared.stats.files if shared else 0,
+        "dirs_scanned": shared.stats.dirs if shared else 0,
+        "dirs_pruned": shared.stats.pruned if shared else 0,
+        "by_status": {s: sum(1 for r in results if r.get("status") == s)
+                      for s in sorted({r.get("status") for r in results})},
+    })
+    L.flush()
+    return results
@@ -0,0 +1,81 @@
+# Thin client for server.py. Deliberately light on imports: it is what a CLI
+# invocation loads when a server is running, so it must not pull in the agent itself.
+import os
+import sys
+import json
+import shutil
+import socket
+from typing import Callable, Optional
+
+from .config import SERVER_SOCKET
+
+
+class ServerError(Exception):
+    """The server answered a request with an error."""
+
+
+def connect(path=SERVER_SOCKET) -> Optional[socket.socket]:
+    """A connected socket, or None when no server is listening."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.connect(str(path))
+    except OSError:
+        s.close()
+        return None
+    return s
+
+
+def _prompt(text: str) -> Optional[str]:
+    print(text, end="", flush=True)
+    try:
+        return input()
+    except EOFError:
+        return None
+
+
+def request(sock: socket.socket, msg: dict, out: Callable[[str], None] = None,
+            ask: Callable[[str], Optional[str]] = None):
+    """
+    Send one request and hold the conversation: stream "out" text to `out`, answer
+    each "ask" with `ask(prompt)` (None = end of input). Returns the "done" result.
+    """
+    out = out or (lambda t: (sys.stdout.write(t), sys.stdout.flush()))
+    ask = ask or _prompt
+    with sock, sock.makefile("rb") as rfile:
+        sock.sendall((json.dumps(msg) + "\n").encode("utf-8"))
+        for line in rfile:
+            m = json.loads(line)
+            kind = m.get("type")
+            if kind == "out":
+                out(m["text"])
+            elif kind == "ask":
+                text = ask(m["prompt"])
+                reply = {"type": "answer", "eof": True} if text is None else {"type": "answer", "text": text}
+                sock.sendall((json.dumps(reply) + "\n").encode("utf-8"))
+            elif kind == "done":
+                return m.get("result")
+            elif kind == "error":
+                raise ServerError(m.get("error"))
+    raise ServerError("server closed the connection")
+
+
+def run_remote(prompt: str, execute: bool = False, scopes=None, preview: bool = False,
+               search_opts: dict = None, report: bool = False, preview_mode: str = None,
+               path=SERVER_SOCKET) -> bool:
+    """
+    Run a prompt on the server if one is up; False means the caller should run it locally.
+    Scopes are made absolute here: the server resolves paths against its own directory.
+    """
+    sock = connect(path)
+    if sock is None:
+        return False
+    if scopes:
+        scopes = [os.path.abspath(os.path.expanduser(s)) for s in scopes]
+    request(sock, {
+        "op": "run", "prompt": prompt, "execute": execute, "scopes": scopes, "preview": preview,
+        "preview_mode": preview_mode, "search_opts": search_opts or {}, "report": report,
+        "tty": sys.stdout.isatty(), "width": shutil.get_terminal_size().columns,
+    })
+    return True
@@ -7,11 +7,65 @@ DEFAULT_SCOPES = [
     str(Path.home() / "Documents"),
 ]
 
-# Logs
+# Logs (directories are created on first write, never at import)
 LOG_DIR = Path.home() / ".local_assist_agent" / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "agent.log"
 LOG_JSONL = LOG_DIR / "agent.jsonl"  # NEW: structured events
+# Events go through a background writer; audit records (delete.result) are written synchronously
+LOG_BUFFERED = True
+LOG_QUEUE_MAX = 10_000          # records; producers block when the writer falls behind
+LOG_FLUSH_INTERVAL_S = 0.2      # max time a record waits for its batch
+# Rotate agent.jsonl / agent.log into logs/segments/*.gz past this size or age (None = off)
+LOG_ROTATE_BYTES = 16 * 1024 * 1024
+LOG_ROTATE_MAX_AGE_S = 7 * 86400
+
+# Traversal threads per device (1 = sequential walk); --workers on the CLI
+SCAN_WORKERS = 1
+
+# Keep only the N newest matches (bounded heap); None = keep all. --limit on the CLI
+SEARCH_LIMIT = None
+# Stop a search after this many seconds (None = no limit; --deadline on the CLI). A search
+# cut short by Ctrl-C returns what it found; one run with a deadline also saves a checkpoint
+# under CHECKPOINT_DIR that --resume continues from (checkpoints older than the max age are ignored).
+SEARCH_DEADLINE_S = None
+CHECKPOINT_MAX_AGE_S = 24 * 3600
+# Rows in the live "newest so far" view while a scan is running
+PAGE_SIZE = 20
+# Rows per page in the candidate selection view (only the visible page is rendered)
+SELECT_PAGE_ROWS = 50
+
+# Directories never descended into by searches (gitignore-style: a bare name matches at any
+# depth, a pattern containing '/' is relative to the scope root, '!' re-includes). A scope
+# root may add its own rules in a PRUNE_IGNORE_FILE. --no-prune on the CLI disables both.
+PRUNE_PATTERNS = [
+    ".git", ".hg", ".svn", "node_modules", "bower_components",
+    ".venv", "venv", ".tox", ".nox", "site-packages", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".gradle", ".cache",
+]
+PRUNE_IGNORE_FILE = ".assistignore"
+
+# Persistent metadata index (opt-in; --index on the CLI)
+STATE_DIR = Path.home() / ".local_assist_agent"
+INDEX_DB = STATE_DIR / "index.sqlite3"
+CHECKPOINT_DIR = STATE_DIR / "checkpoints"
+USE_INDEX = False
+# --watch keeps the index live via inotify; queries trust a watcher seen within WATCH_STALE_S
+WATCH_HEARTBEAT_S = 5
+WATCH_STALE_S = 3 * WATCH_HEARTBEAT_S
+
+# Duplicate finder: digests cached by (dev, inode, size, mtime); hashing threads
+HASH_DB = STATE_DIR / "hashes.sqlite3"
+HASH_WORKERS = 4
+DUPES_EDGE_BYTES = 4096     # head and tail bytes hashed before any full hash
+
+# Disk usage ("what's taking space in Downloads"): per-directory totals cached by dir mtime
+DU_DB = STATE_DIR / "du.sqlite3"
+DU_TOP = 15                 # rows per level in the drill-down view
+
+# --serve: long-running agent on a Unix socket; the CLI uses it transparently when it is up
+SERVER_SOCKET = STATE_DIR / "agent.sock"
+SERVER_USE_INDEX = True     # answer searches from the warm (watched) index
+SERVER_POLICY_CACHE = 32    # PolicyEngines kept per distinct scope set
 
 # Paths that require extra confirmation (prevent accidents)
 RISKY_PATTERNS = [
@@ -27,3 +81,8 @@ EXTRA_CONFIRM_PHRASE = "I UNDERSTAND"       # risky/system-like paths
 BULK_CONFIRM_PHRASE  = "I ACCEPT THE RISK"  # large selections
 # Max number of preview windows to open automatically (per run)
 PREVIEW_MAX_WINDOWS = 10
+# --preview-mode: perfile | grouped | shelf | terminal; auto = terminal when there is no GUI
+PREVIEW_MODE = "auto"
+PREVIEW_HEAD_BYTES = 4096   # per-file read cap for the terminal preview
+PREVIEW_TEXT_LINES = 4
+PREVIEW_WORKERS = 8
@@ -1,19 +1,63 @@
+import os
+import re
 import time
-from typing import List
+import contextvars
+from typing import TYPE_CHECKING, List
 
-from rich.console import Console
-from rich.table import Table
-
-from .schemas import Plan
-from .policies import in_allowed_scopes, requires_extra_confirmation
-from .skills.files import find_recent, move_to_trash
+from .schemas import Plan, HitView
+from .policies import PolicyEngine
+from .skills.files import iter_recent, NewestFirst, move_to_trash, save_checkpoint, search_deadline
+from .skills.scan import Budget, ScanStats
 from . import logging_utils as L
+from . import tracing
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.table import Table
 from .config import (
     MAX_DELETE_COUNT, MAX_TOTAL_DELETE_MB,
-    EXTRA_CONFIRM_PHRASE, BULK_CONFIRM_PHRASE
+    EXTRA_CONFIRM_PHRASE, BULK_CONFIRM_PHRASE, PAGE_SIZE, DU_TOP, SELECT_PAGE_ROWS
 )
 
-console = Console()
+_local_console = None  # rich is imported on first output, not at import time
+
+# A server session (see server.py) binds its own console, prompt and warm policy cache here;
+# without one, output goes to this process's terminal and prompts read stdin.
+session: "contextvars.ContextVar" = contextvars.ContextVar("executor_session", default=None)
+
+
+def _console() -> "Console":
+    global _local_console
+    s = session.get()
+    if s is not None:
+        return s.console
+    if _local_console is None:
+        from rich.console import Console
+        _local_console = Console()
+    return _local_console
+
+
+class _SessionConsole:
+    """`console.print(...)` goes to the current session's console, else the local one."""
+
+    def __getattr__(self, name):
+        return getattr(_console(), name)
+
+
+console = _SessionConsole()
+
+
+def _ask(prompt: str) -> str:
+    s = session.get()
+    with tracing.waiting():
+        if s is not None:
+            return s.ask(prompt)
+        print(prompt, end="")
+        return input()
+
+
+def _policy(scopes) -> PolicyEngine:
+    s = session.get()
+    return s.policy(scopes) if s is not None else PolicyEngine(scopes)
 
 
 def _fmt_size(size_bytes: int) -> str:
@@ -28,40 +72,371 @@ def _fmt_size(size_bytes: int) -> str:
     return f"{x:.1f} TB"
 
 
-def _tabulate(hits) -> Table:
-    t = Table(title="Candidates (newest first)")
+def _tabulate(hits, title: str = "Candidates (newest first)", start: int = 1,
+              limit: int | None = None) -> "Table":
+    """Rows numbered from `start`; with `limit`, only the first rows and a '... more' caption."""
+    from rich.table import Table
+    t = Table(title=title)
     t.add_column("#")
     t.add_column("Name")
     t.add_column("Path")
     t.add_column("Size")
     t.add_column("Modified")
-    for i, h in enumerate(hits, 1):
+    shown = hits if limit is None or len(hits) <= limit else hits[:limit]
+    for i, h in enumerate(shown, start):
         ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(h.mtime))
-        t.add_row(str(i), h.path.name, str(h.path), _fmt_size(h.size), ts)
+        t.add_row(str(i), h.name, h.fspath, _fmt_size(h.size), ts)
+    if shown is not hits:
+        t.caption = f"... and {len(hits) - len(shown)} more"
     return t
 
 
-def _interactive_select(hits):
+def _collect(stream, limit: int | None = None, budget: Budget | None = None) -> tuple[HitView, int]:
+    """
+    Drain a hit stream into a newest-first view; returns (hits, matched).
+    Hits are packed into a columnar HitStore (or a bounded heap with `limit`).
+    On a terminal the newest page found so far is rendered while the scan is still running.
+    With a budget, Ctrl-C stops the scan and keeps what was found so far.
+    """
+    from rich.live import Live
+    from .skills.store import HitStore
+
+    keep = NewestFirst(limit) if limit is not None else None
+    store = HitStore()
+    page = NewestFirst(PAGE_SIZE)
+    matched = 0
+    live = Live(console=_console(), transient=True, refresh_per_second=4) if console.is_terminal else None
+    last = 0.0
+    if live:
+        live.start()
+    try:
+        for h in stream:
+            matched += 1
+            if keep is not None:
+                keep.push(h)
+            else:
+                store.add(h)
+            if live:
+                page.push(h)
+                now = time.monotonic()
+                if now - last >= 0.25:
+                    live.update(_tabulate(page.sorted(), title=f"Scanning... {matched} match(es) so far"))
+                    last = now
+    except KeyboardInterrupt:
+        if budget is None:
+            raise
+        budget.cancel()
+    finally:
+        stream.close()
+        if live:
+            live.stop()
+    if keep is not None:
+        return HitView(keep.sorted()), matched
+    store.seal()
+    return HitView(store, store.newest_first()), matched
+
+
+def _usage_tables(report: dict, top: int = 10) -> "list[Table]":
+    from rich.table import Table
+    by_ext = Table(title=f"Space by type ({report['count']} file(s), {_fmt_size(report['bytes'])})")
+    by_ext.add_column("Type")
+    by_ext.add_column("Files", justify="right")
+    by_ext.add_column("Size", justify="right")
+    for ext, n, b in report["by_ext"][:top]:
+        by_ext.add_row(ext, str(n), _fmt_size(b))
+    by_age = Table(title="Space by age")
+    by_age.add_column("Modified")
+    by_age.add_column("Files", justify="right")
+    by_age.add_column("Size", justify="right")
+    for label, n, b in report["by_age"]:
+        if n:
+            by_age.add_row(label, str(n), _fmt_size(b))
+    return [by_ext, by_age]
+
+
+_SORT_KEYS = {"newest": "newest", "oldest": "oldest", "age": "oldest", "size": "size", "largest": "size",
+              "smallest": "smallest", "name": "name", "ext": "ext", "type": "ext"}
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+_RX_SIZE_FILTER = re.compile(r"([<>])(\d+(?:\.\d+)?)([kmg]?)b?")
+_RX_AGE_FILTER = re.compile(r"(older|newer):(\d+(?:\.\d+)?)d?")
+
+
+def _view_idx(view: HitView):
+    import numpy as np
+    return np.asarray(view.idx, dtype=np.int64)
+
+
+def _sort_view(view: HitView, key: str) -> HitView:
+    """Reorder a view ('newest', 'oldest', 'size', 'smallest', 'name', 'ext'); only indices move."""
+    import numpy as np
+    from .skills.store import HitStore
+
+    idx = _view_idx(view)
+    base = view.base
+    if isinstance(base, HitStore):
+        if key in ("newest", "oldest"):
+            k = base.mtimes[idx]
+        elif key in ("size", "smallest"):
+            k = base.sizes[idx]
+        elif key == "ext":
+            k = np.argsort(np.argsort(np.array(base.ext_table)))[base.ext_ids[idx]]
+        else:
+            k = np.array([base.name_of(i).lower() for i in idx])
+    else:
+        hits = [base[int(i)] for i in idx]
+        if key in ("newest", "oldest"):
+            k = np.array([h.mtime for h in hits], dtype=np.float64)
+        elif key in ("size", "smallest"):
+            k = np.array([h.size or 0 for h in hits], dtype=np.int64)
+        elif key == "ext":
+            k = np.array([os.path.splitext(h.name)[1].lower() or "(none)" for h in hits])
+        else:
+            k = np.array([h.name.lower() for h in hits])
+    order = np.argsort(-k if key in ("newest", "size") else k, kind="stable")
+    return HitView(base, idx[order])
+
+
+def _parse_filter(text: str) -> dict:
+    """'ext:zip,pdf >10mb <1gb older:30 newer:7 name:report' -> criteria (all must match)."""
+    crit = {}
+    for tok in text.split():
+        tok = tok.lower()
+        if tok.startswith(("ext:", "type:")):
+            crit["exts"] = [e.strip().lstrip(".") for e in tok.split(":", 1)[1].split(",") if e.strip()]
+        elif tok.startswith("name:"):
+            crit["name"] = tok[5:]
+        elif _RX_AGE_FILTER.fullmatch(tok):
+            m = _RX_AGE_FILTER.fullmatch(tok)
+            crit[m.group(1)] = float(m.group(2))
+        elif _RX_SIZE_FILTER.fullmatch(tok):
+            op, num, unit = _RX_SIZE_FILTER.fullmatch(tok).groups()
+            crit["min_bytes" if op == ">" else "max_bytes"] = int(float(num) * _SIZE_UNITS[unit])
+        else:
+            raise ValueError(tok)
+    return crit
+
+
+def _filter_view(view: HitView, crit: dict) -> HitView:
+    """Narrow a view by _parse_filter() criteria, keeping its order."""
+    import numpy as np
+    from .skills.store import HitStore
+
+    now = time.time()
+    older = now - crit["older"] * 86400 if "older" in crit else None
+    newer = now - crit["newer"] * 86400 if "newer" in crit else None
+    exts = {"." + e for e in crit.get("exts", ())}
+    name = crit.get("name")
+    base = view.base
+    if isinstance(base, HitStore):
+        idx = base.filter(_view_idx(view), newer_cutoff=newer, older_cutoff=older,
+                          min_bytes=crit.get("min_bytes"), max_bytes=crit.get("max_bytes"),
+                          exts=sorted(exts) or None)
+        if name:
+            idx = idx[np.fromiter((name in base.name_of(i).lower() for i in idx), dtype=bool, count=len(idx))]
+        return HitView(base, idx)
+
+    def ok(h) -> bool:
+        size = h.size or 0
+        return ((older is None or h.mtime <= older) and (newer is None or h.mtime >= newer)
+                and size >= crit.get("min_bytes", 0) and size <= crit.get("max_bytes", size)
+                and (not exts or os.path.splitext(h.name)[1].lower() in exts)
+                and (not name or name in h.name.lower()))
+    return view.where(ok)
+
+
+def _take_ranges(view: HitView, ranges) -> HitView:
+    """Positions given as (start, stop) ranges -> a narrower view built from index slices."""
+    import numpy as np
+    idx = _view_idx(view)
+    if not ranges:
+        return HitView(view.base, idx[:0])
+    return HitView(view.base, np.concatenate([idx[a:b] for a, b in ranges]))
+
+
+_SELECT_HELP = ("view: n / p (next / previous page), go N, sort newest|oldest|size|smallest|name|ext, "
+                "filter ext:zip,pdf >10mb <1gb older:30 newer:7 name:text, clear")
+
+
+def _interactive_select(hits: HitView, rows: int = SELECT_PAGE_ROWS) -> HitView:
+    """
+    Paged selection: only the visible page is rendered. Sorting and filtering rebuild the
+    index array of the in-memory result (no rescan), and numbers refer to positions in the
+    current view, so '1-5000' or 'page' resolve to index slices rather than row copies.
+    """
     if not hits:
         console.print("[yellow]No candidates found.[/yellow]")
-        return []
-    console.print(_tabulate(hits))
-    print("Select numbers (e.g., 1,3-5), type 'all' for everything, or press Enter to cancel: ", end="")
-    sel = input().strip()
-    if not sel:
-        return []
-    if sel.lower() == "all":
-        return hits[:]
-    idxs = set()
+        return hits
+    view, order, filt, page = hits, "newest first", "", 0
+    renders, render_s = 0, 0.0
+    try:
+        while True:
+            n = len(view)
+            pages = max(1, -(-n // rows))
+            page = min(page, pages - 1)
+            start = page * rows
+            title = f"Candidates ({order}{', ' + filt if filt else ''})"
+            if pages > 1:
+                title += f" - page {page + 1}/{pages}, {n} match(es)"
+            t0 = time.perf_counter()
+            console.print(_tabulate(view[start:start + rows], title=title, start=start + 1))
+            render_s += time.perf_counter() - t0
+            renders += 1
+            if pages > 1 or view is not hits:
+                console.print(f"[dim]{_SELECT_HELP}[/dim]")
+            sel = _ask("Select numbers (e.g., 1,3-5), 'page' for this page, 'all' for everything, "
+                       "or press Enter to cancel: ").strip()
+            cmd, _, arg = sel.lower().partition(" ")
+            if not sel:
+                return hits.select([])
+            if cmd == "all":
+                return view
+            if cmd == "page" and not arg:
+                return _take_ranges(view, [(start, min(start + rows, n))])
+            if cmd in ("n", "next", "p", "prev") and not arg:
+                page = max(0, page + (1 if cmd.startswith("n") else -1))
+            elif cmd == "go" and arg.isdigit():
+                page = max(0, int(arg) - 1)
+            elif cmd == "sort" and arg in _SORT_KEYS:
+                view, order, page = _sort_view(view, _SORT_KEYS[arg]), _SORT_KEYS[arg] + " first", 0
+            elif cmd == "filter" and arg:
+                try:
+                    view, page = _filter_view(view, _parse_filter(arg)), 0
+                except ValueError as e:
+                    console.print(f"[yellow]Unknown filter {e}.[/yellow]")
+                    continue
+                filt = f"{filt} {arg}".strip()
+            elif cmd == "clear":
+                view, order, filt, page = hits, "newest first", "", 0
+            elif sel[:1].isdigit():
+                return _take_ranges(view, _parse_ranges(sel, n))
+            else:
+                console.print(f"[yellow]Unrecognized input.[/yellow] {_SELECT_HELP}")
+    finally:
+        # one span for the whole selection, however many pages were shown
+        tracing.record("render", render_s, rows=rows, pages=renders, total=len(hits))
+
+
+def _parse_ranges(sel: str, n: int) -> List[tuple]:
+    """'1,3-5' -> sorted, merged 0-based (start, stop) ranges below n."""
+    spans = []
     for part in sel.split(","):
         part = part.strip()
-        if "-" in part:
-            a, b = part.split("-", 1)
-            if a.isdigit() and b.isdigit():
-                idxs.update(range(int(a), int(b) + 1))
-        elif part.isdigit():
-            idxs.add(int(part))
-    return [h for i, h in enumerate(hits, 1) if i in idxs]
+        a, dash, b = part.partition("-")
+        a, b = a.strip(), b.strip()
+        if dash and a.isdigit() and b.isdigit():
+            lo, hi = int(a), int(b)
+        elif not dash and a.isdigit():
+            lo = hi = int(a)
+        else:
+            continue
+        lo, hi = max(lo, 1), min(hi, n)
+        if lo <= hi:
+            spans.append((lo - 1, hi))
+    merged: List[tuple] = []
+    for a, b in sorted(spans):
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+        else:
+            merged.append((a, b))
+    return merged
+
+
+def _parse_numbers(sel: str, n: int) -> List[int]:
+    """'1,3-5' -> sorted 0-based positions below n."""
+    return [i for a, b in _parse_ranges(sel, n) for i in range(a, b)]
+
+
+def _du_roots(scopes, hint: str | None) -> List[str]:
+    """Scopes named by the prompt ('in downloads', 'under ~/Documents'), else all of them."""
+    from .skills.query import normalize_scopes
+    roots = normalize_scopes(scopes)
+    if not hint:
+        return roots
+    h = os.path.normcase(os.path.realpath(os.path.expanduser(hint))).lower()
+    name = os.path.basename(hint.rstrip("/\\")).lower()
+    picked = [r for r in roots if os.path.basename(r).lower() == name or os.path.normcase(r).lower() == h]
+    return picked or roots
+
+
+def _du_table(rows, title: str, parent_bytes: int) -> "Table":
+    from rich.table import Table
+    t = Table(title=title)
+    t.add_column("#")
+    t.add_column("Directory")
+    t.add_column("Size", justify="right")
+    t.add_column("Files", justify="right")
+    t.add_column("Share", justify="right")
+    for i, (path, nbytes, nfiles) in enumerate(rows, 1):
+        share = f"{100 * nbytes / parent_bytes:.0f}%" if parent_bytes else "-"
+        t.add_row(str(i), path, _fmt_size(nbytes), str(nfiles), share)
+    return t
+
+
+def _du_browse(trees, top: int) -> List[tuple]:
+    """Ranked drill-down over du trees; returns the (tree, dir) pairs marked for trash."""
+    picked: dict = {}
+    cur = None if len(trees) > 1 else (trees[0], trees[0].root)
+    while True:
+        if cur is None:
+            rows = [(t.root, t.total.get(t.root, 0), t.files.get(t.root, 0)) for t in trees]
+            owners = list(trees)
+            title, parent_bytes = "Scopes by size", sum(r[1] for r in rows)
+        else:
+            tree, d = cur
+            rows = tree.top(top, d)
+            owners = [tree] * len(rows)
+            title = f"Largest in {d} ({_fmt_size(tree.total[d])}; {_fmt_size(tree.own[d])} in files directly here)"
+            parent_bytes = tree.total[d]
+        with tracing.span("render", rows=len(rows)):
+            console.print(_du_table(rows, title, parent_bytes))
+        if picked:
+            console.print(f"Marked: {len(picked)} director(ies), {_fmt_size(sum(t.total[p] for t, p in picked.values()))}")
+        resp = _ask("Number to open, '..' to go up, 's 1,3-5' to mark for trash, Enter when done: ").strip()
+        if not resp:
+            return list(picked.values())
+        if resp == "..":
+            if cur is not None:
+                tree, d = cur
+                if d != tree.root:
+                    cur = (tree, os.path.dirname(d))
+                elif len(trees) > 1:
+                    cur = None
+        elif resp.split(" ", 1)[0].lower() in ("s", "select") and " " in resp:
+            for i in _parse_numbers(resp.split(" ", 1)[1], len(rows)):
+                picked[rows[i][0]] = (owners[i], rows[i][0])
+        elif resp.isdigit() and 1 <= int(resp) <= len(rows):
+            i = int(resp) - 1
+            cur = (owners[i], rows[i][0])
+
+
+def _dupes_table(groups, keep: dict, default: str) -> "Table":
+    from rich.table import Table
+    from .skills.dupes import keeper
+    t = Table(title=f"Duplicate groups ({len(groups)})")
+    t.add_column("Group")
+    t.add_column("Keep")
+    t.add_column("Path")
+    t.add_column("Size")
+    t.add_column("Modified")
+    for gi, g in enumerate(groups):
+        k = keeper(g, keep.get(gi, default))
+        for h in g:
+            ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(h.mtime))
+            t.add_row(str(gi + 1), "keep" if h is k else "", h.fspath, _fmt_size(h.size), ts)
+    return t
+
+
+def _parse_keep(text: str, default: str, n_groups: int) -> tuple[str, dict]:
+    """'o' / 'newest' sets the default; '2=n,5=o' overrides single groups (1-based)."""
+    names = {"n": "newest", "newest": "newest", "o": "oldest", "oldest": "oldest"}
+    keep = {}
+    for part in text.replace(",", " ").split():
+        g, sep, k = part.partition("=")
+        if not sep and g.lower() in names:
+            default = names[g.lower()]
+        elif sep and g.isdigit() and k.lower() in names and 1 <= int(g) <= n_groups:
+            keep[int(g) - 1] = names[k.lower()]
+    return default, keep
 
 
 def _summary(chosen) -> tuple[int, int]:
@@ -70,7 +445,39 @@ def _summary(chosen) -> tuple[int, int]:
     return count, total_bytes
 
 
-def execute(plan: Plan, do_execute: bool, scopes, run_id: str | None = None, preview: bool = False):
+def execute(plan: Plan, do_execute: bool, scopes, run_id: str | None = None, preview: bool = False,
+            search_opts: dict | None = None, report: bool = False, preview_mode: str | None = None):
+    try:
+        with tracing.span("execute", run_id, execute=do_execute):
+            return _execute(plan, do_execute, scopes, run_id, preview, search_opts, report, preview_mode)
+    finally:
+        L.flush()
+
+
+def _say(text: str):
+    """Plain output that does not need rich (used by the noop fast path)."""
+    s = session.get()
+    if s is not None:
+        s.console.print(text, markup=False, highlight=False)
+    else:
+        print(text)
+
+
+def _noop(plan: Plan, run_id):
+    """Nothing to search or delete: answer without loading rich or touching the filesystem."""
+    _say(f"Plan: {plan.rationale}")
+    for s in plan.steps:
+        _say(f" - {s.action}: {s.description}")
+    _say("No actionable step parsed.")
+    if run_id:
+        L.log_event(run_id, "plan.built", {"steps": [{"action": s.action, "params": s.params} for s in plan.steps]})
+        L.log_event(run_id, "noop", {})
+
+
+def _execute(plan: Plan, do_execute: bool, scopes, run_id, preview, search_opts, report, preview_mode=None):
+    if all(s.action == "noop" for s in plan.steps):
+        return _noop(plan, run_id)
+
     console.print(f"[cyan]Plan:[/cyan] {plan.rationale}")
     for s in plan.steps:
         console.print(f" - {s.action}: {s.description}")
@@ -84,34 +491,157 @@ def execute(plan: Plan, do_execute: bool, scopes, run_id: str | None = None, pre
         )
         L.log_line(f"Plan: {[ (s.action, s.params) for s in plan.steps ]}", run_id=run_id)
 
-    hits = []
-    chosen = []
+    hits = HitView([])
+    chosen = HitView([])
 
     for step in plan.steps:
         if step.action == "search_files":
-            hits = find_recent(
-                roots=scopes,
-                patterns=step.params.get("patterns", ["*"]),
-                days=step.params.get("days"),
-                name_hint=step.params.get("name_hint"),
-                newer_than_days=step.params.get("newer_than_days"),
-                older_than_days=step.params.get("older_than_days"),
-                min_size_kb=step.params.get("min_size_kb"),
-                max_size_kb=step.params.get("max_size_kb"),
-            )
+            opts = dict(search_opts or {})
+            limit = opts.pop("limit", None)
+            stats = opts.pop("stats", None) or ScanStats()
+            deadline = search_deadline(opts.pop("deadline", None), bool(opts.get("use_index")))
+            resume = opts.pop("resume", False)
+            if deadline is not None or resume:
+                opts["use_index"] = False  # only a walk can stop and resume
+            # always Ctrl-C aware; checkpoints only for searches run with a deadline or --resume
+            budget = Budget(deadline, resume=resume, checkpoint=deadline is not None)
+            with tracing.span("search", roots=len(scopes), use_index=bool(opts.get("use_index"))) as sp:
+                stream = iter_recent(
+                    roots=scopes,
+                    patterns=step.params.get("patterns", ["*"]),
+                    days=step.params.get("days"),
+                    name_hint=step.params.get("name_hint"),
+                    newer_than_days=step.params.get("newer_than_days"),
+                    older_than_days=step.params.get("older_than_days"),
+                    min_size_kb=step.params.get("min_size_kb"),
+                    max_size_kb=step.params.get("max_size_kb"),
+                    stats=stats,
+                    budget=budget,
+                    **opts,
+                )
+                hits, matched = _collect(stream, limit, budget)
+                sp.attrs["complete"] = not budget.truncated
+            saved = save_checkpoint(budget, hits)
+            stopped_by = None
+            if budget.truncated:
+                stopped_by = "interrupt" if budget.cancelled.is_set() else "deadline"
+                console.print(f"[yellow]Search stopped early ({stopped_by}):[/yellow] results are incomplete; "
+                              f"{len(budget.pending)} folder(s) not searched yet."
+                              + (" Re-run with --resume to continue." if saved else ""))
+            if matched > len(hits):
+                console.print(f"[yellow]Note:[/yellow] showing the {len(hits)} newest of {matched} match(es).")
             if run_id:
                 L.log_event(run_id, "search.results", {
                     "count": len(hits),
-                    "sample": [str(h.path) for h in hits[:5]],
+                    "matched": matched,
+                    "sample": [h.fspath for h in hits[:5]],
+                    "duration_ms": round(sp.wall * 1000, 3),
+                    "dirs": stats.dirs,
+                    "files": stats.files,
+                    "stat_calls": stats.stat_calls,
+                    "errors": stats.errors,
+                    "pruned": stats.pruned,
+                    "complete": not budget.truncated,
+                    "stopped_by": stopped_by,
+                    "pending_dirs": len(budget.pending),
+                    "resumed": bool(budget.resume),
+                    "checkpoint": str(saved) if saved else None,
+                })
+
+        elif step.action == "disk_usage":
+            from .schemas import FileHit
+            from .skills import du
+            roots = _du_roots(scopes, step.params.get("scope_hint"))
+            stats = ScanStats()
+            with tracing.span("du", roots=len(roots)) as sp:
+                conn = du.open_cache()
+                try:
+                    trees = [du.usage(r, conn, stats) for r in roots]
+                finally:
+                    conn.close()
+            if run_id:
+                L.log_event(run_id, "du.report", {
+                    "roots": {t.root: t.total.get(t.root, 0) for t in trees},
+                    "largest": trees[0].largest(10) if len(trees) == 1 else
+                               sorted((x for t in trees for x in t.largest(10)), key=lambda x: -x[1])[:10],
+                    "rescanned_dirs": sum(t.rescanned for t in trees),
+                    "cached_dirs": sum(t.reused for t in trees),
+                    "duration_ms": round(sp.wall * 1000, 3),
+                    "files": stats.files,
+                    "stat_calls": stats.stat_calls,
+                })
+            if not trees:
+                console.print("[yellow]None of the scopes exist.[/yellow]")
+                return
+            picked = _du_browse(trees, step.params.get("top") or DU_TOP)
+            # a marked directory already covers anything marked below it
+            paths = sorted(p for _, p in picked)
+            keep = [(t, p) for t, p in picked
+                    if not any(p != q and p.startswith(q.rstrip(os.sep) + os.sep) for q in paths)]
+            hits = HitView([FileHit(p, mtime=t.mtime[p], size=t.total[p]) for t, p in keep])
+            if not hits:
+                console.print("[yellow]No directories marked. Exiting.[/yellow]")
+                if run_id:
+                    L.log_event(run_id, "selection.empty", {})
+                return
+
+        elif step.action == "find_duplicates":
+            from .skills.dupes import find_duplicates, extras
+            with tracing.span("dupes", candidates=len(hits)) as sp:
+                groups = find_duplicates(hits)
+                sp.attrs["groups"] = len(groups)
+            default = step.params.get("keep", "oldest")
+            if not groups:
+                console.print("[yellow]No duplicates among the candidates.[/yellow]")
+                hits = HitView([])
+                if run_id:
+                    L.log_event(run_id, "dupes.groups", {"groups": 0, "files": 0, "wasted_bytes": 0})
+                continue
+            keep: dict = {}
+            with tracing.span("render", rows=sum(len(g) for g in groups)):
+                console.print(_dupes_table(groups, keep, default))
+            resp = _ask(f"Keep the [n]ewest or [o]ldest copy of each group (now: {default}); "
+                        "override single groups like '2=n,5=o', or press Enter to accept: ")
+            default, keep = _parse_keep(resp, default, len(groups))
+            if keep or resp.strip():
+                console.print(_dupes_table(groups, keep, default))
+            hits = HitView(extras(groups, keep, default))
+            if run_id:
+                L.log_event(run_id, "dupes.groups", {
+                    "groups": len(groups),
+                    "files": sum(len(g) for g in groups),
+                    "wasted_bytes": sum(g[0].size * (len(g) - 1) for g in groups),
+                    "keep": default,
+                    "overrides": {str(g + 1): k for g, k in keep.items()},
                 })
 
         elif step.action == "select_targets":
+            policy = _policy(scopes)
             before = len(hits)
-            hits = [h for h in hits if in_allowed_scopes(h.path, scopes=scopes)]
+            with tracing.span("policy", candidates=before):
+                verdicts = policy.classify(hits)
+            hits = hits.select(i for i, v in enumerate(verdicts) if v.allowed)
             hidden = before - len(hits)
             if hidden > 0:
                 console.print(f"[yellow]Note:[/yellow] {hidden} item(s) were out of allowed scopes and hidden.")
 
+            # Optional "what is using my space" breakdown before choosing
+            if report and hits:
+                from .skills.store import HitStore
+                if isinstance(hits.base, HitStore):
+                    usage = hits.base.usage_report(hits.idx)
+                else:
+                    usage = HitStore.from_hits(hits).usage_report()
+                for t in _usage_tables(usage):
+                    console.print(t)
+                if run_id:
+                    L.log_event(run_id, "report.usage", {
+                        "count": usage["count"],
+                        "bytes": usage["bytes"],
+                        "by_ext": usage["by_ext"][:20],
+                        "by_age": usage["by_age"],
+                    })
+
             chosen = _interactive_select(hits)
             if not chosen:
                 console.print("[yellow]No selection. Exiting.[/yellow]")
@@ -122,16 +652,15 @@ def execute(plan: Plan, do_execute: bool, scopes, run_id: str | None = None, pre
             if run_id:
                 L.log_event(run_id, "selection.made", {
                     "count": len(chosen),
-                    "paths": [str(c.path) for c in chosen[:50]],
+                    "paths": [c.fspath for c in chosen[:50]],
                 })
 
             # Extra confirmation for risky/system-like selections
-            risky = [h for h in chosen if requires_extra_confirmation(h.path)]
+            risky = chosen.where(policy.is_risky)
             if risky:
                 console.print("[red]Warning:[/red] risky/system-like selections detected.")
-                console.print(_tabulate(risky))
-                print(f"Type '{EXTRA_CONFIRM_PHRASE}' to proceed: ", end="")
-                resp = input().strip().lower()
+                console.print(_tabulate(risky, title="Risky selections", limit=SELECT_PAGE_ROWS))
+                resp = _ask(f"Type '{EXTRA_CONFIRM_PHRASE}' to proceed: ").strip().lower()
                 ok_risky = (resp == EXTRA_CONFIRM_PHRASE.lower())
                 if run_id:
                     L.log_event(run_id, "confirm.risky", {"accepted": ok_risky, "count": len(risky)})
@@ -148,9 +677,12 @@ def execute(plan: Plan, do_execute: bool, scopes, run_id: str | None = None, pre
                 opened = 0
                 skipped = 0
                 err_str = None
+                mode = None
                 try:
-                    from .skills.preview import preview_paths
-                    res = preview_paths([c.path for c in chosen])
+                    from .skills.preview import preview_paths, resolve_mode
+                    mode = resolve_mode(preview_mode)
+                    with tracing.span("preview", count=count, mode=mode):
+                        res = preview_paths([c.path for c in chosen], mode=mode, run_id=run_id, console=_console())
                     if isinstance(res, tuple):
                         if len(res) >= 1:
                             opened = res[0]
@@ -168,15 +700,16 @@ def execute(plan: Plan, do_execute: bool, scopes, run_id: str | None = None, pre
                         "error": err_str,
                     })
 
+                inline = mode == "terminal"
                 if err_str is None:
-                    msg = f"Preview: opened {opened} window(s)"
+                    msg = f"Preview: showed {opened} item(s) above" if inline else f"Preview: opened {opened} window(s)"
                     if skipped:
                         msg += f"; skipped {skipped} (cap reached)"
                     console.print(f"[green]{msg}[/green]")
 
                 # Always pause so you can inspect the files before continuing
                 try:
-                    input("Preview opened/attempted. Press Enter to continue...")
+                    _ask("Press Enter to continue..." if inline else "Preview opened/attempted. Press Enter to continue...")
                 except EOFError:
                     # Non-interactive environments: just continue
                     pass
@@ -186,8 +719,7 @@ def execute(plan: Plan, do_execute: bool, scopes, run_id: str | None = None, pre
             if needs_bulk_confirm:
                 console.print(f"[red]Bulk safeguard:[/red] selection exceeds limits "
                               f"({MAX_DELETE_COUNT} files or {MAX_TOTAL_DELETE_MB} MB).")
-                print(f"Type '{BULK_CONFIRM_PHRASE}' to proceed: ", end="")
-                resp = input().strip().lower()
+                resp = _ask(f"Type '{BULK_CONFIRM_PHRASE}' to proceed: ").strip().lower()
                 ok_bulk = (resp == BULK_CONFIRM_PHRASE.lower())
                 if run_id:
                     L.log_event(run_id, "confirm.bulk", {
@@ -201,28 +733,29 @@ def execute(plan: Plan, do_execute: bool, scopes, run_id: str | None = None, pre
 
         elif step.action == "move_to_trash":
             console.print("[bold]Ready to move to Trash:[/bold]")
-            console.print(_tabulate(chosen))
+            console.print(_tabulate(chosen, title="Selected", limit=SELECT_PAGE_ROWS))
             if not do_execute:
                 console.print("[blue]Dry-run[/blue]: re-run with --execute to actually delete.")
                 if run_id:
                     L.log_event(run_id, "execute.dry_run", {"count": len(chosen)})
                 return
-            print("Type 'yes' to confirm: ", end="")
-            if input().strip().lower() != "yes":
+            if _ask("Type 'yes' to confirm: ").strip().lower() != "yes":
                 console.print("[yellow]Cancelled.[/yellow]")
                 if run_id:
-                    L.log_event(run_id, "confirm.final", {"accepted": False})
+                    L.log_event(run_id, "confirm.final", {"accepted": False}, sync=True)
                 return
             if run_id:
-                L.log_event(run_id, "confirm.final", {"accepted": True})
+                L.log_event(run_id, "confirm.final", {"accepted": True}, sync=True)
 
-            ok, errs, outcomes = move_to_trash([c.path for c in chosen])
+            with tracing.span("trash", count=len(chosen)):
+                ok, errs, outcomes = move_to_trash([c.path for c in chosen])
             if run_id:
                 L.log_event(run_id, "delete.result", {
                     "ok": ok,
+                    "bytes": sum((c.size or 0) for c, o in zip(chosen, outcomes) if o.get("ok")),
                     "errors": errs,
                     "outcomes": outcomes[:200],
-                })
+                }, sync=True)
             L.log_line(f"Deleted {ok}; errors: {errs}", run_id=run_id)
             console.print(f"[green]Moved {ok} item(s) to Trash.[/green]")
             if errs:
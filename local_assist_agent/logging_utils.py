@@ -1,10 +1,23 @@
+import os
 import json
 import uuid
+import queue
+import atexit
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from .config import LOG_FILE, LOG_JSONL
+from .config import (
+    LOG_FILE, LOG_JSONL, LOG_BUFFERED, LOG_QUEUE_MAX, LOG_FLUSH_INTERVAL_S,
+    LOG_ROTATE_BYTES, LOG_ROTATE_MAX_AGE_S,
+)
+from . import logstore
+
+try:
+    import fcntl
+except ImportError:  # Windows: O_APPEND single writes only
+    fcntl = None
 
 def new_run_id() -> str:
     """Short stable ID per CLI run (used to correlate events)."""
@@ -15,15 +28,127 @@ def _json_default(o: Any):
         return str(o)
     return str(o)
 
-def log_line(msg: str, run_id: Optional[str] = None, level: str = "INFO"):
+_made_dirs = set()
+_born: Dict[Path, Tuple[int, Optional[float]]] = {}
+
+def _should_rotate(path: Path, st: os.stat_result) -> bool:
+    if LOG_ROTATE_BYTES and st.st_size >= LOG_ROTATE_BYTES:
+        return True
+    if LOG_ROTATE_MAX_AGE_S:
+        cached = _born.get(path)
+        if cached is None or cached[0] != st.st_ino:
+            cached = _born[path] = (st.st_ino, logstore.born_ts(path))
+        if cached[1] is not None and datetime.now().timestamp() - cached[1] >= LOG_ROTATE_MAX_AGE_S:
+            return True
+    return False
+
+def _open_locked(path: Path) -> int:
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    if not fcntl:
+        return fd
+    while True:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        # another process may have rotated the file away while we waited for the lock
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+def _append(path: Path, data: str, rotate: bool = True):
+    """
+    Append `data` with a single write() on an O_APPEND descriptor, under an
+    exclusive flock, so concurrent agent processes never interleave lines.
+    Rotates the file into a compressed segment once it is too big or too old.
+    """
+    parent = path.parent
+    if parent not in _made_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        _made_dirs.add(parent)
+    aside = None
+    fd = _open_locked(path)
+    try:
+        buf = data.encode("utf-8", "backslashreplace")  # undecodable (surrogate-escaped) paths stay readable
+        while buf:
+            n = os.write(fd, buf)
+            buf = buf[n:]
+        if rotate and _should_rotate(path, os.fstat(fd)):
+            aside = logstore.detach(path)
+    finally:
+        os.close(fd)  # also releases the lock
+    if aside is not None:
+        # compress outside the lock; other writers already append to a fresh file
+        logstore.compress(aside, path, with_index=path.suffix == ".jsonl")
+
+class _Writer:
+    """Background thread draining a bounded queue and writing batches per file."""
+
+    def __init__(self):
+        self.q: "queue.Queue[Tuple[Path, str]]" = queue.Queue(maxsize=LOG_QUEUE_MAX)
+        self.pid = os.getpid()
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.q.get()]
+            try:
+                batch.append(self.q.get(timeout=LOG_FLUSH_INTERVAL_S))
+                while True:
+                    batch.append(self.q.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                by_path: Dict[Path, List[str]] = {}
+                for path, text in batch:
+                    by_path.setdefault(path, []).append(text)
+                for path, texts in by_path.items():
+                    try:
+                        _append(path, "".join(texts))
+                    except Exception:
+                        pass  # logging must never take the agent down (nor this thread: flush() waits on it)
+            finally:
+                for _ in batch:
+                    self.q.task_done()
+
+_writer: Optional[_Writer] = None
+_writer_lock = threading.Lock()
+
+def _get_writer() -> _Writer:
+    global _writer
+    if _writer is None or _writer.pid != os.getpid():  # (re)start after fork
+        with _writer_lock:
+            if _writer is None or _writer.pid != os.getpid():
+                _writer = _Writer()
+    return _writer
+
+def _emit(path: Path, text: str, sync: bool):
+    if sync or not LOG_BUFFERED:
+        flush()  # keep file order: earlier buffered records land first
+        _append(path, text)
+    else:
+        _get_writer().q.put((path, text))
+
+def flush():
+    """Block until every buffered record has been written."""
+    w = _writer
+    if w is not None and w.pid == os.getpid():
+        w.q.join()
+
+atexit.register(flush)
+
+def log_line(msg: str, run_id: Optional[str] = None, level: str = "INFO", sync: bool = False):
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     rid = f" [run:{run_id}]" if run_id else ""
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with LOG_FILE.open("a", encoding="utf-8") as f:
-        f.write(f"[{ts}] {level}{rid} {msg}\n\n")
+    _emit(LOG_FILE, f"[{ts}] {level}{rid} {msg}\n\n", sync)
 
-def log_event(run_id: str, event: str, data: dict | None = None, level: str = "INFO"):
-    """Write a structured JSONL event (one JSON per line)."""
+def log_event(run_id: str, event: str, data: dict | None = None, level: str = "INFO", sync: bool = False):
+    """
+    Write a structured JSONL event (one JSON per line).
+    Buffered by default; sync=True writes through immediately (audit-critical records).
+    """
     ts = datetime.now().isoformat(timespec="seconds")
     payload = {
         "ts": ts,
@@ -32,6 +157,4 @@ def log_event(run_id: str, event: str, data: dict | None = None, level: str = "I
         "event": event,
         "data": data or {},
     }
-    LOG_JSONL.parent.mkdir(parents=True, exist_ok=True)
-    with LOG_JSONL.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(payload, default=_json_default) + "\n")
+    _emit(LOG_JSONL, json.dumps(payload, default=_json_default) + "\n", sync)
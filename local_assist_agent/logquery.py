@@ -0,0 +1,203 @@
+import re
+import math
+import sys
+import json
+import mmap
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from . import logstore
+from .config import LOG_JSONL, LOG_FLUSH_INTERVAL_S
+
+# log_event writes '{"ts": "YYYY-mm-ddTHH:MM:SS", ...' so the timestamp sits at a fixed offset
+_TS_AT = slice(8, 27)
+_REL = re.compile(r"^(\d+)\s*([hdw])$")
+_DATE_ONLY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# Records are stamped before they are queued, so concurrent writers can land slightly out of
+# order in the file; binary searches start this far outside the bounds and re-check each line.
+_TS_SLACK = timedelta(seconds=math.ceil(LOG_FLUSH_INTERVAL_S) + 1)
+
+
+def _parse_when(s: Optional[str], end_of_day: bool = False) -> Optional[bytes]:
+    """
+    '2026-10-01', '2026-10-01T12:00:00', or relative '36h' / '7d' / '2w' -> ISO bytes.
+    With end_of_day, a bare date means its last second (for --until).
+    """
+    if not s:
+        return None
+    m = _REL.match(s.strip().lower())
+    if m:
+        n, unit = int(m.group(1)), m.group(2)
+        delta = {"h": timedelta(hours=n), "d": timedelta(days=n), "w": timedelta(weeks=n)}[unit]
+        return (datetime.now() - delta).isoformat(timespec="seconds").encode()
+    when = datetime.fromisoformat(s.strip())
+    if end_of_day and _DATE_ONLY.match(s.strip()):
+        when += timedelta(days=1, seconds=-1)
+    return when.isoformat(timespec="seconds").encode()
+
+
+def _shift(ts: bytes, delta: timedelta) -> bytes:
+    return (datetime.fromisoformat(ts.decode()) + delta).isoformat(timespec="seconds").encode()
+
+
+def _line_bounds(buf, pos: int, lo: int, hi: int):
+    start = buf.rfind(b"\n", lo, pos) + 1 or lo
+    end = buf.find(b"\n", pos, hi)
+    return max(start, lo), (hi if end < 0 else end)
+
+
+def _seek_ts(buf, ts: bytes, lo: int, hi: int) -> int:
+    """Offset of the first line with timestamp >= ts, if records were in strict time order."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        s, e = _line_bounds(buf, mid, lo, hi)
+        if buf[s:e][_TS_AT] < ts:
+            lo = e + 1
+        else:
+            hi = s
+    return lo
+
+
+def scan(buf, run_id: Optional[str] = None, event: Optional[str] = None,
+         since: Optional[bytes] = None, until: Optional[bytes] = None) -> Iterator[bytes]:
+    """
+    Yield raw JSONL lines matching every filter, without JSON-parsing anything.
+    Time bounds are located by binary search, widened by _TS_SLACK for records
+    written slightly out of order, and every line is then checked against them;
+    run_id/event jump between occurrences with find() instead of walking line by line.
+    """
+    lo, hi = 0, len(buf)
+    if since:
+        lo = _seek_ts(buf, _shift(since, -_TS_SLACK), lo, hi)
+    if until:
+        hi = _seek_ts(buf, _shift(until, _TS_SLACK) + b"\xff", lo, hi)  # inclusive of the 'until' second
+    if since or until:
+        yield from (line for line in _scan(buf, lo, hi, run_id, event)
+                    if (not since or line[_TS_AT] >= since) and (not until or line[_TS_AT] <= until))
+    else:
+        yield from _scan(buf, lo, hi, run_id, event)
+
+
+def _scan(buf, lo: int, hi: int, run_id: Optional[str], event: Optional[str]) -> Iterator[bytes]:
+    needles = []
+    if run_id:
+        needles.append(b'"run_id": "' + run_id.encode() + b'"')
+    if event:
+        needles.append(b'"event": "' + event.encode() + b'"')
+
+    if not needles:
+        pos = lo
+        while pos < hi:
+            end = buf.find(b"\n", pos, hi)
+            end = hi if end < 0 else end
+            if end > pos:
+                yield buf[pos:end]
+            pos = end + 1
+        return
+
+    first, rest = needles[0], needles[1:]
+    pos = lo
+    while True:
+        i = buf.find(first, pos, hi)
+        if i < 0:
+            return
+        s, e = _line_bounds(buf, i, lo, hi)
+        line = buf[s:e]
+        if all(n in line for n in rest):
+            yield line
+        pos = e + 1
+
+
+def _segment_spans(active: Path) -> dict:
+    """segment name -> (first_ts, last_ts) from the run index."""
+    spans = {}
+    for e in logstore.index_entries(active):
+        a, b = spans.get(e["segment"], (e["first_ts"], e["last_ts"]))
+        spans[e["segment"]] = (min(a, e["first_ts"]), max(b, e["last_ts"]))
+    return spans
+
+
+def query(active: Path = None, run_id: Optional[str] = None, event: Optional[str] = None,
+          since: Optional[bytes] = None, until: Optional[bytes] = None) -> Iterator[bytes]:
+    """Matching lines across rotated segments (oldest first) and the active log."""
+    active = Path(active or LOG_JSONL)
+    if run_id:
+        # the index says exactly which members of which segments hold this run
+        for e in logstore.index_entries(active, run_id):
+            data = logstore.read_segment_range(active, e["segment"], e["offset"], e["end"])
+            yield from scan(data, run_id, event, since, until)
+    else:
+        for seg, (first, last) in sorted(_segment_spans(active).items()):
+            if ((since and _shift(last.encode(), _TS_SLACK) < since)
+                    or (until and _shift(first.encode(), -_TS_SLACK) > until)):
+                continue
+            yield from scan(logstore.read_segment_range(active, seg), None, event, since, until)
+    try:
+        with open(active, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from scan(mm, run_id, event, since, until)
+    except FileNotFoundError:
+        return
+
+
+def aggregate(lines: Iterable[bytes]) -> dict:
+    """One streaming pass: event counts, runs, trashed files/bytes and error rate. Only delete.result is parsed."""
+    events: Counter = Counter()
+    runs = set()
+    bulk_runs = set()
+    trashed = errors = nbytes = 0
+    for line in lines:
+        ev = logstore.field_of(line, b'"event": "')
+        rid = logstore.field_of(line, b'"run_id": "')
+        events[ev] += 1
+        runs.add(rid)
+        if ev == "confirm.bulk":
+            bulk_runs.add(rid)
+        elif ev == "delete.result":
+            data = json.loads(line).get("data", {})
+            trashed += int(data.get("ok") or 0)
+            errors += len(data.get("errors") or [])
+            nbytes += int(data.get("bytes") or 0)
+    attempted = trashed + errors
+    return {
+        "events": sum(events.values()),
+        "runs": len(runs),
+        "by_event": dict(events.most_common()),
+        "files_trashed": trashed,
+        "bytes_trashed": nbytes,
+        "trash_errors": errors,
+        "error_rate": round(errors / attempted, 4) if attempted else 0.0,
+        "runs_with_confirm_bulk": sorted(bulk_runs),
+    }
+
+
+def main(argv: List[str] = None):
+    ap = argparse.ArgumentParser(prog="assist_agent.py query", description="Query agent.jsonl (and rotated segments)")
+    ap.add_argument("--run", help="run_id to show")
+    ap.add_argument("--event", help="event type, e.g. delete.result or confirm.bulk")
+    ap.add_argument("--since", help="ISO date/time or relative (36h, 7d, 2w)")
+    ap.add_argument("--until", help="ISO date/time or relative")
+    ap.add_argument("--stats", action="store_true", help="Print aggregates instead of events")
+    ap.add_argument("--log", type=str, help="Path to agent.jsonl (default: config.LOG_JSONL)")
+    args = ap.parse_args(argv)
+
+    bounds = []
+    for flag, value in (("--since", args.since), ("--until", args.until)):
+        try:
+            bounds.append(_parse_when(value, end_of_day=flag == "--until"))
+        except ValueError:
+            ap.error(f"{flag} {value!r}: use YYYY-MM-DD, YYYY-MM-DDTHH:MM[:SS] or a relative 36h / 7d / 2w")
+    since, until = bounds
+    lines = query(Path(args.log) if args.log else None, args.run, args.event, since, until)
+    out = sys.stdout.buffer
+    if args.stats:
+        out.write(json.dumps(aggregate(lines), indent=2).encode() + b"\n")
+    else:
+        for line in lines:
+            out.write(bytes(line) + b"\n")
+    out.flush()
@@ -0,0 +1,138 @@
+# Log rotation into compressed segments, plus a run_id sidecar index.
+#
+# Next to the active file (e.g. logs/agent.jsonl):
+#   logs/segments/agent-<stamp>.jsonl.gz  independent gzip members of ~MEMBER_BYTES each
+#   logs/agent.index.jsonl                one line per (run, segment):
+#                                         {run_id, segment, offset, end, first_ts, last_ts}
+# offset/end are compressed byte offsets of the members holding the run's first and
+# last events, so a past run is read by seeking into one segment and inflating only those.
+import os
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+MEMBER_BYTES = 256 * 1024
+_RID = b'"run_id": "'
+_TS = b'"ts": "'
+
+
+def segments_dir(active: Path) -> Path:
+    return active.parent / "segments"
+
+
+def index_path(active: Path) -> Path:
+    return active.parent / f"{active.stem}.index.jsonl"
+
+
+def field_of(line: bytes, key: bytes) -> Optional[str]:
+    """Pull a string field out of a log_event line without a JSON parse (keys are emitted in a fixed order)."""
+    i = line.find(key)
+    if i < 0:
+        return None
+    i += len(key)
+    j = line.find(b'"', i)
+    return line[i:j].decode("utf-8", "replace") if j > i else None
+
+
+def born_ts(active: Path) -> Optional[float]:
+    """Timestamp of the first record in the active file (for time-based rotation)."""
+    try:
+        with open(active, "rb") as f:
+            first = f.readline(4096)
+    except OSError:
+        return None
+    ts = field_of(first, _TS)
+    if ts is None and first.startswith(b"["):  # agent.log: "[YYYY-mm-dd HH:MM:SS] ..."
+        ts = first[1:20].decode("ascii", "replace").replace(" ", "T")
+    try:
+        return datetime.fromisoformat(ts).timestamp() if ts else None
+    except ValueError:
+        return None
+
+
+def detach(active: Path) -> Path:
+    """Rename the active file aside (caller holds its lock); writers reopen a fresh file."""
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S.%f")
+    aside = active.with_name(f"{active.name}.rotating-{stamp}-{os.getpid()}")
+    os.replace(active, aside)
+    return aside
+
+
+def compress(aside: Path, active: Path, with_index: bool) -> Path:
+    """Compress a detached file into a segment and append its runs to the sidecar index."""
+    seg_dir = segments_dir(active)
+    seg_dir.mkdir(parents=True, exist_ok=True)
+    stamp = aside.name.split(".rotating-", 1)[1]
+    seg = seg_dir / f"{active.stem}-{stamp}{active.suffix}.gz"
+    tmp = seg.with_name(seg.name + ".tmp")
+
+    runs: Dict[str, List] = {}
+    with open(aside, "rb") as src, open(tmp, "wb") as out:
+        while True:
+            lines = src.readlines(MEMBER_BYTES)
+            if not lines:
+                break
+            start = out.tell()
+            out.write(gzip.compress(b"".join(lines), mtime=0))
+            end = out.tell()
+            if with_index:
+                for line in lines:
+                    rid = field_of(line, _RID)
+                    if rid is None:
+                        continue
+                    ts = field_of(line, _TS)
+                    r = runs.get(rid)
+                    if r is None:
+                        runs[rid] = [start, end, ts, ts]
+                    else:
+                        r[1], r[3] = end, ts
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp, seg)
+
+    if runs:
+        from .logging_utils import _append  # flock'd single-write append
+        _append(index_path(active), rotate=False, data="".join(
+            json.dumps({"run_id": rid, "segment": seg.name, "offset": a, "end": b, "first_ts": f, "last_ts": l}) + "\n"
+            for rid, (a, b, f, l) in runs.items()))
+    os.unlink(aside)
+    return seg
+
+
+def index_entries(active: Path, run_id: Optional[str] = None) -> Iterator[dict]:
+    try:
+        with open(index_path(active), "rb") as f:
+            for line in f:
+                if run_id is not None and field_of(line, _RID) != run_id:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def read_segment_range(active: Path, segment: str, offset: int = 0, end: Optional[int] = None) -> bytes:
+    """Inflate only the gzip members in [offset, end) of one segment."""
+    with open(segments_dir(active) / segment, "rb") as f:
+        f.seek(offset)
+        raw = f.read() if end is None else f.read(end - offset)
+    return gzip.decompress(raw)
+
+
+def read_run(active: Path, run_id: str) -> List[dict]:
+    """All events of one run, from rotated segments (via the index) and the active file."""
+    needle = b'"run_id": "' + run_id.encode() + b'"'
+    out: List[dict] = []
+    for e in index_entries(active, run_id):
+        data = read_segment_range(active, e["segment"], e["offset"], e["end"])
+        out.extend(json.loads(l) for l in data.splitlines() if needle in l)
+    try:
+        with open(active, "rb") as f:
+            out.extend(json.loads(l) for l in f if needle in l)
+    except FileNotFoundError:
+        pass
+    return out
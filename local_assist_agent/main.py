@@ -4,11 +4,15 @@ from .config import DEFAULT_SCOPES
 from .planner import plan_from_prompt
 from .executor import execute as exec_plan  # avoid name collision
 from .logging_utils import log_line, log_event, new_run_id
+from . import tracing
 
-def run(prompt: str, execute: bool = False, scopes: List[str] = None, preview: bool = False):
+def run(prompt: str, execute: bool = False, scopes: List[str] = None, preview: bool = False,
+        search_opts: dict = None, report: bool = False, preview_mode: str = None):
     scopes = scopes or DEFAULT_SCOPES
     run_id = new_run_id()
     log_event(run_id, "input.prompt", {"prompt": prompt})
     log_line(f"Prompt: {prompt}", run_id=run_id)
-    plan = plan_from_prompt(prompt)
-    return exec_plan(plan, execute, scopes, run_id=run_id, preview=preview)
+    with tracing.span("plan", run_id):
+        plan = plan_from_prompt(prompt)
+    return exec_plan(plan, execute, scopes, run_id=run_id, preview=preview, search_opts=search_opts, report=report,
+                     preview_mode=preview_mode)
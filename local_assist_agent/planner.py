@@ -1,4 +1,6 @@
 import re
+from functools import lru_cache
+from typing import Iterable, List
 from .schemas import Plan, PlanStep
 
 # ----- helpers -----
@@ -21,6 +23,34 @@ _FILETYPE_TO_PATTERNS = {
     "xls": ["*.xls", "*.xlsx"],
 }
 
+# ----- grammar (compiled once at import) -----
+_UNIT = r"(kib|kb|mib|mb|gib|gb)\b"
+_RX_GT = re.compile(r"(greater than|over|at least|>=?)\s+(\d+(?:\.\d+)?)\s*" + _UNIT)
+_RX_LT = re.compile(r"(less than|under|at most|<=?)\s+(\d+(?:\.\d+)?)\s*" + _UNIT)
+_PERIOD = r"(day|days|week|weeks|month|months|year|years)"
+_RX_OLDER = re.compile(r"older than\s+(\d+)\s+" + _PERIOD)
+_RX_WITHIN = re.compile(r"(within|in the last|in last|last)\s+(\d+)\s+" + _PERIOD)
+# explicit ".ext" and bare type keywords in a single pass
+_RX_TYPES = re.compile(
+    r"\.(?P<ext>exe|zip|msi|pdf|docx?|pptx?|xlsx?)\b"
+    r"|\b(?P<kw>" + "|".join(map(re.escape, _FILETYPE_TO_PATTERNS)) + r")\b"
+)
+_RX_QUOTED = re.compile(r"[\"']([^\"']+)[\"']")
+_RX_NAMED = re.compile(r"\b(containing|named|with name|with)\s+([A-Za-z0-9_\-\.\s]+)", re.IGNORECASE)
+_RX_HINT_STOP = re.compile(r"\b(older|within|last|greater|less|over|under|today|yesterday)\b", re.IGNORECASE)
+_RX_DUPES = re.compile(r"\b(duplicates?|duplicated|dupes?)\b")
+_RX_KEEP = re.compile(r"\bkeep(?:ing)?\s+(?:the\s+)?(newest|latest|oldest|original|first)\b")
+_RX_DU = re.compile(r"taking (?:up )?(?:the most )?space|using (?:the most |up )?space|space usage|disk usage|"
+                    r"\b(?:largest|biggest|heaviest) (?:folders?|dir(?:ectorie)?s?)\b|\bdu\b")
+# 'in the last week', 'within 30 days', 'in total' name a time or amount, not a folder
+_NOT_A_SCOPE = (r"(?:the|my|a|an|last|past|this|next|few|recent(?:ly)?|\d[\w.]*|one|two|three|four|five|six|"
+                r"seven|eight|nine|ten|hours?|days?|weeks?|months?|years?|today|yesterday|total|all|size|"
+                r"order|bytes?|[kmgt]i?b)\b")
+_RX_IN_SCOPE = re.compile(r"\b(?:in|under|inside|within)\s+(?:the\s+|my\s+)?(?!" + _NOT_A_SCOPE + r")(~?[\w./\\-]+)")
+_RX_TOP_N = re.compile(r"\btop\s+(\d+)\b")
+_DELETE_WORDS = ("delete", "remove", "trash", "clean up", "cleanup", "clean")
+_AGE_WORDS = ("older than", "within", "last week", "today", "yesterday")
+
 def _parse_size_kb(text: str):
     """
     Parse 'greater than 500 MB', 'over 1gb', 'less than 200kb' into (min_kb, max_kb).
@@ -49,8 +79,8 @@ def _parse_size_kb(text: str):
             return int(round(val * 1024 * 1024))
         return int(round(val))
 
-    gt = re.search(r"(greater than|over|at least|>=?)\s+(\d+(?:\.\d+)?)\s*(kib|kb|mib|mb|gib|gb)\b", t)
-    lt = re.search(r"(less than|under|at most|<=?)\s+(\d+(?:\.\d+)?)\s*(kib|kb|mib|mb|gib|gb)\b", t)
+    gt = _RX_GT.search(t)
+    lt = _RX_LT.search(t)
 
     min_kb = max_kb = None
     if gt:
@@ -72,8 +102,8 @@ def _parse_age_days(text: str):
     -> returns (newer_than_days, older_than_days)
     """
     t = text.lower()
-    m_older  = re.search(r"older than\s+(\d+)\s+(day|days|week|weeks|month|months|year|years)", t)
-    m_within = re.search(r"(within|in the last|in last|last)\s+(\d+)\s+(day|days|week|weeks|month|months|year|years)", t)
+    m_older  = _RX_OLDER.search(t)
+    m_within = _RX_WITHIN.search(t)
 
     def to_days(num: int, unit: str):
         if unit.startswith("day"): return num
@@ -96,12 +126,19 @@ def _parse_age_days(text: str):
 def _infer_patterns(text: str):
     t = text.lower()
     pats = []
-    # explicit extensions like ".zip"
-    for ext in re.findall(r"\.(exe|zip|msi|pdf|docx?|pptx?|xlsx?)\b", t):
-        pats.append(f"*.{ext}")
-    # type keywords
+    kws = set()
+    for m in _RX_TYPES.finditer(t):
+        ext = m.group("ext")
+        if ext:
+            # explicit extensions like ".zip"; '.doc' also reads as the 'doc' keyword
+            pats.append(f"*.{ext}")
+            if ext in _FILETYPE_TO_PATTERNS:
+                kws.add(ext)
+        else:
+            kws.add(m.group("kw"))
+    # type keywords, in table order
     for k, v in _FILETYPE_TO_PATTERNS.items():
-        if re.search(rf"\b{k}\b", t):
+        if k in kws:
             pats.extend(v)
     if not pats:
         pats = ["*"]
@@ -120,54 +157,89 @@ def _parse_name_hint(text: str):
     Returns a lowercase string or None.
     """
     t = text.strip()
-    q = re.search(r"[\"']([^\"']+)[\"']", t)
+    q = _RX_QUOTED.search(t)
     if q:
         return q.group(1).strip().lower()
 
-    m = re.search(r"\b(containing|named|with name|with)\s+([A-Za-z0-9_\-\.\s]+)", t, re.IGNORECASE)
+    m = _RX_NAMED.search(t)
     if m:
         raw = m.group(2)
         # stop at common keywords
-        raw = re.split(r"\b(older|within|last|greater|less|over|under|today|yesterday)\b", raw, maxsplit=1, flags=re.IGNORECASE)[0]
+        raw = _RX_HINT_STOP.split(raw, maxsplit=1)[0]
         hint = raw.strip().strip(",.;").lower()
         return hint if hint else None
     return None
 
 # ----- planner -----
+_RATIONALE = "Heuristic plan with type/age/size/name parsing; swap with LLM later."
+
+def _normalize(prompt: str) -> str:
+    # every parser lower-cases (the name hint included), so case never changes the plan
+    return (prompt or "").strip().lower()
+
+@lru_cache(maxsize=1024)
+def _parse(p: str):
+    """
+    Normalized prompt -> (intent, search params, intent params), all tuples so the
+    memo can be shared; None for noop.
+    """
+    if _RX_DU.search(p):
+        scope = _RX_IN_SCOPE.search(p)
+        top = _RX_TOP_N.search(p)
+        return "du", (), (("scope_hint", scope.group(1) if scope else None),
+                          ("top", int(top.group(1)) if top else None))
+    dupes = bool(_RX_DUPES.search(p))
+    if not dupes and not any(w in p for w in _DELETE_WORDS):
+        return None
+    patterns = _infer_patterns(p)
+    newer_days, older_days = _parse_age_days(p)
+    min_kb, max_kb = _parse_size_kb(p)
+    name_hint = _parse_name_hint(p)
+
+    # default look-back if no age hinted (not for duplicates: the original is usually old)
+    if not dupes and all(x is None for x in (newer_days, older_days)) and not any(s in p for s in _AGE_WORDS):
+        newer_days = 14
+
+    extra = ()
+    if dupes:
+        k = _RX_KEEP.search(p)
+        extra = (("keep", "newest" if k and k.group(1) in ("newest", "latest") else "oldest"),)
+    return ("dupes" if dupes else "delete"), (
+        ("patterns", tuple(patterns)),
+        ("days", None),
+        ("name_hint", name_hint),
+        ("newer_than_days", newer_days),
+        ("older_than_days", older_days),
+        ("min_size_kb", min_kb),
+        ("max_size_kb", max_kb),
+    ), extra
+
 def plan_from_prompt(prompt: str) -> Plan:
     """
     Heuristic planner with type/age/size + name parsing.
+    Parses are memoized per normalized prompt; each call still gets its own Plan.
     """
-    p = prompt.lower()
+    parsed = _parse(_normalize(prompt))
     steps = []
-    rationale = "Heuristic plan with type/age/size/name parsing; swap with LLM later."
-
-    if any(w in p for w in ("delete", "remove", "trash", "clean up", "cleanup", "clean")):
-        patterns = _infer_patterns(p)
-        newer_days, older_days = _parse_age_days(p)
-        min_kb, max_kb = _parse_size_kb(p)
-        name_hint = _parse_name_hint(prompt)
-
-        # default look-back if no age hinted
-        if all(x is None for x in (newer_days, older_days)) and not any(s in p for s in ("older than", "within", "last week", "today", "yesterday")):
-            newer_days = 14
-
-        steps.append(PlanStep(
-            "search_files",
-            f"Search {', '.join(patterns)} with filters",
-            {
-                "patterns": patterns,
-                "days": None,
-                "name_hint": name_hint,
-                "newer_than_days": newer_days,
-                "older_than_days": older_days,
-                "min_size_kb": min_kb,
-                "max_size_kb": max_kb,
-            }
-        ))
+    if parsed is not None:
+        intent, search, extra = parsed
+        if intent == "du":
+            steps.append(PlanStep("disk_usage", "Rank directories by size; drill down and pick some to trash", dict(extra)))
+            steps.append(PlanStep("select_targets", "Ask user to confirm which director(ies) to delete", {}))
+            steps.append(PlanStep("move_to_trash", "Move selected director(ies) to the Recycle Bin", {}))
+            return Plan(steps=steps, rationale=_RATIONALE)
+        params = dict(search)
+        params["patterns"] = list(params["patterns"])
+        steps.append(PlanStep("search_files", f"Search {', '.join(params['patterns'])} with filters", params))
+        if intent == "dupes":
+            steps.append(PlanStep("find_duplicates", "Group identical files; keep one copy per group", dict(extra)))
         steps.append(PlanStep("select_targets", "Ask user to choose which file(s) to delete", {}))
         steps.append(PlanStep("move_to_trash", "Move selected file(s) to the Recycle Bin", {}))
     else:
         steps.append(PlanStep("noop", "Try: delete zip files older than 30 days containing \"report\"", {}))
 
-    return Plan(steps=steps, rationale=rationale)
+    return Plan(steps=steps, rationale=_RATIONALE)
+
+def plan_many(prompts: Iterable[str]) -> List[Plan]:
+    """Plan a batch of prompts; repeats (after normalization) are parsed once."""
+    return [plan_from_prompt(p) for p in prompts]
@@ -1,5 +1,9 @@
+import os
+import re
 from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Tuple
 from .config import DEFAULT_SCOPES, RISKY_PATTERNS
+from .schemas import FileHit
 def in_allowed_scopes(path: Path, scopes = DEFAULT_SCOPES) -> bool:
    p = path.resolve()
    for root in scopes:
@@ -10,4 +14,84 @@ def in_allowed_scopes(path: Path, scopes = DEFAULT_SCOPES) -> bool:
    return False
 def requires_extra_confirmation(path: Path) -> bool:
    s = str(path).lower()
-   return any(pat.lower() in s for pat in RISKY_PATTERNS)
\ No newline at end of file
+   return any(pat.lower() in s for pat in RISKY_PATTERNS)
+
+class Verdict(NamedTuple):
+    allowed: bool
+    risky: bool
+
+
+class PolicyEngine:
+    """
+    Scope and risk policy compiled once per run.
+
+    - scope roots are resolved once and stored in a prefix trie of path components
+    - RISKY_PATTERNS become one case-insensitive regex
+    - verdicts are cached per parent directory, so a hit costs one dict lookup and
+      an lstat (plus a short regex probe across the parent/name boundary)
+
+    Scope is decided like in_allowed_scopes, by the fully resolved path: ordinary
+    files take the cached verdict of their real parent directory, symlinks are
+    resolved one by one, so a link pointing out of the scopes is not allowed.
+    """
+
+    def __init__(self, scopes=DEFAULT_SCOPES, risky_patterns=RISKY_PATTERNS):
+        self._trie: dict = {}
+        for root in scopes:
+            node = self._trie
+            for part in Path(root).expanduser().resolve().parts:
+                node = node.setdefault(part, {})
+            node[None] = True  # end of a root
+        pats = [p for p in risky_patterns if p]
+        self._risky = re.compile("|".join(re.escape(p) for p in pats), re.IGNORECASE) if pats else None
+        self._tail = max((len(p) for p in pats), default=1) - 1
+        self._dirs: Dict[str, Tuple[bool, bool]] = {}
+
+    def _under_root(self, real_dir: str) -> bool:
+        node = self._trie
+        if None in node:
+            return True
+        for part in Path(real_dir).parts:
+            node = node.get(part)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+    def _dir_verdict(self, parent: str) -> Tuple[bool, bool]:
+        v = self._dirs.get(parent)
+        if v is None:
+            allowed = self._under_root(os.path.realpath(parent))
+            risky = bool(self._risky and self._risky.search(parent))
+            v = self._dirs[parent] = (allowed, risky)
+        return v
+
+    def _split(self, path) -> Tuple[str, str]:
+        if isinstance(path, FileHit):
+            return path.parent, path.name
+        return os.path.split(os.fspath(path))
+
+    def check(self, path) -> Verdict:
+        """Verdict for one path or FileHit."""
+        parent, name = self._split(path)
+        allowed, risky = self._dir_verdict(parent)
+        full = os.path.join(parent, name)
+        if os.path.islink(full):
+            allowed = self._under_root(os.path.realpath(full))
+        if not risky and self._risky:
+            # a pattern may straddle the separator, e.g. '/bin' in '/opt/binaries'
+            probe = (parent[-self._tail:] if self._tail else "") + os.sep + name
+            risky = bool(self._risky.search(probe))
+        return Verdict(allowed, risky)
+
+    def is_allowed(self, path) -> bool:
+        return self.check(path).allowed
+
+    def is_risky(self, path) -> bool:
+        return self.check(path).risky
+
+    def classify(self, hits: Iterable) -> List[Verdict]:
+        """Verdicts for a whole hit list in one call."""
+        check = self.check
+        return [check(h) for h in hits]
@@ -1,13 +1,50 @@
+import os
+import sys
+from array import array
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
-@dataclass
+from typing import Callable, Iterable, List, Sequence
 class FileHit:
-    path: Path; mtime: float; size: int
+    """A search hit: interned parent dir + leaf name; the Path is only built when asked for."""
+    __slots__ = ("parent", "name", "mtime", "size")
+    def __init__(self, path=None, mtime: float = 0.0, size: int = 0, *, parent: str = "", name: str = ""):
+        if path is not None:
+            parent, name = os.path.split(os.fspath(path))
+        self.parent = sys.intern(parent); self.name = name; self.mtime = mtime; self.size = size
+    @property
+    def path(self) -> Path:
+        return Path(self.parent, self.name)
+    @property
+    def fspath(self) -> str:
+        return os.path.join(self.parent, self.name)
+    def __eq__(self, other):
+        if not isinstance(other, FileHit):
+            return NotImplemented
+        return (self.parent, self.name, self.mtime, self.size) == (other.parent, other.name, other.mtime, other.size)
+    def __repr__(self):
+        return f"FileHit(path={self.fspath!r}, mtime={self.mtime!r}, size={self.size!r})"
+class HitView(Sequence):
+    """Positions into a hit sequence; filtering/selecting makes new index views, never copies of hits."""
+    __slots__ = ("base", "idx")
+    def __init__(self, base: Sequence[FileHit], idx: Sequence[int] = None):
+        self.base = base; self.idx = range(len(base)) if idx is None else idx
+    def __len__(self):
+        return len(self.idx)
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return HitView(self.base, self.idx[i])
+        return self.base[int(self.idx[i])]
+    def __iter__(self):
+        base = self.base
+        return (base[int(j)] for j in self.idx)
+    def select(self, positions: Iterable[int]) -> "HitView":
+        """0-based positions within this view -> a narrower view."""
+        return HitView(self.base, array("q", (int(self.idx[p]) for p in positions)))
+    def where(self, pred: Callable[[FileHit], bool]) -> "HitView":
+        return HitView(self.base, array("q", (int(j) for j in self.idx if pred(self.base[int(j)]))))
 @dataclass
 class PlanStep:
     action: str; description: str; params: dict = field(default_factory=dict)
 @dataclass
 class Plan:
     steps: List[PlanStep] = field(default_factory=list); rationale: str = ""
-
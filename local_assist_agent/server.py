@@ -0,0 +1,233 @@
+# Long-running agent on a Unix domain socket (assist_agent.py --serve).
+#
+# Protocol: newline-delimited JSON over one stream connection per request.
+#   client -> {"op": "run", "prompt": ..., "execute": false, "scopes": [...], "preview": false,
+#              "preview_mode": null, "report": false, "search_opts": {...}, "tty": true, "width": 120}
+#   server -> {"type": "out", "text": ...}        console output, in order
+#   server -> {"type": "ask", "prompt": ...}      a confirmation; the client answers with
+#   client -> {"type": "answer", "text": ...}     (or {"type": "answer", "eof": true})
+#   server -> {"type": "done", "result": ...}  |  {"type": "error", "error": ...}
+# Other ops: "ping", "plan" {prompt}, "search" {prompt, scopes, limit}, "stop".
+#
+# What stays warm between requests: imported modules (rich, numpy, ...), the planner memo,
+# one PolicyEngine per scope set, and the metadata index kept live by an in-process watcher.
+import os
+import json
+import time
+import socket
+import threading
+import socketserver
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Optional
+
+from rich.console import Console
+
+from .config import DEFAULT_SCOPES, SERVER_SOCKET, SERVER_USE_INDEX, SERVER_POLICY_CACHE
+from . import executor
+from .main import run as run_agent
+from .planner import plan_from_prompt
+from .policies import PolicyEngine
+from .logging_utils import log_line
+
+
+class _Out:
+    """File-like sink turning console writes into "out" messages."""
+
+    def __init__(self, send):
+        self._send = send
+
+    def write(self, text: str) -> int:
+        if text:
+            self._send({"type": "out", "text": text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+class Session:
+    """One client connection, bound to executor.session while a request runs."""
+
+    def __init__(self, server: "AgentServer", rfile, wfile, tty: bool = False, width: int = 100):
+        self.server = server
+        self._rfile = rfile
+        self._wfile = wfile
+        self._lock = threading.Lock()  # rich's Live refresh thread writes too
+        self.console = Console(file=_Out(self.send), force_terminal=tty, width=width,
+                               color_system="auto" if tty else None)
+
+    def send(self, msg: dict):
+        data = (json.dumps(msg, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            self._wfile.write(data)
+            self._wfile.flush()
+
+    def ask(self, prompt: str) -> str:
+        self.send({"type": "ask", "prompt": prompt})
+        line = self._rfile.readline()
+        if not line:
+            raise EOFError("client went away")
+        msg = json.loads(line)
+        if msg.get("eof"):
+            raise EOFError
+        return str(msg.get("text", ""))
+
+    def policy(self, scopes) -> PolicyEngine:
+        return self.server.policy(scopes)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        self.server.requests += 1
+        try:
+            req = json.loads(line)
+            sess = Session(self.server, self.rfile, self.wfile,
+                           tty=bool(req.get("tty")), width=int(req.get("width") or 100))
+        except (ValueError, TypeError, AttributeError) as e:
+            self.wfile.write((json.dumps({"type": "error", "error": f"bad request: {e}"}) + "\n").encode())
+            return
+        try:
+            result = self.server.dispatch(req, sess)
+            sess.send({"type": "done", "result": result})
+            if req.get("op") == "stop":
+                # only after the reply is out: the process may exit as soon as serving stops
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+        except (BrokenPipeError, ConnectionResetError, EOFError):
+            pass  # client hung up mid-conversation
+        except Exception as e:
+            try:
+                sess.send({"type": "error", "error": f"{type(e).__name__}: {e}"})
+            except OSError:
+                pass
+
+
+class AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    allow_reuse_address = False
+
+    def __init__(self, path=SERVER_SOCKET, scopes=None, use_index: bool = SERVER_USE_INDEX):
+        self.path = str(path)
+        self.scopes = list(scopes or DEFAULT_SCOPES)
+        self.use_index = use_index
+        self.started = time.time()
+        self.requests = 0
+        self._policies: "OrderedDict[tuple, PolicyEngine]" = OrderedDict()
+        self._policy_lock = threading.Lock()
+        _claim_socket(self.path)
+        old = os.umask(0o177)  # socket is 0600: only this user may drive the agent
+        try:
+            super().__init__(self.path, _Handler)
+        finally:
+            os.umask(old)
+
+    def policy(self, scopes) -> PolicyEngine:
+        key = tuple(scopes)
+        with self._policy_lock:
+            eng = self._policies.get(key)
+            if eng is None:
+                eng = self._policies[key] = PolicyEngine(scopes)
+                while len(self._policies) > SERVER_POLICY_CACHE:
+                    self._policies.popitem(last=False)
+            else:
+                self._policies.move_to_end(key)
+            return eng
+
+    def _search_opts(self, req: dict) -> dict:
+        """
+        The client's options, plus the warm index when the server has one and nothing in
+        them needs a real walk (a deadline or a resumed checkpoint applies only to walks).
+        """
+        opts = dict(req.get("search_opts") or {})
+        from .skills.files import search_deadline
+        if self.use_index and search_deadline(opts.get("deadline"), use_index=True) is None and not opts.get("resume"):
+            opts["use_index"] = True
+        return opts
+
+    def dispatch(self, req: dict, sess: Session):
+        op = req.get("op")
+        if op == "ping":
+            return {"pid": os.getpid(), "uptime_s": round(time.time() - self.started, 1), "requests": self.requests}
+        if op == "plan":
+            return asdict(plan_from_prompt(req.get("prompt") or ""))
+        if op == "search":
+            from .skills.files import find_recent
+            plan = plan_from_prompt(req.get("prompt") or "")
+            step = next((s for s in plan.steps if s.action == "search_files"), None)
+            if step is None:
+                return []
+            opts = self._search_opts(req)
+            hits = find_recent(req.get("scopes") or self.scopes, use_index=opts.get("use_index", False),
+                               workers=opts.get("workers"), limit=req.get("limit"),
+                               prune=opts.get("prune", True), **step.params)
+            return [{"path": h.fspath, "size": h.size, "mtime": h.mtime} for h in hits]
+        if op == "run":
+            token = executor.session.set(sess)
+            try:
+                run_agent(req.get("prompt"), execute=bool(req.get("execute")),
+                          scopes=req.get("scopes") or self.scopes, preview=bool(req.get("preview")),
+                          search_opts=self._search_opts(req), report=bool(req.get("report")),
+                          preview_mode=req.get("preview_mode"))
+            finally:
+                executor.session.reset(token)
+            return None
+        if op == "stop":
+            return None  # the handler shuts the server down once it has replied
+        raise ValueError(f"unknown op {op!r}")
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def _claim_socket(path: str):
+    """Remove a stale socket file; refuse if another server still answers on it."""
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"an agent server is already listening on {path}")
+
+
+def _start_watcher(scopes):
+    def run():
+        from .watcher import watch
+        try:
+            watch(scopes)
+        except Exception as e:  # no inotify here: queries fall back to incremental refresh
+            log_line(f"server: watcher unavailable ({e})", level="WARN")
+    threading.Thread(target=run, name="index-watcher", daemon=True).start()
+
+
+def serve(scopes=None, path=SERVER_SOCKET, use_index: bool = SERVER_USE_INDEX, watch: bool = True,
+          ready: Optional[threading.Event] = None):
+    """Run the agent server until interrupted (or a "stop" request)."""
+    srv = AgentServer(path, scopes, use_index)
+    if use_index and watch:
+        _start_watcher(srv.scopes)
+    log_line(f"server: listening on {srv.path} (pid {os.getpid()})")
+    if ready is not None:
+        ready.set()
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
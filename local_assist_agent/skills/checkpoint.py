@@ -0,0 +1,55 @@
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from ..schemas import FileHit
+from ..config import CHECKPOINT_DIR, CHECKPOINT_MAX_AGE_S
+
+# A truncated search saved as {"pending": [dirs not yet listed], "hits": [[path, size, mtime]]}.
+# Resuming yields the saved hits, then walks only the pending directories.
+
+
+def search_key(roots: Iterable[str], patterns: Iterable[str], name_hint: Optional[str], bounds: tuple,
+               prune: bool) -> str:
+    """Identity of a search: the same scopes, patterns and filters resume the same checkpoint."""
+    blob = json.dumps([sorted(roots), sorted(patterns), name_hint, list(bounds), bool(prune)])
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _path(key: str) -> Path:
+    return Path(CHECKPOINT_DIR) / f"{key}.json"
+
+
+def save(key: str, pending: List[str], hits: Iterable[FileHit]) -> Path:
+    path = _path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "saved": time.time(),
+        "pending": list(pending),
+        "hits": [[h.fspath, h.size, h.mtime] for h in hits],
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def load(key: str) -> Optional[Tuple[List[str], List[FileHit]]]:
+    """(pending dirs, hits found so far), or None if there is no usable checkpoint."""
+    try:
+        data = json.loads(_path(key).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if time.time() - data.get("saved", 0) > CHECKPOINT_MAX_AGE_S:
+        return None
+    return data["pending"], [FileHit(p, mtime=m, size=s) for p, s, m in data["hits"]]
+
+
+def clear(key: str):
+    try:
+        _path(key).unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,168 @@
+import os
+import time
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .scan import ScanStats
+from ..config import DU_DB
+
+# Same rule as the metadata index: a directory changed within this window of its
+# scan is stored as "unknown" and listed again next time.
+_RACY_WINDOW_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS du (
+    path       TEXT PRIMARY KEY,
+    parent     TEXT,
+    mtime_ns   INTEGER NOT NULL,
+    own_bytes  INTEGER NOT NULL,
+    own_files  INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS du_parent ON du(parent);
+"""
+
+
+def open_cache(db_path: Path = None) -> sqlite3.Connection:
+    db_path = Path(db_path or DU_DB)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _usage(st: os.stat_result) -> int:
+    """Bytes actually allocated on disk where the OS reports it (sparse files count small)."""
+    blocks = getattr(st, "st_blocks", None)
+    return blocks * 512 if blocks is not None else st.st_size
+
+
+def _list_dir(d: str, dev: int, stats: ScanStats) -> Tuple[int, int, List[str]]:
+    """One scandir pass: (own_bytes, own_files, subdirs on the same filesystem)."""
+    own_bytes = own_files = 0
+    subdirs: List[str] = []
+    with os.scandir(d) as it:
+        for e in it:
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    stats.stat_calls += 1
+                    if e.stat(follow_symlinks=False).st_dev == dev:  # like du -x
+                        subdirs.append(e.path)
+                    continue
+                stats.files += 1
+                stats.stat_calls += 1
+                own_bytes += _usage(e.stat(follow_symlinks=False))
+                own_files += 1
+            except OSError:
+                stats.errors += 1
+    stats.dirs += 1
+    return own_bytes, own_files, subdirs
+
+
+class DuTree:
+    """Aggregated sizes for one root: total bytes/files per directory and its children."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.total: Dict[str, int] = {}
+        self.files: Dict[str, int] = {}
+        self.own: Dict[str, int] = {}
+        self.mtime: Dict[str, float] = {}
+        self.kids: Dict[str, List[str]] = {}
+        self.rescanned = 0
+        self.reused = 0
+
+    def children(self, d: str) -> List[Tuple[str, int, int]]:
+        """[(path, bytes, files)] for the subdirectories of d, largest first."""
+        return sorted(((k, self.total[k], self.files[k]) for k in self.kids.get(d, ())),
+                      key=lambda t: -t[1])
+
+    def top(self, n: int, d: Optional[str] = None) -> List[Tuple[str, int, int]]:
+        return self.children(d or self.root)[:n]
+
+    def largest(self, n: int) -> List[Tuple[str, int, int]]:
+        """The n largest directories anywhere below the root."""
+        import heapq
+        return heapq.nlargest(n, ((p, b, self.files[p]) for p, b in self.total.items() if p != self.root),
+                              key=lambda t: t[1])
+
+
+def _subtree_rows(conn: sqlite3.Connection, root: str):
+    prefix = root.rstrip(os.sep) + os.sep
+    hi = prefix[:-1] + chr(ord(os.sep) + 1)
+    yield from conn.execute("SELECT path, parent, mtime_ns, own_bytes, own_files FROM du WHERE path = ?", (root,))
+    yield from conn.execute(
+        "SELECT path, parent, mtime_ns, own_bytes, own_files FROM du WHERE path >= ? AND path < ?", (prefix, hi))
+
+
+def usage(root: str, conn: Optional[sqlite3.Connection] = None, stats: Optional[ScanStats] = None) -> DuTree:
+    """
+    Per-directory totals for `root`. Every directory is stat()ed once; only those whose
+    mtime changed since the cached visit are listed again, everything else reuses its
+    cached own size and child list. As with any mtime-keyed cache, a file rewritten in
+    place shows its new size once its directory changes.
+    """
+    root = os.path.realpath(os.path.expanduser(root))
+    stats = stats if stats is not None else ScanStats()
+    own_conn = conn is None
+    conn = conn or open_cache()
+    tree = DuTree(root)
+    try:
+        cached: Dict[str, Tuple[int, int, int]] = {}
+        cached_kids: Dict[str, List[str]] = {}
+        for path, parent, mtime_ns, ob, of in _subtree_rows(conn, root):
+            cached[path] = (mtime_ns, ob, of)
+            if parent is not None:
+                cached_kids.setdefault(parent, []).append(path)
+
+        dev = os.stat(root).st_dev
+        now_ns = time.time_ns()
+        order: List[str] = []
+        updates = []
+        stack: List[Tuple[str, Optional[str]]] = [(root, None)]
+        while stack:
+            d, parent = stack.pop()
+            try:
+                stats.stat_calls += 1
+                st = os.stat(d)
+            except OSError:
+                stats.errors += 1
+                continue
+            c = cached.get(d)
+            if c is not None and c[0] == st.st_mtime_ns:
+                ob, of = c[1], c[2]
+                subdirs = cached_kids.get(d, [])
+                tree.reused += 1
+            else:
+                try:
+                    ob, of, subdirs = _list_dir(d, dev, stats)
+                except OSError:
+                    stats.errors += 1
+                    continue
+                racy = now_ns - st.st_mtime_ns < _RACY_WINDOW_NS
+                updates.append((d, parent, -1 if racy else st.st_mtime_ns, ob, of))
+                tree.rescanned += 1
+            order.append(d)
+            tree.own[d] = ob
+            tree.files[d] = of
+            tree.mtime[d] = st.st_mtime
+            tree.kids[d] = []
+            if parent is not None:
+                tree.kids[parent].append(d)
+            stack.extend((s, d) for s in subdirs)
+
+        # children always come after their parent in `order`: roll totals up in reverse
+        for d in reversed(order):
+            tree.total[d] = tree.own[d] + sum(tree.total[k] for k in tree.kids[d])
+            tree.files[d] += sum(tree.files[k] for k in tree.kids[d])
+
+        gone = [p for p in cached if p not in tree.own]
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO du VALUES (?, ?, ?, ?, ?)", updates)
+            conn.executemany("DELETE FROM du WHERE path = ?", ((p,) for p in gone))
+    finally:
+        if own_conn:
+            conn.close()
+    return tree
@@ -0,0 +1,194 @@
+import os
+import sqlite3
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..schemas import FileHit
+from ..config import HASH_DB, HASH_WORKERS, DUPES_EDGE_BYTES
+
+_CHUNK = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev      INTEGER NOT NULL,
+    ino      INTEGER NOT NULL,
+    kind     TEXT NOT NULL,      -- 'edge' (first+last DUPES_EDGE_BYTES) or 'full'
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest   BLOB NOT NULL,
+    PRIMARY KEY (dev, ino, kind)
+);
+"""
+
+# (dev, ino, size, mtime_ns): a cached digest is only trusted while all four still match
+Key = Tuple[int, int, int, int]
+
+
+class HashCache:
+    """Digests keyed by (dev, inode, size, mtime) so unchanged files are never re-read."""
+
+    def __init__(self, db_path: Path):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def get(self, key: Key, kind: str) -> Optional[bytes]:
+        dev, ino, size, mtime_ns = key
+        row = self.conn.execute(
+            "SELECT digest FROM hashes WHERE dev=? AND ino=? AND kind=? AND size=? AND mtime_ns=?",
+            (dev, ino, kind, size, mtime_ns)).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, rows: Iterable[Tuple[Key, str, bytes]]):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO hashes(dev, ino, kind, size, mtime_ns, digest) VALUES (?,?,?,?,?,?)",
+                [(k[0], k[1], kind, k[2], k[3], d) for k, kind, d in rows])
+
+    def close(self):
+        self.conn.close()
+
+
+def _read_at(fd: int, n: int, offset: int) -> bytes:
+    if hasattr(os, "pread"):
+        return os.pread(fd, n, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, n)
+
+
+def edge_digest(path: str, size: int, edge: int = DUPES_EDGE_BYTES) -> bytes:
+    """Hash of the first and last `edge` bytes (the whole file when it is small)."""
+    h = hashlib.blake2b(digest_size=16)
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if size <= 2 * edge:
+            h.update(_read_at(fd, size, 0))
+        else:
+            h.update(_read_at(fd, edge, 0))
+            h.update(_read_at(fd, edge, size - edge))
+    finally:
+        os.close(fd)
+    return h.digest()
+
+
+def full_digest(path: str) -> bytes:
+    h = hashlib.blake2b(digest_size=32)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            b = f.read(_CHUNK)
+            if not b:
+                break
+            h.update(b)  # hashlib releases the GIL on large buffers, so threads overlap
+    return h.digest()
+
+
+def _hash_stage(cands: List[Tuple[FileHit, Key]], kind: str, cache: HashCache, pool,
+                edge: int) -> Dict[int, bytes]:
+    """Digest per candidate position; cached digests are reused, the rest hashed on the pool."""
+    out: Dict[int, bytes] = {}
+    todo = []
+    for i, (hit, key) in enumerate(cands):
+        d = cache.get(key, kind)
+        if d is None:
+            todo.append(i)
+        else:
+            out[i] = d
+
+    def work(i):
+        hit, key = cands[i]
+        try:
+            return i, (edge_digest(hit.fspath, key[2], edge) if kind == "edge" else full_digest(hit.fspath))
+        except OSError:
+            return i, None
+
+    fresh = []
+    for i, d in pool.map(work, todo):
+        if d is not None:
+            out[i] = d
+            fresh.append((cands[i][1], kind, d))
+    cache.put_many(fresh)
+    return out
+
+
+def find_duplicates(hits: Iterable[FileHit], db_path: Optional[Path] = None, workers: int = HASH_WORKERS,
+                    edge: int = DUPES_EDGE_BYTES) -> List[List[FileHit]]:
+    """
+    Groups of files with identical content, largest wasted space first.
+
+    1. bucket by size (unique sizes cannot have a twin; empty files are ignored)
+    2. hash the first and last `edge` bytes of what is left, regroup
+    3. full hash only for groups that still collide and are larger than 2*edge
+    Hard links to one inode count once: trashing a second link frees nothing.
+    """
+    by_size: Dict[int, List[FileHit]] = defaultdict(list)
+    for h in hits:
+        if h.size:
+            by_size[h.size].append(h)
+
+    cands: List[Tuple[FileHit, Key]] = []
+    for size, group in by_size.items():
+        if len(group) < 2:
+            continue
+        seen = set()
+        for h in group:
+            try:
+                st = os.stat(h.fspath)
+            except OSError:
+                continue
+            if (st.st_dev, st.st_ino) in seen and st.st_ino:
+                continue
+            seen.add((st.st_dev, st.st_ino))
+            cands.append((h, (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)))
+    if not cands:
+        return []
+
+    cache = HashCache(db_path or HASH_DB)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            edges = _hash_stage(cands, "edge", cache, pool, edge)
+            by_edge: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+            for i, d in edges.items():
+                by_edge[(cands[i][1][2], d)].append(i)
+
+            groups: List[List[int]] = []
+            need_full: List[int] = []
+            for (size, _), idx in by_edge.items():
+                if len(idx) < 2:
+                    continue
+                if size <= 2 * edge:
+                    groups.append(idx)  # the edge hash already covered the whole file
+                else:
+                    need_full.extend(idx)
+
+            if need_full:
+                sub = [cands[i] for i in need_full]
+                fulls = _hash_stage(sub, "full", cache, pool, edge)
+                by_full: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+                for j, d in fulls.items():
+                    by_full[(sub[j][1][2], d)].append(need_full[j])
+                groups.extend(idx for idx in by_full.values() if len(idx) > 1)
+    finally:
+        cache.close()
+
+    out = [sorted((cands[i][0] for i in g), key=lambda h: h.mtime) for g in groups]
+    out.sort(key=lambda g: -(g[0].size * (len(g) - 1)))
+    return out
+
+
+def keeper(group: List[FileHit], keep: str = "oldest") -> FileHit:
+    """The copy to keep: 'oldest' (the original download) or 'newest'."""
+    return max(group, key=lambda h: h.mtime) if keep == "newest" else min(group, key=lambda h: h.mtime)
+
+
+def extras(groups: List[List[FileHit]], keep: Dict[int, str], default: str = "oldest") -> List[FileHit]:
+    """Everything but the keeper of each group; keep maps group index -> 'newest'|'oldest'."""
+    out = []
+    for gi, g in enumerate(groups):
+        k = keeper(g, keep.get(gi, default))
+        out.extend(h for h in g if h is not k)
+    return out
@@ -1,11 +1,73 @@
+import os
 import time
+import heapq
+import itertools
 from pathlib import Path
-from typing import Iterable, Optional, List, Tuple, Dict, Any
+from typing import Iterable, Iterator, Optional, List, Tuple, Dict, Any
 
-from send2trash import send2trash
 from ..schemas import FileHit
+from .scan import Budget, ScanStats, walk, walk_parallel
+from .query import CompiledQuery, dedupe, normalize_scopes
+from .prune import load_pruner
+from . import checkpoint
+from ..config import INDEX_DB, WATCH_STALE_S, SCAN_WORKERS, SEARCH_DEADLINE_S
+from .. import tracing
 
-def find_recent(
+def _cutoffs(days, newer_than_days, older_than_days, min_size_kb, max_size_kb):
+    """Turn find_recent's day/KB arguments into absolute (newer, older, min_bytes, max_bytes) bounds."""
+    now = time.time()
+
+    if newer_than_days is None and older_than_days is None and days is not None:
+        newer_than_days = days  # legacy behavior
+
+    newer_cutoff = None if newer_than_days is None else now - newer_than_days * 86400
+    older_cutoff = None if older_than_days is None else now - older_than_days * 86400
+
+    min_bytes = None if min_size_kb is None else min_size_kb * 1024
+    max_bytes = None if max_size_kb is None else max_size_kb * 1024
+    return newer_cutoff, older_cutoff, min_bytes, max_bytes
+
+
+def _walk_matching(roots, patterns, name_hint, stats, workers, prune=True, budget=None, frontier=None):
+    """
+    (path, stat) for every file matching the patterns/name hint, each file once.
+    With a frontier (resumed checkpoint), only those directories are walked.
+    """
+    q = CompiledQuery(roots, patterns, name_hint)
+    pruner = load_pruner(q.roots, prune)
+    targets = q.targets() if frontier is None else [(d, q.matcher(d)) for d in frontier]
+    workers = SCAN_WORKERS if workers is None else workers
+    if workers > 1:
+        found = tracing.timed_iter("search.walk_parallel", walk_parallel(targets, workers, stats, pruner, budget),
+                                   roots=len(targets), workers=workers)
+    else:
+        found = (f for d, m in targets
+                 for f in tracing.timed_iter("search.root", walk(d, m, stats, pruner, budget), root=d))
+    return dedupe(found)
+
+
+def search_deadline(deadline: Optional[float] = None, use_index: bool = False) -> Optional[float]:
+    """
+    The deadline a search runs with: the caller's, else config.SEARCH_DEADLINE_S. The index
+    is not a walk, so the configured default never applies to indexed searches.
+    """
+    if deadline is not None:
+        return deadline
+    return None if use_index else SEARCH_DEADLINE_S
+
+
+def save_checkpoint(budget: Optional[Budget], hits: Iterable[FileHit]) -> Optional[Path]:
+    """
+    Persist a truncated search: the budget's unvisited frontier, the hits collected so
+    far and any matches the walk found but never delivered. None if nothing to save.
+    """
+    if budget is None or not budget.truncated or budget.key is None:
+        return None
+    undelivered = (FileHit(p, mtime=st.st_mtime, size=st.st_size) for p, st in budget.leftover)
+    return checkpoint.save(budget.key, budget.pending, itertools.chain(hits, undelivered))
+
+
+def iter_recent(
     roots: Iterable[str],
     patterns: Iterable[str] = ("*.exe",),
     days: Optional[int] = 14,
@@ -14,56 +76,205 @@ def find_recent(
     older_than_days: Optional[int] = None,
     min_size_kb: Optional[int] = None,
     max_size_kb: Optional[int] = None,
-) -> List[FileHit]:
-    """Files only (ignore dirs); sorted newest-first; optional time/size filters."""
-    now = time.time()
+    stats: Optional[ScanStats] = None,
+    use_index: bool = False,
+    workers: Optional[int] = None,
+    prune: bool = True,
+    budget: Optional[Budget] = None,
+) -> Iterator[FileHit]:
+    """
+    Yield matching files as they are found (unordered); same filters as find_recent.
+    Nested roots are folded into their parent and every file is yielded at most once.
+    Each root is walked once (os.scandir); all patterns are matched in one pass.
+    With workers > 1, roots are grouped by device and walked by a work-stealing
+    pool per device. Unless prune is False, subdirectories matching config.PRUNE_PATTERNS
+    or a scope's ignore file are skipped. With use_index, roots are refreshed incrementally
+    in the on-disk index and the filters are answered there instead.
 
-    if newer_than_days is None and older_than_days is None and days is not None:
-        newer_than_days = days  # legacy behavior
+    With a budget, the walk stops once it expires (or is cancelled) and the budget is
+    marked truncated; save_checkpoint() then records where it stopped. A budget with
+    resume=True first yields the hits saved by the last truncated run of the same
+    search and walks only its unvisited directories. The index is not a walk: use_index
+    with a deadline or resume raises ValueError.
+    """
+    newer_cutoff, older_cutoff, min_bytes, max_bytes = _cutoffs(
+        days, newer_than_days, older_than_days, min_size_kb, max_size_kb)
 
-    newer_cutoff = None if newer_than_days is None else now - newer_than_days * 86400
-    older_cutoff = None if older_than_days is None else now - older_than_days * 86400
+    if use_index and budget is not None and (budget.deadline is not None or budget.resume):
+        raise ValueError("a search deadline or resume needs a walk; it cannot be answered from the index")
+    if use_index:
+        yield from _find_indexed(roots, patterns, newer_cutoff, older_cutoff, min_bytes, max_bytes, name_hint, stats,
+                                 prune)
+        return
 
-    hits: List[FileHit] = []
-    for root in roots:
-        rp = Path(root).expanduser()
-        if not rp.exists():
-            continue
-        for pat in patterns:
-            for p in rp.rglob(pat):
-                try:
-                    if not p.is_file():
-                        continue
-                except Exception:
-                    continue
-                try:
-                    st = p.stat()
-                except Exception:
-                    continue
-                mtime = st.st_mtime
-                size_bytes = st.st_size
-
-                if newer_cutoff is not None and not (mtime >= newer_cutoff):
-                    continue
-                if older_cutoff is not None and not (mtime <= older_cutoff):
-                    continue
-                if min_size_kb is not None and not (size_bytes >= min_size_kb * 1024):
-                    continue
-                if max_size_kb is not None and not (size_bytes <= max_size_kb * 1024):
-                    continue
-                if name_hint and name_hint.lower() not in p.name.lower():
-                    continue
-
-                hits.append(FileHit(path=p, mtime=mtime, size=size_bytes))
+    def keep(mtime: float, size_bytes: int) -> bool:
+        return ((newer_cutoff is None or mtime >= newer_cutoff) and (older_cutoff is None or mtime <= older_cutoff)
+                and (min_bytes is None or size_bytes >= min_bytes) and (max_bytes is None or size_bytes <= max_bytes))
 
+    frontier = seen = None
+    if budget is not None and budget.checkpoint:
+        patterns = list(patterns)
+        budget.key = checkpoint.search_key(
+            normalize_scopes(roots), patterns, name_hint,
+            (days, newer_than_days, older_than_days, min_size_kb, max_size_kb), prune)
+        saved = checkpoint.load(budget.key) if budget.resume else None
+        if saved is not None:
+            frontier, done = saved
+            seen = {h.fspath for h in done}
+            yield from (h for h in done if keep(h.mtime, h.size))  # the cutoffs move with the clock
+
+    found = _walk_matching(roots, patterns, name_hint, stats, workers, prune, budget, frontier)
+    try:
+        for path, st in found:
+            if seen is not None and path in seen:
+                continue  # a directory interrupted half-way is listed again on resume
+            if keep(st.st_mtime, st.st_size):
+                yield FileHit(path, mtime=st.st_mtime, size=st.st_size)
+    finally:
+        found.close()  # let the walk record its frontier now, not when it is collected
+        if budget is not None:
+            budget.leftover = [(p, st) for p, st in budget.leftover
+                               if keep(st.st_mtime, st.st_size) and (seen is None or p not in seen)]
+    if budget is not None and budget.key is not None and not budget.truncated:
+        checkpoint.clear(budget.key)
+
+
+class NewestFirst:
+    """Bounded newest-first selection: a min-heap holding the K newest hits seen so far."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, int, FileHit]] = []
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, hit: FileHit):
+        item = (hit.mtime, self._seq, hit)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif hit.mtime > self._heap[0][0]:
+            heapq.heapreplace(self._heap, item)
+
+    def sorted(self) -> List[FileHit]:
+        return [h for _, _, h in sorted(self._heap, key=lambda t: t[0], reverse=True)]
+
+
+def find_recent(
+    roots: Iterable[str],
+    patterns: Iterable[str] = ("*.exe",),
+    days: Optional[int] = 14,
+    name_hint: Optional[str] = None,
+    newer_than_days: Optional[int] = None,
+    older_than_days: Optional[int] = None,
+    min_size_kb: Optional[int] = None,
+    max_size_kb: Optional[int] = None,
+    stats: Optional[ScanStats] = None,
+    use_index: bool = False,
+    workers: Optional[int] = None,
+    limit: Optional[int] = None,
+    prune: bool = True,
+    budget: Optional[Budget] = None,
+) -> List[FileHit]:
+    """
+    Files only (ignore dirs); sorted newest-first; optional time/size filters.
+    With limit, only the `limit` newest hits are kept (bounded heap, not a full sort).
+    With a budget, Ctrl-C or the deadline ends the search early: the hits found so far
+    are returned, budget.truncated is set and a checkpoint is saved for budget.resume.
+    See iter_recent for the traversal options.
+    """
+    if budget is not None:
+        return _find_budgeted(roots, patterns, days, name_hint, newer_than_days, older_than_days,
+                              min_size_kb, max_size_kb, stats, use_index, workers, limit, prune, budget)
+    stream = iter_recent(roots, patterns, days, name_hint, newer_than_days, older_than_days,
+                         min_size_kb, max_size_kb, stats=stats, use_index=use_index, workers=workers,
+                         prune=prune)
+    if limit is not None:
+        top = NewestFirst(limit)
+        for h in stream:
+            top.push(h)
+        return top.sorted()
+    hits = list(stream)
     hits.sort(key=lambda h: h.mtime, reverse=True)
     return hits
 
+
+def _find_budgeted(roots, patterns, days, name_hint, newer_than_days, older_than_days, min_size_kb, max_size_kb,
+                   stats, use_index, workers, limit, prune, budget) -> List[FileHit]:
+    stream = iter_recent(roots, patterns, days, name_hint, newer_than_days, older_than_days, min_size_kb,
+                         max_size_kb, stats=stats, use_index=use_index, workers=workers, prune=prune, budget=budget)
+    top = NewestFirst(limit) if limit is not None else None
+    hits: List[FileHit] = []
+    try:
+        for h in stream:
+            if top is not None:
+                top.push(h)
+            else:
+                hits.append(h)
+    except KeyboardInterrupt:
+        budget.cancel()
+    finally:
+        stream.close()
+    if top is not None:
+        hits = top.sorted()
+    else:
+        hits.sort(key=lambda h: h.mtime, reverse=True)
+    save_checkpoint(budget, hits)
+    return hits
+
+def _pruned_dirs(pruner, roots):
+    """dir -> True if it lies in a pruned subtree (memoized walk up to the scope root)."""
+    memo = {r: False for r in roots}
+
+    def pruned(d: str) -> bool:
+        hit = memo.get(d)
+        if hit is None:
+            parent, name = os.path.split(d)
+            hit = memo[d] = parent != d and (pruned(parent) or pruner(d, name))
+        return hit
+    return pruned
+
+
+def _find_indexed(roots, patterns, newer_cutoff, older_cutoff, min_bytes, max_bytes, name_hint, stats,
+                  prune=True) -> List[FileHit]:
+    from .index import open_index, refresh, query, watched_roots
+
+    conn = open_index(INDEX_DB)
+    try:
+        # Roots kept live by a running watcher are answered without touching them at all
+        live = set(watched_roots(conn, WATCH_STALE_S))
+        dirs = [d for d in normalize_scopes(roots) if d in live or os.path.isdir(d)]
+        pruner = load_pruner(dirs, prune)
+        for d in dirs:
+            if d not in live:
+                # pruned subtrees are never listed, and dropped if an earlier refresh stored them
+                with tracing.span("index.refresh", root=d):
+                    refresh(conn, d, stats, prune=pruner)
+        with tracing.span("index.query", roots=len(dirs)):
+            rows = query(conn, dirs, patterns, newer_cutoff, older_cutoff, min_bytes, max_bytes, name_hint)
+    finally:
+        conn.close()
+    watched = [d for d in dirs if d in live]
+    if pruner is not None and watched:
+        # a watcher mirrors every file; apply the walk's prune rules to what it stored
+        pruned = _pruned_dirs(pruner, dirs)
+        rows = [r for r in rows if not pruned(os.path.dirname(r[0]))]
+    return [FileHit(p, mtime=m, size=s) for p, m, s in rows]
+
 def move_to_trash(paths: Iterable[Path]) -> Tuple[int, List[str], List[Dict[str, Any]]]:
     """
     Send paths to Recycle Bin. Returns:
       ok_count, list_of_error_strings, detailed_outcomes[{path, ok, error}]
+    On freedesktop systems the bulk engine renames into each device's own trash.
     """
+    from send2trash import send2trash  # only paid for when something is actually trashed
+    from . import trash
+
+    if trash.SUPPORTED:
+        return trash.bulk_trash(paths, fallback=send2trash)
+
     ok = 0
     errs: List[str] = []
     outcomes: List[Dict[str, Any]] = []
@@ -0,0 +1,288 @@
+import os
+import re
+import time
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .scan import ScanStats, compile_patterns
+from .prune import Pruner
+from .query import fold_patterns, is_case_insensitive
+
+# Directories modified this recently are re-listed on the next refresh too:
+# a change landing in the same mtime tick as our scan would otherwise be missed.
+_RACY_WINDOW_NS = 2_000_000_000
+
+_SIMPLE_EXT = re.compile(r"^\*(\.[^*?\[\]./\\]+)$")
+_CASE_FOLD = os.name == "nt"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path     TEXT PRIMARY KEY,
+    parent   TEXT,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+CREATE TABLE IF NOT EXISTS files (
+    path  TEXT PRIMARY KEY,
+    dir   TEXT NOT NULL,
+    name  TEXT NOT NULL,
+    ext   TEXT NOT NULL,
+    size  INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+CREATE INDEX IF NOT EXISTS files_ext ON files(ext);
+CREATE INDEX IF NOT EXISTS files_mtime ON files(mtime);
+CREATE TABLE IF NOT EXISTS pruned (
+    path   TEXT PRIMARY KEY,
+    parent TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pruned_parent ON pruned(parent);
+CREATE TABLE IF NOT EXISTS scopes (
+    root      TEXT PRIMARY KEY,
+    refreshed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS watchers (
+    root      TEXT PRIMARY KEY,
+    pid       INTEGER NOT NULL,
+    heartbeat REAL NOT NULL
+);
+"""
+
+
+def open_index(db_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the metadata index. WAL so several agents can share it."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _ext(name: str) -> str:
+    e = os.path.splitext(name)[1]
+    return e.lower() if _CASE_FOLD else e
+
+
+def _subtree_bounds(path: str) -> Tuple[str, str]:
+    """[lo, hi) string range covering every path strictly below `path`."""
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def _drop_subtree(conn: sqlite3.Connection, path: str):
+    lo, hi = _subtree_bounds(path)
+    conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (path, lo, hi))
+    conn.execute("DELETE FROM files WHERE dir = ? OR (dir >= ? AND dir < ?)", (path, lo, hi))
+    conn.execute("DELETE FROM pruned WHERE path = ? OR (path >= ? AND path < ?)", (path, lo, hi))
+
+
+def _mark_pruned(conn: sqlite3.Connection, paths: List[str], parent: str, stats: ScanStats):
+    """Forget pruned subdirectories but remember their names, so an unpruned refresh lists them."""
+    for p in paths:
+        _drop_subtree(conn, p)
+    conn.executemany("INSERT OR REPLACE INTO pruned VALUES (?, ?)", [(p, parent) for p in paths])
+    stats.pruned += len(paths)
+
+
+def _rescan_dir(conn: sqlite3.Connection, d: str, mtime_ns: int, parent: Optional[str],
+                stats: ScanStats, prune: Optional[Pruner] = None) -> List[str]:
+    """List one directory, replace its file rows, and return its (unpruned) subdirectories."""
+    subdirs: List[str] = []
+    skipped: List[str] = []
+    rows = []
+    try:
+        with os.scandir(d) as it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        (skipped if prune is not None and prune(e.path, e.name) else subdirs).append(e.path)
+                        continue
+                    stats.files += 1
+                    if not e.is_file():
+                        continue
+                    stats.stat_calls += 1
+                    st = e.stat()
+                except OSError:
+                    stats.errors += 1
+                    continue
+                rows.append((e.path, d, e.name, _ext(e.name), st.st_size, st.st_mtime))
+    except OSError:
+        stats.errors += 1
+        _drop_subtree(conn, d)
+        return []
+    stats.dirs += 1
+
+    conn.execute("DELETE FROM files WHERE dir = ?", (d,))
+    conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    known = {r[0] for r in conn.execute("SELECT path FROM dirs WHERE parent = ?", (d,))}
+    for gone in known.difference(subdirs):
+        _drop_subtree(conn, gone)
+    conn.execute("DELETE FROM pruned WHERE parent = ?", (d,))
+    _mark_pruned(conn, skipped, d, stats)
+
+    racy = time.time_ns() - mtime_ns < _RACY_WINDOW_NS
+    conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", (d, parent, -1 if racy else mtime_ns))
+    return subdirs
+
+
+def _refresh_tree(conn: sqlite3.Connection, root: str, parent: Optional[str], stats: ScanStats,
+                  prune: Optional[Pruner] = None):
+    stack: List[Tuple[str, Optional[str]]] = [(root, parent)]
+    while stack:
+        d, parent = stack.pop()
+        try:
+            st = os.stat(d)
+        except OSError:
+            _drop_subtree(conn, d)
+            continue
+        row = conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (d,)).fetchone()
+        if row is not None and row[0] == st.st_mtime_ns:
+            children = [r[0] for r in conn.execute("SELECT path FROM dirs WHERE parent = ?", (d,))]
+            skipped = [r[0] for r in conn.execute("SELECT path FROM pruned WHERE parent = ?", (d,))]
+            if prune is not None:
+                # children stored by an unpruned refresh (or a watcher) are dropped for this one
+                newly = [c for c in children if prune(c, os.path.basename(c))]
+                children = [c for c in children if c not in newly]
+                _mark_pruned(conn, newly, d, stats)
+                stats.pruned += len(skipped)
+            elif skipped:
+                # skipped by an earlier pruned refresh: list them now
+                conn.execute("DELETE FROM pruned WHERE parent = ?", (d,))
+                children += skipped
+        else:
+            children = _rescan_dir(conn, d, st.st_mtime_ns, parent, stats, prune)
+        stack.extend((c, d) for c in children)
+
+
+def refresh(conn: sqlite3.Connection, root: str, stats: Optional[ScanStats] = None, full: bool = False,
+            prune: Optional[Pruner] = None):
+    """
+    Bring the index for `root` up to date.
+
+    Only directories whose mtime changed are re-listed; unchanged directories cost one
+    stat() and their known children are taken from the index. In-place edits to a file
+    do not touch its directory's mtime, so they surface on the next change to that
+    directory (or with full=True). Subdirectories the pruner rejects are neither listed
+    nor kept in the index; only their names are, so a refresh without a pruner lists them.
+    """
+    stats = stats if stats is not None else ScanStats()
+    root = os.path.abspath(root)
+    with conn:
+        if full:
+            _drop_subtree(conn, root)
+        _refresh_tree(conn, root, None, stats, prune)
+        conn.execute("INSERT OR REPLACE INTO scopes VALUES (?, ?)", (root, time.time()))
+
+
+def rescan_subtree(conn: sqlite3.Connection, path: str, stats: Optional[ScanStats] = None):
+    """
+    Forget everything indexed under `path` and list it again (used after lost watch events).
+    Like upsert_file and remove_path this does not commit: the caller owns the transaction.
+    """
+    stats = stats if stats is not None else ScanStats()
+    path = os.path.abspath(path)
+    _drop_subtree(conn, path)
+    _refresh_tree(conn, path, os.path.dirname(path), stats)
+
+
+def upsert_file(conn: sqlite3.Connection, path: str, st: os.stat_result):
+    d, name = os.path.split(path)
+    conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                 (path, d, name, _ext(name), st.st_size, st.st_mtime))
+
+
+def remove_path(conn: sqlite3.Connection, path: str):
+    """Drop a file row, or a whole directory subtree."""
+    conn.execute("DELETE FROM files WHERE path = ?", (path,))
+    _drop_subtree(conn, path)
+
+
+def mark_watched(conn: sqlite3.Connection, root: str, pid: int):
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO watchers VALUES (?, ?, ?)", (os.path.abspath(root), pid, time.time()))
+
+
+def unmark_watched(conn: sqlite3.Connection, root: str):
+    with conn:
+        conn.execute("DELETE FROM watchers WHERE root = ?", (os.path.abspath(root),))
+
+
+def watched_roots(conn: sqlite3.Connection, max_age_s: float) -> List[str]:
+    """Roots kept live by a watcher whose heartbeat is recent enough to trust without refreshing."""
+    cutoff = time.time() - max_age_s
+    return [r[0] for r in conn.execute("SELECT root FROM watchers WHERE heartbeat >= ?", (cutoff,))]
+
+
+def _patterns_sql(conn: sqlite3.Connection, pats: List[str], ci: bool, args: list) -> str:
+    """
+    SQL matching any of pats (appending its parameters to args). Names are matched by the
+    walker's own compiled matcher, registered as an SQL function, so fnmatch classes
+    ([!x]) and Unicode case folding agree with a walk. Plain '*.ext' patterns use the ext
+    column where it is stored as the matcher compares it.
+    """
+    fn = f"agent_match_{int(ci)}"
+    match = compile_patterns(fold_patterns(pats, ci), case_insensitive=ci)
+    conn.create_function(fn, 1, lambda name: bool(match(name)), deterministic=True)
+    exts = [m.group(1) for m in map(_SIMPLE_EXT.match, pats) if m]
+    if len(exts) < len(pats) or (ci and not _CASE_FOLD):
+        return f"{fn}(name)"
+    args += [e.lower() for e in exts] if _CASE_FOLD else exts
+    # '.bashrc' has no ext, yet '*.bashrc' matches it
+    return f"ext IN ({', '.join('?' * len(exts))}) OR (ext = '' AND {fn}(name))"
+
+
+def query(
+    conn: sqlite3.Connection,
+    roots: Iterable[str],
+    patterns: Iterable[str] = ("*",),
+    newer_cutoff: Optional[float] = None,
+    older_cutoff: Optional[float] = None,
+    min_bytes: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    name_hint: Optional[str] = None,
+) -> List[Tuple[str, float, int]]:
+    """
+    Answer a find_recent filter set from the index. Returns (path, mtime, size) newest-first.
+    Patterns fold case per root, as the walker does (query.is_case_insensitive).
+    """
+    where: List[str] = []
+    args: list = []
+
+    groups: dict = {}
+    for r in roots:
+        r = os.path.abspath(r)
+        groups.setdefault(is_case_insensitive(r), []).append(r)
+    if not groups:
+        return []
+
+    pats = [p for p in patterns if p] or ["*"]
+    ors = []
+    for ci, group in groups.items():
+        scope_sql = []
+        for r in group:
+            lo, hi = _subtree_bounds(r)
+            scope_sql.append("(dir = ? OR (dir >= ? AND dir < ?))")
+            args += [r, lo, hi]
+        cond = "(" + " OR ".join(scope_sql) + ")"
+        if "*" not in pats:
+            cond += " AND (" + _patterns_sql(conn, pats, ci, args) + ")"
+        ors.append(cond)
+    where.append("(" + " OR ".join(f"({c})" for c in ors) + ")")
+
+    for sql, val in (("mtime >= ?", newer_cutoff), ("mtime <= ?", older_cutoff),
+                     ("size >= ?", min_bytes), ("size <= ?", max_bytes)):
+        if val is not None:
+            where.append(sql)
+            args.append(val)
+    if name_hint:
+        hint = name_hint.lower()  # folded in Python like the walker, not ASCII-only lower()
+        conn.create_function("agent_hint", 1, lambda name: hint in name.lower(), deterministic=True)
+        where.append("agent_hint(name)")
+
+    sql = f"SELECT path, mtime, size FROM files WHERE {' AND '.join(where)} ORDER BY mtime DESC"
+    return conn.execute(sql, args).fetchall()
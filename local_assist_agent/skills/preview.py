@@ -1,9 +1,12 @@
-import sys, subprocess, time, re
+import os, sys, subprocess, time, re, struct
 from pathlib import Path
 from collections import defaultdict
-from typing import Iterable, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Tuple, Optional
 
-from ..config import PREVIEW_MAX_WINDOWS, LOG_DIR
+from ..config import (
+    PREVIEW_MAX_WINDOWS, LOG_DIR, PREVIEW_MODE, PREVIEW_HEAD_BYTES, PREVIEW_TEXT_LINES, PREVIEW_WORKERS,
+)
 
 _INVALID = re.compile(r'[<>:"/\\|?*]')
 
@@ -48,7 +51,157 @@ def _make_shelf(paths: Iterable[Path], run_id: Optional[str]) -> Path:
             f.write(f"URL={uri}\n")
     return shelf
 
-def preview_paths(paths: Iterable[Path], mode: str = "perfile", run_id: Optional[str] = None) -> Tuple[int, int, Optional[Path]]:
+# ----- terminal preview -----
+# (magic bytes, offset, label); first match wins
+_MAGIC = [
+    (b"PK\x03\x04", 0, "zip archive"),
+    (b"PK\x05\x06", 0, "zip archive (empty)"),
+    (b"\x1f\x8b", 0, "gzip"),
+    (b"7z\xbc\xaf\x27\x1c", 0, "7z archive"),
+    (b"Rar!\x1a\x07", 0, "rar archive"),
+    (b"ustar", 257, "tar archive"),
+    (b"%PDF-", 0, "PDF document"),
+    (b"\x89PNG\r\n\x1a\n", 0, "PNG image"),
+    (b"\xff\xd8\xff", 0, "JPEG image"),
+    (b"GIF8", 0, "GIF image"),
+    (b"\x7fELF", 0, "ELF executable"),
+    (b"MZ", 0, "Windows executable"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", 0, "OLE compound (msi/doc/xls)"),
+]
+_ZIP_EOCD = b"PK\x05\x06"
+_ZIP_TAIL_MAX = 22 + 0xFFFF  # end-of-central-directory record + longest comment
+
+
+def _pread(fd: int, n: int, offset: int) -> bytes:
+    if hasattr(os, "pread"):
+        return os.pread(fd, n, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, n)
+
+
+def _zip_members(fd: int, size: int) -> Optional[int]:
+    """Entry count from the zip end-of-central-directory record (reads only the tail)."""
+    n = min(size, _ZIP_TAIL_MAX)
+    tail = _pread(fd, n, size - n)
+    i = tail.rfind(_ZIP_EOCD)
+    if i < 0 or i + 22 > len(tail):
+        return None
+    return struct.unpack_from("<H", tail, i + 10)[0]
+
+
+def inspect(path, cap: int = PREVIEW_HEAD_BYTES, lines: int = PREVIEW_TEXT_LINES) -> dict:
+    """
+    Type, size and a short look inside one file, reading at most `cap` bytes of it
+    (plus the zip directory tail for archives).
+    """
+    path = os.fspath(path)
+    info = {"path": path, "kind": "?", "size": None, "text": None, "hex": None, "members": None, "error": None}
+    if os.path.isdir(path):
+        return _inspect_dir(info, lines)
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError as e:
+        info["error"] = e.strerror or str(e)
+        return info
+    try:
+        size = os.fstat(fd).st_size
+        info["size"] = size
+        head = _pread(fd, cap, 0)
+        for magic, off, label in _MAGIC:
+            if head[off:off + len(magic)] == magic:
+                info["kind"] = label
+                if label.startswith("zip"):
+                    info["members"] = _zip_members(fd, size)
+                break
+        else:
+            if not head:
+                info["kind"] = "empty"
+            elif b"\x00" not in head:
+                text = head.decode("utf-8", "replace")
+                if text.count("\ufffd") <= len(text) // 100 + 1:
+                    info["kind"] = "text"
+                    info["text"] = text.splitlines()[:lines]
+            if info["kind"] == "?":
+                info["kind"] = "binary"
+        if info["text"] is None:
+            info["hex"] = head[:16].hex(" ")
+    except OSError as e:
+        info["error"] = e.strerror or str(e)
+    finally:
+        os.close(fd)
+    return info
+
+
+def _inspect_dir(info: dict, lines: int) -> dict:
+    """A folder (e.g. picked from the du view) is summarized, not read: its entry count and first names."""
+    try:
+        with os.scandir(info["path"]) as it:
+            names = [e.name + (os.sep if e.is_dir(follow_symlinks=False) else "") for e in it]
+    except OSError as e:
+        info["error"] = e.strerror or str(e)
+        return info
+    info["kind"] = "folder"
+    info["text"] = [f"{len(names)} item(s)"] + sorted(names)[:max(0, lines - 1)]
+    return info
+
+
+def inspect_many(paths: Iterable, workers: int = PREVIEW_WORKERS, cap: int = PREVIEW_HEAD_BYTES) -> List[dict]:
+    """inspect() for many files (or folders) on a small thread pool; results in input order."""
+    paths = list(paths)
+    if len(paths) <= 1 or workers <= 1:
+        return [inspect(p, cap) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(lambda p: inspect(p, cap), paths))
+
+
+def _fmt_bytes(n) -> str:
+    if n is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def render_terminal(infos: List[dict], console=None):
+    """Print previews inline as one rich table."""
+    from rich.console import Console
+    from rich.table import Table
+    from rich.text import Text
+
+    console = console or Console()
+    t = Table(title=f"Preview ({len(infos)} file(s))", show_lines=True)
+    t.add_column("#")
+    t.add_column("File")
+    t.add_column("Type")
+    t.add_column("Size", justify="right")
+    t.add_column("Contents")
+    for i, info in enumerate(infos, 1):
+        if info["error"]:
+            body = Text(info["error"], style="red")
+        elif info["members"] is not None:
+            body = Text(f"{info['members']} member(s)")
+        elif info["text"] is not None:
+            body = Text("\n".join(info["text"]))
+        else:
+            body = Text(info["hex"] or "", style="dim")
+        t.add_row(str(i), os.path.basename(info["path"]), info["kind"], _fmt_bytes(info["size"]), body)
+    console.print(t)
+
+
+def resolve_mode(mode: Optional[str]) -> str:
+    """'auto' -> 'terminal' where no GUI is available (headless Linux), else 'perfile'."""
+    mode = mode or PREVIEW_MODE
+    if mode != "auto":
+        return mode
+    if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        return "terminal"
+    return "perfile"
+
+
+def preview_paths(paths: Iterable[Path], mode: str = "perfile", run_id: Optional[str] = None,
+                  console=None) -> Tuple[int, int, Optional[Path]]:
     """
     Open OS file browser to reveal selected files.
 
@@ -56,9 +209,13 @@ def preview_paths(paths: Iterable[Path], mode: str = "perfile", run_id: Optional
       - 'perfile' : highlight each file (Windows/macOS), parent on Linux (may be many windows)
       - 'grouped' : open one window per parent directory
       - 'shelf'   : create a temporary folder with .url shortcuts; open it once (single window)
+      - 'terminal': no windows; type, first lines / hex header and archive member count
+                    printed inline (works headless)
+      - 'auto'    : 'terminal' without a GUI, else 'perfile'
 
     Returns (opened_count, skipped_count, shelf_path_or_None).
     """
+    mode = resolve_mode(mode)
     ps = [Path(p).resolve() for p in paths if Path(p).exists()]
     if not ps:
         return 0, 0, None
@@ -66,6 +223,10 @@ def preview_paths(paths: Iterable[Path], mode: str = "perfile", run_id: Optional
     opened = 0
     skipped = 0
 
+    if mode == "terminal":
+        render_terminal(inspect_many(ps), console)
+        return len(ps), 0, None
+
     if mode == "shelf":
         shelf = _make_shelf(ps, run_id)
         _open_folder(shelf)
@@ -0,0 +1,97 @@
+import os
+import re
+import fnmatch
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from ..config import PRUNE_PATTERNS, PRUNE_IGNORE_FILE
+
+# (negated, anchored, compiled regex) - consecutive rules of one kind share a regex
+Rule = Tuple[bool, bool, "re.Pattern"]
+
+
+def _parse(lines: Iterable[str]) -> List[Tuple[bool, bool, str]]:
+    out = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        neg = line.startswith("!")
+        if neg:
+            line = line[1:]
+        line = line.rstrip("/")
+        anchored = "/" in line
+        if line:
+            out.append((neg, anchored, line.lstrip("/")))
+    return out
+
+
+def compile_rules(lines: Iterable[str], case_insensitive: Optional[bool] = None) -> List[Rule]:
+    """gitignore-style lines -> rules; a later matching rule overrides an earlier one."""
+    if case_insensitive is None:
+        case_insensitive = os.name == "nt"
+    flags = re.IGNORECASE if case_insensitive else 0
+    rules: List[Rule] = []
+    group: List[str] = []
+    kind = None
+    for neg, anchored, pat in _parse(lines) + [(None, None, None)]:
+        if (neg, anchored) != kind and group:
+            rx = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in group), flags)
+            rules.append((kind[0], kind[1], rx))
+            group = []
+        kind = (neg, anchored)
+        if pat is not None:
+            group.append(pat)
+    return rules
+
+
+def _pruned(rules: Sequence[Rule], name: str, rel: str) -> bool:
+    for neg, anchored, rx in reversed(rules):
+        if rx.match(rel if anchored else name):
+            return not neg
+    return False
+
+
+def read_ignore_file(root: str, filename: str = PRUNE_IGNORE_FILE) -> List[str]:
+    try:
+        with open(os.path.join(root, filename), encoding="utf-8") as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
+
+
+class Pruner:
+    """
+    Decides, per subdirectory, whether a walk should skip it: the config patterns plus
+    each scope root's own ignore file. Scope roots themselves are never pruned.
+    """
+
+    def __init__(self, roots: Iterable[str], patterns: Sequence[str] = None, ignore_file: str = PRUNE_IGNORE_FILE):
+        patterns = list(PRUNE_PATTERNS if patterns is None else patterns)
+        base = compile_rules(patterns)
+        self.scopes: List[Tuple[str, List[Rule]]] = []
+        for r in roots:
+            extra = read_ignore_file(r, ignore_file) if ignore_file else []
+            self.scopes.append((r.rstrip(os.sep) + os.sep, compile_rules(patterns + extra) if extra else base))
+        # longest prefix first, so a nested scope's own rules win
+        self.scopes.sort(key=lambda t: -len(t[0]))
+        self.base = base
+
+    def __bool__(self):
+        return any(rules for _, rules in self.scopes)
+
+    def __call__(self, path: str, name: str) -> bool:
+        for prefix, rules in self.scopes:
+            if path.startswith(prefix):
+                rel = path[len(prefix):]
+                if os.sep != "/":
+                    rel = rel.replace(os.sep, "/")
+                return _pruned(rules, name, rel)
+        return _pruned(self.base, name, name)
+
+
+def load_pruner(roots: Iterable[str], enabled: bool = True) -> Optional[Pruner]:
+    """A Pruner for these (normalized) roots, or None when pruning is off or has no rules."""
+    if not enabled:
+        return None
+    p = Pruner(roots)
+    return p if p else None
@@ -0,0 +1,107 @@
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .scan import Found, Matcher, compile_patterns
+
+_CASE_CACHE: Dict[int, bool] = {}
+
+
+def normalize_scopes(roots: Iterable[str]) -> List[str]:
+    """
+    Resolve roots (~, symlinks) and reduce them to a minimal non-overlapping set:
+    ['~/Documents', '~/Documents/work'] -> ['/home/me/Documents'].
+    """
+    resolved = []
+    for r in roots:
+        p = os.path.realpath(os.path.expanduser(r))
+        if os.path.isdir(p):
+            resolved.append(p)
+    out: List[str] = []
+    # shortest first, so a parent is always kept before any of its children is considered
+    for p in sorted(set(resolved), key=lambda x: (len(x), x)):
+        key = os.path.normcase(p)
+        if not any(key == os.path.normcase(k) or key.startswith(os.path.normcase(k).rstrip(os.sep) + os.sep)
+                   for k in out):
+            out.append(p)
+    # keep the caller's order for the survivors
+    return [p for p in dict.fromkeys(os.path.realpath(os.path.expanduser(r)) for r in roots) if p in out]
+
+
+def fold_patterns(patterns: Iterable[str], case_insensitive: bool = False) -> List[str]:
+    """Drop duplicate and subsumed globs ('*' absorbs everything)."""
+    pats = [p for p in patterns if p] or ["*"]
+    if "*" in pats:
+        return ["*"]
+    seen = set()
+    out = []
+    for p in pats:
+        k = p.lower() if case_insensitive else p
+        if k not in seen:
+            seen.add(k)
+            out.append(p)
+    return out
+
+
+def is_case_insensitive(path: str) -> bool:
+    """Probe whether the filesystem holding `path` folds case (cached per st_dev)."""
+    try:
+        dev = os.stat(path).st_dev
+    except OSError:
+        return os.name == "nt" or sys.platform == "darwin"
+    if dev in _CASE_CACHE:
+        return _CASE_CACHE[dev]
+    result = os.name == "nt" or sys.platform == "darwin"
+    p = path
+    while True:
+        parent, name = os.path.split(p)
+        if name and name.swapcase() != name:
+            try:
+                result = os.path.samestat(os.stat(p), os.stat(os.path.join(parent, name.swapcase())))
+            except OSError:
+                result = False
+            break
+        if not name or parent == p:
+            break
+        p = parent
+    _CASE_CACHE[dev] = result
+    return result
+
+
+class CompiledQuery:
+    """
+    A search compiled once per run: a minimal scope set, one precompiled matcher
+    per filesystem case behaviour, and hit de-duplication by (st_dev, st_ino).
+    """
+
+    def __init__(self, roots: Iterable[str], patterns: Iterable[str], name_hint: Optional[str] = None):
+        self.roots = normalize_scopes(roots)
+        self.patterns = list(patterns) or ["*"]
+        self.name_hint = name_hint.lower() if name_hint else None
+        self._matchers: Dict[bool, Matcher] = {}
+
+    def matcher(self, root: str) -> Matcher:
+        ci = is_case_insensitive(root)
+        m = self._matchers.get(ci)
+        if m is None:
+            m = compile_patterns(fold_patterns(self.patterns, ci), case_insensitive=ci)
+            if self.name_hint:
+                hint, by_pattern = self.name_hint, m
+                m = lambda name: by_pattern(name) and hint in name.lower()
+            self._matchers[ci] = m
+        return m
+
+    def targets(self) -> List[Tuple[str, Matcher]]:
+        return [(r, self.matcher(r)) for r in self.roots]
+
+
+def dedupe(found: Iterable[Found]) -> Iterator[Found]:
+    """Drop repeats of the same file (hard links, overlapping roots) by (st_dev, st_ino)."""
+    seen = set()
+    for path, st in found:
+        # Windows DirEntry.stat() leaves st_ino at 0; fall back to the path there
+        key = (st.st_dev, st.st_ino) if st.st_ino else os.path.normcase(path)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield path, st
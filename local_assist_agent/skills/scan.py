@@ -0,0 +1,272 @@
+import os
+import re
+import time
+import queue
+import fnmatch
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass, fields
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+Matcher = Callable[[str], object]
+Pruner = Callable[[str, str], bool]  # (dir path, dir name) -> skip this subtree
+Found = Tuple[str, os.stat_result]
+
+
+@dataclass
+class ScanStats:
+    """Counters for one traversal (directories opened, files seen, stat calls, subtrees pruned)."""
+    dirs: int = 0
+    files: int = 0
+    stat_calls: int = 0
+    errors: int = 0
+    pruned: int = 0
+
+    def merge(self, other: "ScanStats"):
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+class Budget:
+    """
+    When a walk should stop early: an optional deadline plus a cancel flag (Ctrl-C, caller).
+    A walk that stops leaves its unvisited directories in `pending` (the frontier to resume
+    from) and matches it found but never handed out in `leftover`, and sets `truncated`.
+    With checkpoint=False the search never reads, writes or clears a checkpoint.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, resume: bool = False, checkpoint: bool = True):
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        self.resume = resume
+        self.checkpoint = checkpoint or resume
+        self.cancelled = threading.Event()
+        self.pending: List[str] = []
+        self.leftover: List[Found] = []
+        self.truncated = False
+        self.key: Optional[str] = None  # checkpoint key, set by the search using this budget
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def expired(self) -> bool:
+        return self.cancelled.is_set() or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+    def leave(self, dirs: Iterable[str], found: Iterable[Found] = ()):
+        with self._lock:
+            n = len(self.pending) + len(self.leftover)
+            self.pending.extend(dirs)
+            self.leftover.extend(found)
+            if len(self.pending) + len(self.leftover) > n:
+                self.truncated = True
+
+
+def compile_patterns(patterns: Iterable[str], case_insensitive: Optional[bool] = None) -> Matcher:
+    """
+    Fold glob patterns into a single precompiled regex.
+    Returns a callable name -> truthy/falsy (same semantics as Path.rglob per pattern).
+    """
+    pats = [p for p in patterns if p] or ["*"]
+    if "*" in pats:
+        return lambda name: True
+    if case_insensitive is None:
+        case_insensitive = os.name == "nt"
+    flags = re.IGNORECASE if case_insensitive else 0
+    rx = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in pats), flags)
+    return rx.match
+
+
+def _scan_dir(d: str, match: Matcher, stats: ScanStats,
+              prune: Optional[Pruner] = None) -> Tuple[List[str], List[Found]]:
+    """
+    List one directory: return (subdirectories, matching files with their stat).
+
+    - directory/file type comes from the cached DirEntry (no extra syscall on most platforms)
+    - names are matched before stat() so non-matching files cost nothing
+    - symlinked directories are not descended into (like Path.rglob)
+    - subdirectories the pruner rejects are dropped here, before anyone lists them
+    """
+    subdirs: List[str] = []
+    found: List[Found] = []
+    try:
+        it = os.scandir(d)
+    except OSError:
+        stats.errors += 1
+        return subdirs, found
+    stats.dirs += 1
+    with it:
+        for e in it:
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    if prune is not None and prune(e.path, e.name):
+                        stats.pruned += 1
+                    else:
+                        subdirs.append(e.path)
+                    continue
+                stats.files += 1
+                if not match(e.name) or not e.is_file():
+                    continue
+                stats.stat_calls += 1
+                found.append((e.path, e.stat()))
+            except OSError:
+                stats.errors += 1
+    return subdirs, found
+
+
+def walk(root: str, match: Matcher, stats: Optional[ScanStats] = None,
+         prune: Optional[Pruner] = None, budget: Optional[Budget] = None) -> Iterator[Found]:
+    """
+    Walk `root` once with os.scandir and yield (path, stat) for matching files.
+    With a budget, stop between directories once it expires; whatever is still on the
+    stack (including a directory interrupted half-way) is left in budget.pending.
+    """
+    stats = stats if stats is not None else ScanStats()
+    stack = [root]
+    try:
+        while stack:
+            if budget is not None and budget.expired():
+                break
+            # a directory leaves the stack only once all its matches have been handed out
+            subdirs, found = _scan_dir(stack[-1], match, stats, prune)
+            yield from found
+            stack.pop()
+            stack.extend(subdirs)
+    finally:
+        if budget is not None and stack:
+            budget.leave(stack)
+
+
+class _DeviceWalk:
+    """
+    Work-stealing traversal of the roots living on one device.
+
+    Each worker owns a deque: it pushes the subdirectories it discovers and pops
+    from the same end (depth-first, cache-friendly); an idle worker steals from the
+    opposite end of a sibling's deque, which tends to hand over large subtrees.
+    """
+
+    def __init__(self, roots: List[str], match: Matcher, workers: int, out: "queue.Queue", stop: threading.Event,
+                 prune: Optional[Pruner] = None, budget: Optional[Budget] = None):
+        # st_dev identifies the filesystem, so one matcher (case behaviour) serves the group
+        self.match = match
+        self.prune = prune
+        self.budget = budget
+        self.out = out
+        self.stop = stop
+        self.queues = [deque() for _ in range(workers)]
+        for i, r in enumerate(roots):
+            self.queues[i % workers].append(r)
+        self.pending = len(roots)  # directories queued or being listed
+        self.cv = threading.Condition()
+        self.stats = ScanStats()
+        self.threads = [threading.Thread(target=self._run, args=(i,), daemon=True) for i in range(workers)]
+
+    def _take(self, i: int) -> Optional[str]:
+        try:
+            return self.queues[i].pop()
+        except IndexError:
+            pass
+        n = len(self.queues)
+        for j in range(1, n):
+            try:
+                return self.queues[(i + j) % n].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _run(self, i: int):
+        local = ScanStats()
+        try:
+            while not self.stop.is_set():
+                if self.budget is not None and self.budget.expired():
+                    break
+                d = self._take(i)
+                if d is None:
+                    with self.cv:
+                        while self.pending and not any(self.queues) and not self.stop.is_set():
+                            self.cv.wait()
+                        if not self.pending:
+                            break
+                    continue
+                subdirs, found = _scan_dir(d, self.match, local, self.prune)
+                if found:
+                    self.out.put(found)
+                with self.cv:
+                    # count children before releasing the parent so pending never dips to 0 early
+                    self.pending += len(subdirs) - 1
+                    self.queues[i].extend(subdirs)
+                    if subdirs or not self.pending:
+                        self.cv.notify_all()
+        finally:
+            with self.cv:
+                self.stats.merge(local)
+                self.cv.notify_all()
+            self.out.put(None)  # one end-of-stream marker per worker
+
+    def start(self):
+        for t in self.threads:
+            t.start()
+
+    def shutdown(self):
+        with self.cv:
+            self.cv.notify_all()
+
+
+def device_groups(targets: Iterable[Tuple[str, Matcher]]) -> List[Tuple[List[str], Matcher]]:
+    """Group existing (root, matcher) targets by st_dev (one group per physical/network device)."""
+    groups: dict = defaultdict(list)
+    matchers: dict = {}
+    for r, m in targets:
+        try:
+            dev = os.stat(r).st_dev
+        except OSError:
+            continue
+        groups[dev].append(r)
+        matchers.setdefault(dev, m)
+    return [(g, matchers[dev]) for dev, g in groups.items()]
+
+
+def walk_parallel(targets: Iterable[Tuple[str, Matcher]], workers: int,
+                  stats: Optional[ScanStats] = None, prune: Optional[Pruner] = None,
+                  budget: Optional[Budget] = None) -> Iterator[Found]:
+    """
+    Like walk() over several (root, matcher) targets, with `workers` threads per device.
+    A slow mount only ties up its own workers; results are yielded as they arrive.
+    With a budget, workers stop between directories once it expires; the queued
+    directories and any undelivered matches end up in the budget.
+    """
+    out: "queue.Queue" = queue.Queue()
+    stop = threading.Event()
+    walks = [_DeviceWalk(g, m, max(1, workers), out, stop, prune, budget) for g, m in device_groups(targets)]
+    for w in walks:
+        w.start()
+    threads = [t for w in walks for t in w.threads]
+    rest = iter(())  # the batch being handed out; what is left of it if we are closed mid-way
+    try:
+        done = 0
+        while done < len(threads):
+            batch = out.get()
+            if batch is None:
+                done += 1
+                continue
+            rest = iter(batch)
+            yield from rest
+    finally:
+        stop.set()
+        for w in walks:
+            w.shutdown()
+        for t in threads:
+            t.join()
+        if budget is not None:
+            undelivered = list(rest)
+            while True:
+                try:
+                    batch = out.get_nowait()
+                except queue.Empty:
+                    break
+                if batch:
+                    undelivered.extend(batch)
+            budget.leave((d for w in walks for dq in w.queues for d in dq), undelivered)
+        if stats is not None:
+            for w in walks:
+                stats.merge(w.stats)
@@ -0,0 +1,170 @@
+import os
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..schemas import FileHit
+from .scan import Found
+
+# Age buckets for the space report, in days (upper bounds); the last bucket is open-ended
+AGE_EDGES_DAYS = (1, 7, 30, 90, 365)
+AGE_LABELS = ("< 1 day", "1-7 days", "7-30 days", "30-90 days", "90 days-1 year", "> 1 year")
+
+
+def _ext_of(name: str) -> str:
+    return os.path.splitext(name)[1].lower() or "(none)"
+
+
+class HitStore:
+    """
+    Column-oriented search results: NumPy arrays for size / mtime / extension id,
+    an interned parent-directory table and one byte blob of leaf names.
+    Predicates and aggregates run over whole columns; selections are integer index
+    arrays into the store, and FileHit records are only materialized on access.
+
+    Fill with append()/add(), then seal() once before querying.
+    """
+
+    def __init__(self):
+        self.dirs: List[str] = []
+        self._dir_index: Dict[str, int] = {}
+        self.ext_table: List[str] = []
+        self._ext_index: Dict[str, int] = {}
+        self._names = bytearray()
+        self._name_end = array("q")
+        self._dir_ids = array("i")
+        self._ext_id_buf = array("i")
+        self._size_buf = array("q")
+        self._mtime_buf = array("d")
+        self.sizes = self.mtimes = self.ext_ids = self.dir_ids = self.name_end = None
+
+    def __len__(self):
+        return len(self._name_end) if self.name_end is None else len(self.name_end)
+
+    def append(self, path: str, size: int, mtime: float):
+        parent, name = os.path.split(path)
+        d = self._dir_index.get(parent)
+        if d is None:
+            d = self._dir_index[parent] = len(self.dirs)
+            self.dirs.append(parent)
+        e = _ext_of(name)
+        x = self._ext_index.get(e)
+        if x is None:
+            x = self._ext_index[e] = len(self.ext_table)
+            self.ext_table.append(e)
+        self._names += os.fsencode(name)
+        self._name_end.append(len(self._names))
+        self._dir_ids.append(d)
+        self._ext_id_buf.append(x)
+        self._size_buf.append(size or 0)
+        self._mtime_buf.append(mtime)
+
+    def add(self, hit: FileHit):
+        self.append(hit.fspath, hit.size, hit.mtime)
+
+    def seal(self) -> "HitStore":
+        """Freeze the append buffers into NumPy columns (one at a time, to keep the peak low)."""
+        for col, buf, dtype in (("sizes", "_size_buf", np.int64), ("mtimes", "_mtime_buf", np.float64),
+                                ("ext_ids", "_ext_id_buf", np.int32), ("dir_ids", "_dir_ids", np.int32),
+                                ("name_end", "_name_end", np.int64)):
+            setattr(self, col, np.array(getattr(self, buf), dtype=dtype))
+            delattr(self, buf)
+        self._dir_index = self._ext_index = None
+        return self
+
+    @classmethod
+    def from_found(cls, found: Iterable[Found]) -> "HitStore":
+        store = cls()
+        for p, st in found:
+            store.append(p, st.st_size, st.st_mtime)
+        return store.seal()
+
+    @classmethod
+    def from_hits(cls, hits: Iterable[FileHit]) -> "HitStore":
+        store = cls()
+        for h in hits:
+            store.add(h)
+        return store.seal()
+
+    def name_of(self, i: int) -> str:
+        i = int(i)
+        start = int(self.name_end[i - 1]) if i else 0
+        return os.fsdecode(bytes(self._names[start:int(self.name_end[i])]))
+
+    def path_of(self, i: int) -> str:
+        return os.path.join(self.dirs[self.dir_ids[int(i)]], self.name_of(i))
+
+    def __getitem__(self, i: int) -> FileHit:
+        i = int(i)
+        return FileHit(parent=self.dirs[self.dir_ids[i]], name=self.name_of(i),
+                       mtime=float(self.mtimes[i]), size=int(self.sizes[i]))
+
+    def all(self) -> np.ndarray:
+        return np.arange(len(self))
+
+    def filter(
+        self,
+        idx: Optional[np.ndarray] = None,
+        newer_cutoff: Optional[float] = None,
+        older_cutoff: Optional[float] = None,
+        min_bytes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        exts: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """Apply age/size/type predicates to whole columns; returns the surviving indices."""
+        idx = self.all() if idx is None else np.asarray(idx)
+        mask = np.ones(len(idx), dtype=bool)
+        m, s = self.mtimes[idx], self.sizes[idx]
+        if newer_cutoff is not None:
+            mask &= m >= newer_cutoff
+        if older_cutoff is not None:
+            mask &= m <= older_cutoff
+        if min_bytes is not None:
+            mask &= s >= min_bytes
+        if max_bytes is not None:
+            mask &= s <= max_bytes
+        if exts:
+            wanted = {e.lower() if e.startswith(".") else "." + e.lower() for e in exts}
+            ids = [i for i, e in enumerate(self.ext_table) if e in wanted]
+            mask &= np.isin(self.ext_ids[idx], ids)
+        return idx[mask]
+
+    def newest_first(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        idx = self.all() if idx is None else np.asarray(idx)
+        return idx[np.argsort(-self.mtimes[idx], kind="stable")]
+
+    def to_hits(self, idx: Optional[np.ndarray] = None) -> List[FileHit]:
+        idx = self.all() if idx is None else idx
+        return [self[i] for i in idx]
+
+    def by_extension(self, idx: Optional[np.ndarray] = None) -> List[Tuple[str, int, int]]:
+        """[(ext, count, bytes)] largest first."""
+        idx = self.all() if idx is None else np.asarray(idx)
+        n = len(self.ext_table)
+        ids = self.ext_ids[idx]
+        counts = np.bincount(ids, minlength=n)
+        total = np.bincount(ids, weights=self.sizes[idx], minlength=n)
+        order = np.argsort(-total, kind="stable")
+        return [(self.ext_table[i], int(counts[i]), int(total[i])) for i in order if counts[i]]
+
+    def by_age(self, idx: Optional[np.ndarray] = None, now: Optional[float] = None) -> List[Tuple[str, int, int]]:
+        """[(bucket label, count, bytes)] youngest bucket first."""
+        idx = self.all() if idx is None else np.asarray(idx)
+        now = time.time() if now is None else now
+        age_days = (now - self.mtimes[idx]) / 86400.0
+        bucket = np.digitize(age_days, AGE_EDGES_DAYS)
+        n = len(AGE_LABELS)
+        counts = np.bincount(bucket, minlength=n)
+        total = np.bincount(bucket, weights=self.sizes[idx], minlength=n)
+        return [(AGE_LABELS[i], int(counts[i]), int(total[i])) for i in range(n)]
+
+    def usage_report(self, idx: Optional[np.ndarray] = None) -> dict:
+        idx = self.all() if idx is None else np.asarray(idx)
+        return {
+            "count": int(len(idx)),
+            "bytes": int(self.sizes[idx].sum()),
+            "by_ext": self.by_extension(idx),
+            "by_age": self.by_age(idx),
+        }
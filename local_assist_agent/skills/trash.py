@@ -0,0 +1,220 @@
+import os
+import sys
+import stat
+import contextvars
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+# Freedesktop.org Trash specification (Linux/BSD desktops). Windows and macOS keep using send2trash.
+SUPPORTED = os.name == "posix" and sys.platform != "darwin"
+
+Outcome = Dict[str, object]
+
+
+def _home_trash() -> str:
+    data = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(data, "Trash")
+
+
+def _existing_dev(path: str) -> int:
+    """st_dev of `path`, or of its nearest existing ancestor."""
+    while True:
+        try:
+            return os.stat(path).st_dev
+        except FileNotFoundError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                raise
+            path = parent
+
+
+def _mount_point(path: str) -> str:
+    p = os.path.realpath(path)
+    dev = os.lstat(p).st_dev
+    while True:
+        parent = os.path.dirname(p)
+        if parent == p or os.lstat(parent).st_dev != dev:
+            return p
+        p = parent
+
+
+def _ensure_trash(trash: str, private: bool = False) -> str:
+    """
+    Create trash/files and trash/info. A private (per-user, top-directory) trash must be
+    a real directory owned by us, never a symlink, or the group falls back.
+    """
+    if private:
+        try:
+            os.mkdir(trash, 0o700)
+        except FileExistsError:
+            pass
+        st = os.lstat(trash)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+            raise PermissionError(f"{trash} is not a directory owned by this user")
+    for sub in ("files", "info"):
+        os.makedirs(os.path.join(trash, sub), mode=0o700, exist_ok=True)
+    return trash
+
+
+def _trash_for(dev: int, sample: str, home_dev: int) -> Tuple[str, Optional[str]]:
+    """
+    (trash_dir, topdir) for a device. topdir is None for the home trash (absolute
+    Path= in .trashinfo), else the mount point (Path= relative to it).
+    """
+    if dev == home_dev:
+        return _ensure_trash(_home_trash()), None
+    top = _mount_point(os.path.dirname(sample))
+    uid = os.getuid()
+    shared = os.path.join(top, ".Trash")
+    try:
+        st = os.lstat(shared)
+        if stat.S_ISDIR(st.st_mode) and st.st_mode & stat.S_ISVTX:
+            return _ensure_trash(os.path.join(shared, str(uid)), private=True), top
+    except OSError:
+        pass
+    return _ensure_trash(os.path.join(top, f".Trash-{uid}"), private=True), top
+
+
+def _reserve(info_dir: str, files_dir: str, name: str) -> Tuple[str, int]:
+    """
+    Atomically claim a unique <name>.trashinfo (O_EXCL) whose files/<name> is free too
+    (an orphan left there by another tool must not be overwritten); returns (trashed_name, fd).
+    """
+    stem, ext = os.path.splitext(name)
+    n = 1
+    candidate = name
+    while True:
+        try:
+            fd = os.open(os.path.join(info_dir, candidate + ".trashinfo"),
+                         os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            fd = None
+        if fd is not None:
+            if not os.path.lexists(os.path.join(files_dir, candidate)):
+                return candidate, fd
+            os.close(fd)
+            os.unlink(os.path.join(info_dir, candidate + ".trashinfo"))
+        n += 1
+        candidate = f"{stem}.{n}{ext}"
+
+
+def _trash_group(paths: List[str], trash: str, top: Optional[str]) -> List[Outcome]:
+    """
+    Trash every path of one device into `trash` with same-filesystem renames.
+    Phase 1 writes all .trashinfo records, phase 2 renames; the info directory is
+    fsynced once for the whole batch instead of once per file.
+    """
+    files_dir = os.path.join(trash, "files")
+    info_dir = os.path.join(trash, "info")
+    when = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    staged: List[Tuple[str, str]] = []
+    outcomes: Dict[str, Outcome] = {}
+
+    for p in paths:
+        name = fd = None
+        try:
+            name, fd = _reserve(info_dir, files_dir, os.path.basename(p.rstrip(os.sep)))
+            rel = p if top is None else os.path.relpath(p, top)
+            # Path= is percent-encoded raw bytes, so names that are not valid UTF-8 survive
+            body = (f"[Trash Info]\nPath={quote(os.fsencode(rel))}\nDeletionDate={when}\n").encode("ascii")
+            f = os.fdopen(fd, "wb")
+            fd = None  # owned by f from here on
+            with f:
+                f.write(body)
+            staged.append((p, name))
+        except Exception as e:
+            if fd is not None:
+                os.close(fd)
+            if name is not None:  # don't leave an empty or partial record behind
+                try:
+                    os.unlink(os.path.join(info_dir, name + ".trashinfo"))
+                except OSError:
+                    pass
+            outcomes[p] = {"path": p, "ok": False, "error": str(e)}
+
+    for p, name in staged:
+        try:
+            os.rename(p, os.path.join(files_dir, name))  # never copies: same device by construction
+            outcomes[p] = {"path": p, "ok": True, "error": None}
+        except OSError as e:
+            try:
+                os.unlink(os.path.join(info_dir, name + ".trashinfo"))
+            except OSError:
+                pass
+            outcomes[p] = {"path": p, "ok": False, "error": str(e)}
+
+    try:
+        dfd = os.open(info_dir, os.O_RDONLY)
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+    except OSError:
+        pass
+    return [outcomes[p] for p in paths]
+
+
+def bulk_trash(paths: Iterable[Path], fallback: Callable[[str], None]) -> Tuple[int, List[str], List[Outcome]]:
+    """
+    Trash many paths at once. Paths are grouped by device, each group goes to the
+    trash on its own filesystem (home trash or <mount>/.Trash-$UID), and groups run
+    concurrently. `fallback(path)` (send2trash) handles a group whose trash cannot be set up.
+    Returns ok_count, list_of_error_strings, detailed_outcomes[{path, ok, error}] in input order.
+    """
+    order = [os.path.abspath(os.fspath(p)) for p in paths]
+    results: Dict[str, Outcome] = {}
+    groups: Dict[int, List[str]] = defaultdict(list)
+    for p in dict.fromkeys(order):  # each path is trashed once, however often it is listed
+        try:
+            groups[os.lstat(p).st_dev].append(p)
+        except OSError as e:
+            results[p] = {"path": p, "ok": False, "error": str(e)}
+
+    home_dev = _existing_dev(_home_trash())
+
+    def run(dev: int, group: List[str]) -> List[Outcome]:
+        try:
+            trash, top = _trash_for(dev, group[0], home_dev)
+        except OSError:
+            out = []
+            for p in group:
+                try:
+                    fallback(p)
+                    out.append({"path": p, "ok": True, "error": None})
+                except Exception as e:
+                    out.append({"path": p, "ok": False, "error": str(e)})
+            return out
+        return _trash_group(group, trash, top)
+
+    def traced(dev: int, group: List[str]) -> List[Outcome]:
+        from .. import tracing
+        with tracing.span("trash.device", dev=dev, count=len(group)):
+            return run(dev, group)
+
+    if groups:
+        ctx = contextvars.copy_context()  # device spans nest under the caller's span
+        with ThreadPoolExecutor(max_workers=min(8, len(groups))) as pool:
+            for outs in pool.map(lambda kv: ctx.copy().run(traced, *kv), groups.items()):
+                for o in outs:
+                    results[o["path"]] = o
+
+    ok = 0
+    errs: List[str] = []
+    outcomes: List[Outcome] = []
+    seen = set()
+    for p in order:
+        if p in seen:
+            o = {"path": p, "ok": False, "error": "duplicate of an earlier path"}
+        else:
+            seen.add(p)
+            o = results[p]
+        outcomes.append(o)
+        if o["ok"]:
+            ok += 1
+        else:
+            errs.append(f"{p}: {o['error']}")
+    return ok, errs, outcomes
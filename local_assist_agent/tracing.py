@@ -0,0 +1,168 @@
+# Lightweight nested timing spans, emitted into the JSONL stream as "span" events.
+#
+#   with tracing.span("search", run_id, roots=3) as sp:
+#       ...
+#       sp.attrs["matched"] = n
+#
+# Each span records wall time and, separately, time spent waiting on the user
+# (tracing.waiting()), so machine_ms = wall_ms - wait_ms. Waits count towards every
+# enclosing span. Spans nest through a context variable; worker threads join the
+# caller's trace when run under contextvars.copy_context().
+import os
+import sys
+import time
+import itertools
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+from . import logging_utils as L
+
+_ids = itertools.count(1)
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("trace_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "run_id", "id", "parent", "attrs", "t0", "wait", "wall")
+
+    def __init__(self, name: str, run_id: Optional[str], parent: Optional["Span"], attrs: dict):
+        self.name = name
+        self.run_id = run_id if run_id is not None else (parent.run_id if parent else None)
+        self.id = next(_ids)
+        self.parent = parent
+        self.attrs = attrs
+        self.t0 = time.perf_counter()
+        self.wait = 0.0
+        self.wall = 0.0
+
+    @property
+    def machine_s(self) -> float:
+        return self.wall - self.wait
+
+    def _emit(self):
+        if not self.run_id:
+            return
+        L.log_event(self.run_id, "span", dict(
+            self.attrs,
+            name=self.name,
+            id=self.id,
+            parent=self.parent.id if self.parent else None,
+            wall_ms=round(self.wall * 1000, 3),
+            wait_ms=round(self.wait * 1000, 3),
+            machine_ms=round((self.wall - self.wait) * 1000, 3),
+        ))
+
+
+def current() -> Optional[Span]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, run_id: Optional[str] = None, **attrs) -> Iterator[Span]:
+    """Time a block as a child of the current span (run_id is inherited when omitted)."""
+    sp = Span(name, run_id, _current.get(), attrs)
+    token = _current.set(sp)
+    try:
+        yield sp
+    finally:
+        sp.wall = time.perf_counter() - sp.t0
+        _current.reset(token)
+        sp._emit()
+
+
+def record(name: str, seconds: float, **attrs):
+    """Emit an already-measured interval as a child of the current span."""
+    parent = _current.get()
+    sp = Span(name, None, parent, attrs)
+    sp.wall = seconds
+    sp._emit()
+
+
+@contextmanager
+def waiting():
+    """Mark a block as user think time (a prompt), charged to every enclosing span."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        sp = _current.get()
+        while sp is not None:
+            sp.wait += dt
+            sp = sp.parent
+
+
+def timed_iter(name: str, it: Iterable, **attrs) -> Iterator:
+    """
+    Yield from `it`, emitting one span once it is exhausted whose wall time is only
+    the time spent producing items (the consumer's time between items is excluded).
+    """
+    parent = _current.get()
+    busy = 0.0
+    n = 0
+    it = iter(it)
+    try:
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                busy += time.perf_counter() - t0
+                return
+            busy += time.perf_counter() - t0
+            n += 1
+            yield item
+    finally:
+        sp = Span(name, None, parent, dict(attrs, items=n))
+        sp.wall = busy
+        sp._emit()
+
+
+# ----- --profile -----
+
+class _Sampler(threading.Thread):
+    """Samples one thread's stack every `interval` s into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.target_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.wait(self.interval):
+            frame = sys._current_frames().get(self.target_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+@contextmanager
+def profile(prefix: str):
+    """
+    Profile the block: <prefix>.prof (cProfile; snakeviz / pstats) and <prefix>.folded
+    (sampled collapsed stacks; flamegraph.pl, speedscope, inferno).
+    """
+    import cProfile
+
+    prof = cProfile.Profile()
+    sampler = _Sampler(threading.get_ident())
+    sampler.start()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        sampler.stop.set()
+        sampler.join()
+        prof.dump_stats(f"{prefix}.prof")
+        with open(f"{prefix}.folded", "w", encoding="utf-8") as f:
+            for stack, n in sampler.stacks.most_common():
+                f.write(f"{stack} {n}\n")
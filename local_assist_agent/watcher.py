@@ -0,0 +1,199 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from typing import Dict, Iterable, List, Optional
+
+from .config import INDEX_DB, WATCH_HEARTBEAT_S
+from .skills import index as IX
+from .logging_utils import log_line
+
+# <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+               IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW)
+_EVENT = struct.Struct("iIII")
+_libc = None
+
+
+def _inotify():
+    global _libc
+    if _libc is None:
+        if not sys.platform.startswith("linux"):
+            raise RuntimeError("watch mode needs Linux inotify")
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    return _libc
+
+
+class ScopeWatcher:
+    """
+    One inotify instance per scope, mirroring events into the metadata index.
+
+    Because each scope has its own queue, an IN_Q_OVERFLOW tells us exactly which
+    subtree lost events; only that scope is rescanned.
+    """
+
+    def __init__(self, conn, root: str):
+        self.conn = conn
+        self.root = os.path.realpath(os.path.expanduser(root))
+        self.fd = -1
+        self.paths: Dict[int, str] = {}
+        self.overflows = 0
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def start(self):
+        libc = _inotify()
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+        # Watch first, then index: anything created in between shows up as an event.
+        self._watch_tree(self.root)
+        IX.refresh(self.conn, self.root)
+        IX.mark_watched(self.conn, self.root, os.getpid())
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+        IX.unmark_watched(self.conn, self.root)
+
+    def _add_watch(self, path: str):
+        wd = _inotify().inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            e = ctypes.get_errno()
+            if e == errno.ENOSPC:
+                log_line(f"watch: inotify watch limit reached at {path} "
+                         f"(raise fs.inotify.max_user_watches)", level="WARN")
+            return
+        self.paths[wd] = path
+
+    def _watch_tree(self, top: str):
+        stack = [top]
+        while stack:
+            d = stack.pop()
+            self._add_watch(d)
+            try:
+                with os.scandir(d) as it:
+                    stack.extend(e.path for e in it if e.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+
+    def _forget_tree(self, top: str):
+        prefix = top.rstrip(os.sep) + os.sep
+        for wd, p in list(self.paths.items()):
+            if p == top or p.startswith(prefix):
+                del self.paths[wd]
+
+    def _overflow(self):
+        self.overflows += 1
+        log_line(f"watch: event queue overflow under {self.root}; rescanning it", level="WARN")
+        self._watch_tree(self.root)
+        IX.rescan_subtree(self.conn, self.root)
+
+    def handle(self) -> int:
+        """
+        Drain pending events and apply them in one transaction. Returns events applied.
+        The index helpers called here never commit, so a batch (overflow rescans
+        included) lands whole or not at all.
+        """
+        try:
+            buf = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return 0
+        n = 0
+        with self.conn:
+            off = 0
+            while off < len(buf):
+                wd, mask, _cookie, length = _EVENT.unpack_from(buf, off)
+                off += _EVENT.size
+                name = buf[off:off + length].rstrip(b"\0")
+                off += length
+                n += 1
+
+                if mask & IN_Q_OVERFLOW:
+                    self._overflow()
+                    continue
+                base = self.paths.get(wd)
+                if base is None:
+                    continue
+                if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    self.paths.pop(wd, None)
+                    continue
+                path = os.path.join(base, os.fsdecode(name))
+
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    IX.remove_path(self.conn, path)
+                    if mask & IN_ISDIR:
+                        self._forget_tree(path)
+                elif mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_tree(path)
+                        IX.rescan_subtree(self.conn, path)
+                else:
+                    try:
+                        st = os.stat(path, follow_symlinks=True)
+                    except OSError:
+                        IX.remove_path(self.conn, path)
+                        continue
+                    if os.path.isfile(path):
+                        IX.upsert_file(self.conn, path, st)
+        return n
+
+
+def watch(scopes: Iterable[str], db_path=INDEX_DB, stop_after: Optional[float] = None):
+    """
+    Keep the metadata index for `scopes` live until interrupted.
+    Queries with use_index=True skip their refresh for roots with a fresh heartbeat.
+    """
+    conn = IX.open_index(db_path)
+    watchers: List[ScopeWatcher] = []
+    for root in scopes:
+        if not os.path.isdir(os.path.expanduser(root)):
+            continue
+        w = ScopeWatcher(conn, root)
+        w.start()
+        watchers.append(w)
+        log_line(f"watch: {w.root} ({len(w.paths)} directories)")
+    if not watchers:
+        conn.close()
+        return
+
+    deadline = None if stop_after is None else time.monotonic() + stop_after
+    beat = time.monotonic()
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            ready, _, _ = select.select(watchers, [], [], WATCH_HEARTBEAT_S)
+            for w in ready:
+                w.handle()
+            if time.monotonic() - beat >= WATCH_HEARTBEAT_S:
+                for w in watchers:
+                    IX.mark_watched(conn, w.root, os.getpid())
+                beat = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for w in watchers:
+            w.close()
+        conn.close()
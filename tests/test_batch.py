@@ -0,0 +1,86 @@
+import json, os, time
+from local_assist_agent import batch
+from local_assist_agent.skills.scan import ScanStats
+
+def _touch(p, age_days=0, size=1):
+    p.write_bytes(b"x" * size)
+    t = time.time() - age_days * 86400
+    os.utime(p, (t, t))
+
+def test_batch_shares_one_scan_and_filters_per_job(tmp_path, temp_logs, monkeypatch):
+    root = tmp_path / "dl"
+    (root / "sub").mkdir(parents=True)
+    _touch(root / "old.zip", age_days=60)
+    _touch(root / "new.zip", age_days=1)
+    _touch(root / "sub" / "report.pdf", age_days=2, size=5000)
+    _touch(root / "notes.txt", age_days=1)
+
+    walked = []
+    real_walk = batch.walk
+    monkeypatch.setattr(batch, "walk", lambda d, m, *a: (walked.append(d), real_walk(d, m, *a))[1])
+    trashed = []
+    monkeypatch.setattr(batch, "move_to_trash",
+                        lambda paths: (trashed.extend(paths), (len(paths), [], [{"ok": True}] * len(paths)))[1])
+
+    jobs = tmp_path / "jobs.jsonl"
+    jobs.write_text("\n".join(json.dumps(j) for j in [
+        {"id": "old", "prompt": "delete zip files older than 30 days", "scopes": [str(root)], "execute": True},
+        {"id": "pdf", "prompt": "delete pdf files", "scopes": [str(root / "sub")], "select": "top 1"},
+        {"id": "hi", "prompt": "hello there"},
+        {"id": "bad-sel", "prompt": "delete zip files", "scopes": [str(root)], "select": "random 3"},
+        "not a job",
+    ]) + "\n", encoding="utf-8")
+    out = tmp_path / "results.jsonl"
+
+    res = batch.run_batch(jobs, out, execute=True)
+    by_id = {r["id"]: r for r in map(json.loads, out.read_text().splitlines())}
+
+    assert walked == [str(root.resolve())]  # nested scope folded, one pass
+    assert by_id["old"]["status"] == "trashed" and by_id["old"]["paths"] == [str(root.resolve() / "old.zip")]
+    assert [str(p) for p in trashed] == [str(root.resolve() / "old.zip")]
+    assert by_id["pdf"]["status"] == "dry_run" and by_id["pdf"]["selected"] == 1
+    assert by_id["hi"]["status"] == "noop"
+    assert by_id["bad-sel"]["status"] == "error"
+    assert by_id["line5"]["status"] == "error"
+    assert len(res) == 5
+
+def test_scopes_are_validated_and_results_keep_line_order(tmp_path, temp_logs):
+    root = tmp_path / "dl"
+    root.mkdir()
+    (root / "a.zip").write_text("x")
+    jobs = tmp_path / "jobs.jsonl"
+    jobs.write_text("\n".join(json.dumps(j) for j in [
+        {"id": "one", "prompt": "delete zip files", "scopes": str(root)},
+        {"id": "two", "prompt": "delete zip files", "scopes": [str(root), 7]},
+        "not a job",
+        {"id": "four", "prompt": "delete zip files", "scopes": {"path": str(root)}},
+        {"id": "five", "prompt": "hello"},
+    ]) + "\n", encoding="utf-8")
+    loaded, bad = batch.load_jobs(jobs)
+    assert loaded[0].scopes == [str(root)] and [n for n, _ in bad] == [2, 3, 4]
+
+    res = batch.run_batch(jobs, tmp_path / "out.jsonl")
+    assert [r["id"] for r in res] == ["one", "line2", "line3", "line4", "five"]
+    assert res[0]["status"] == "dry_run" and res[0]["paths"] == [str(root.resolve() / "a.zip")]
+
+def test_one_failing_job_keeps_the_others(tmp_path, temp_logs, monkeypatch):
+    root = tmp_path / "dl"; root.mkdir()
+    _touch(root / "a.zip")
+    _touch(root / "b.pdf")
+    real = batch._evaluate
+    def evaluate(job, plan, shared):
+        if job.id == "boom":
+            raise RuntimeError("policy store unavailable")
+        return real(job, plan, shared)
+    monkeypatch.setattr(batch, "_evaluate", evaluate)
+    monkeypatch.setattr(batch, "move_to_trash", lambda paths: (_ for _ in ()).throw(OSError("trash is full")))
+    jobs = tmp_path / "jobs.jsonl"
+    jobs.write_text("\n".join(json.dumps(j) for j in [
+        {"id": "zip", "prompt": "delete zip files", "scopes": [str(root)]},
+        {"id": "boom", "prompt": "delete zip files", "scopes": [str(root)]},
+        {"id": "pdf", "prompt": "delete pdf files", "scopes": [str(root)], "execute": True},
+    ]) + "\n", encoding="utf-8")
+    res = batch.run_batch(jobs, tmp_path / "out.jsonl", execute=True)
+    assert [(r["id"], r["status"]) for r in res] == [("zip", "dry_run"), ("boom", "error"), ("pdf", "error")]
+    assert res[1]["error"] == "RuntimeError: policy store unavailable" and "trash is full" in res[2]["error"]
+    assert len((tmp_path / "out.jsonl").read_text().splitlines()) == 3
@@ -0,0 +1,29 @@
+import json, os, subprocess, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+GROUPS = {  # one entry from each group: search, policies, planner, logging, execute
+    "find_recent", "policy_engine_classify", "plan_from_prompt_warm", "log_event_buffered_1000", "execute_full_dry",
+}
+
+def test_suite_runs_on_a_tiny_tree_and_writes_its_schema(tmp_path):
+    out = tmp_path / "bench.json"
+    env = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=str(ROOT))
+    subprocess.run([sys.executable, str(ROOT / "benchmarks" / "bench_suite.py"), "--depth", "1", "--fanout", "2",
+                    "--files-per-dir", "3", "--repeat", "1", "--out", str(out)],
+                   cwd=tmp_path, env=env, capture_output=True, text=True, check=True, timeout=300)
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert set(report) == {"meta", "results"}
+    meta = report["meta"]
+    assert {"when", "git", "python", "platform", "cpus", "tree"} <= set(meta)
+    assert meta["tree"]["depth"] == 1 and meta["tree"]["files"] > 0
+    results = report["results"]
+    assert GROUPS <= set(results)
+    for name, r in results.items():
+        if not isinstance(r, dict):
+            assert isinstance(r, int), name  # plain counts, e.g. risky_paths
+            continue
+        assert {"best_ms", "median_ms", "rounds", "calls_per_round"} <= set(r), name
+        assert 0 <= r["best_ms"] <= r["median_ms"] and r["rounds"] == 1
+    assert results["find_recent"]["matches"] > 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["bench.json"]  # logs and the tree stay in its temp dir
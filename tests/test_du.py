@@ -0,0 +1,51 @@
+import builtins, json, os
+from local_assist_agent.skills import du
+from local_assist_agent.skills.scan import ScanStats
+from local_assist_agent.planner import plan_from_prompt
+from local_assist_agent import executor as ex
+
+def _tree(root):
+    for d, n in (("big/inner", 3), ("big", 1), ("small", 1), ("", 1)):
+        p = root / d
+        p.mkdir(parents=True, exist_ok=True)
+        for i in range(n):
+            (p / f"f{i}.bin").write_bytes(b"x" * 50_000)
+
+def test_usage_rolls_up_and_reuses_unchanged_dirs(tmp_path):
+    root = tmp_path / "Downloads"; _tree(root)
+    conn = du.open_cache(tmp_path / "du.sqlite3")
+    t = du.usage(str(root), conn)
+    r = os.path.realpath(root)
+    assert t.files[r] == 6 and t.files[os.path.join(r, "big")] == 4
+    assert [os.path.basename(p) for p, _, _ in t.top(5)] == ["big", "small"]
+    assert t.total[r] == sum(t.own.values())
+
+    # fresh directories are cached as racy; back-date them so the next visit can trust mtimes
+    for p in ("big/inner", "big", "small", ""):
+        os.utime(root / p, ns=(1_000_000_000, 1_000_000_000))
+    du.usage(str(root), conn)
+    # then change a single directory
+    (root / "small" / "new.bin").write_bytes(b"y" * 10)
+    os.utime(root / "small", ns=(2_000_000_000, 2_000_000_000))
+    stats = ScanStats()
+    t2 = du.usage(str(root), conn, stats)
+    assert t2.rescanned == 1 and t2.reused == 3 and stats.dirs == 1
+    assert t2.files[r] == 7
+    conn.close()
+
+def test_executor_du_drill_down_and_mark(tmp_path, monkeypatch, temp_logs):
+    root = tmp_path / "Downloads"; _tree(root)
+    monkeypatch.setattr(du, "DU_DB", tmp_path / "du.sqlite3")
+    plan = plan_from_prompt("what's taking space in downloads")
+    assert plan.steps[0].action == "disk_usage"
+    # open 'big', mark 'inner', go up, Enter; then the normal selection / risky prompts
+    answers = iter(["1", "s 1", "..", "", "all", "I UNDERSTAND"])
+    monkeypatch.setattr(builtins, "input", lambda: next(answers))
+    ex.execute(plan, do_execute=False, scopes=[str(tmp_path / "Other"), str(root)], run_id="du")
+    _, jsonl = temp_logs
+    ev = [json.loads(l) for l in jsonl.read_text().splitlines()]
+    rep = next(e["data"] for e in ev if e["event"] == "du.report")
+    assert list(rep["roots"]) == [os.path.realpath(root)]
+    sel = next(e["data"] for e in ev if e["event"] == "selection.made")
+    assert sel["paths"] == [os.path.join(os.path.realpath(root), "big", "inner")]
+    assert any(e["event"] == "execute.dry_run" for e in ev)
@@ -0,0 +1,53 @@
+import builtins, json, os
+from local_assist_agent.schemas import FileHit
+from local_assist_agent.skills import dupes
+from local_assist_agent.planner import plan_from_prompt
+from local_assist_agent import executor as ex
+
+def _hits(root):
+    out = []
+    for p in sorted(root.iterdir()):
+        st = p.stat()
+        out.append(FileHit(str(p), mtime=st.st_mtime, size=st.st_size))
+    return out
+
+def _tree(root):
+    body = os.urandom(20_000)
+    (root / "setup.exe").write_bytes(body)
+    (root / "setup (1).exe").write_bytes(body)
+    os.utime(root / "setup.exe", (1_000_000, 1_000_000))
+    (root / "same-size.exe").write_bytes(body[:10_000] + b"x" + body[10_001:])  # same head+tail, differs inside
+    (root / "small.txt").write_bytes(b"hello")
+    (root / "small copy.txt").write_bytes(b"hello")
+    os.link(root / "setup.exe", root / "hardlink.exe")
+
+def test_find_duplicates_stages_and_cache(tmp_path, monkeypatch):
+    root = tmp_path / "dl"; root.mkdir(); _tree(root)
+    db = tmp_path / "hashes.sqlite3"
+    groups = dupes.find_duplicates(_hits(root), db_path=db, workers=2)
+    names = [sorted(os.path.basename(h.fspath) for h in g) for g in groups]
+    assert len(groups) == 2
+    assert names[0] in (["setup (1).exe", "setup.exe"], ["hardlink.exe", "setup (1).exe"])
+    assert names[1] == ["small copy.txt", "small.txt"]
+    assert dupes.keeper(groups[0], "oldest").mtime == 1_000_000
+
+    def boom(*a, **k):
+        raise AssertionError("re-hashed an unchanged file")
+    monkeypatch.setattr(dupes, "full_digest", boom)
+    monkeypatch.setattr(dupes, "edge_digest", boom)
+    assert len(dupes.find_duplicates(_hits(root), db_path=db)) == 2
+
+def test_executor_dupes_keep_newest(tmp_path, monkeypatch, temp_logs):
+    root = tmp_path / "dl"; root.mkdir(); _tree(root)
+    monkeypatch.setattr(dupes, "HASH_DB", tmp_path / "hashes.sqlite3")
+    plan = plan_from_prompt("delete duplicate exe files")
+    assert [s.action for s in plan.steps][1] == "find_duplicates"
+    answers = iter(["n", "all", "I UNDERSTAND"])
+    monkeypatch.setattr(builtins, "input", lambda: next(answers))
+    ex.execute(plan, do_execute=False, scopes=[str(root)], run_id="dupes")
+    _, jsonl = temp_logs
+    ev = [json.loads(l) for l in jsonl.read_text().splitlines()]
+    g = next(e["data"] for e in ev if e["event"] == "dupes.groups")
+    assert g["groups"] == 1 and g["keep"] == "newest"
+    sel = next(e["data"] for e in ev if e["event"] == "selection.made")
+    assert sel["count"] == 1 and os.path.basename(sel["paths"][0]) in ("setup.exe", "hardlink.exe")
@@ -20,3 +20,46 @@ def test_find_recent_filters(tmp_path):
     hits2 = find_recent([str(root)], patterns=["*.zip"], min_size_kb=2)
     names2 = [h.path.name for h in hits2]
     assert "b.zip" in names2 and "a.zip" not in names2
+
+def test_find_recent_multi_pattern_single_pass(tmp_path):
+    from local_assist_agent.skills.scan import ScanStats
+    sub = tmp_path / "deep" / "er"
+    sub.mkdir(parents=True)
+    (tmp_path / "a.doc").write_bytes(b"x")
+    (sub / "b.pptx").write_bytes(b"x")
+    (sub / "c.txt").write_bytes(b"x")
+    (tmp_path / "dir.doc").mkdir()  # directories never match
+
+    stats = ScanStats()
+    hits = find_recent([str(tmp_path)], patterns=["*.doc", "*.pptx", "*.doc"], days=None, stats=stats)
+    assert sorted(h.path.name for h in hits) == ["a.doc", "b.pptx"]
+    assert stats.dirs == 4 and stats.stat_calls == 2
+
+def test_find_recent_parallel_matches_sequential(tmp_path):
+    for d in range(12):
+        sub = tmp_path / f"d{d % 3}" / f"s{d}"
+        sub.mkdir(parents=True)
+        for i in range(5):
+            (sub / f"f{i}.zip").write_bytes(b"x" * i)
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "solo.zip").write_bytes(b"x")
+
+    roots = [str(tmp_path / "d0"), str(tmp_path / "d1"), str(tmp_path / "d2"), str(other)]
+    seq = find_recent(roots, patterns=["*.zip"], days=None, workers=1)
+    par = find_recent(roots, patterns=["*.zip"], days=None, workers=4)
+    assert len(par) == 61
+    assert sorted(h.path for h in seq) == sorted(h.path for h in par)
+    assert [h.mtime for h in par] == sorted((h.mtime for h in par), reverse=True)
+
+def test_find_recent_limit_keeps_newest(tmp_path):
+    from local_assist_agent.skills.files import iter_recent
+    now = time.time()
+    for i in range(10):
+        p = tmp_path / f"f{i}.zip"
+        p.write_bytes(b"x")
+        os.utime(p, (now - i * 60, now - i * 60))
+
+    assert len(list(iter_recent([str(tmp_path)], patterns=["*.zip"], days=None))) == 10
+    top = find_recent([str(tmp_path)], patterns=["*.zip"], days=None, limit=3)
+    assert [h.path.name for h in top] == ["f0.zip", "f1.zip", "f2.zip"]
@@ -0,0 +1,28 @@
+import os, subprocess, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def _imported(args, home):
+    env = dict(os.environ, HOME=str(home), PYTHONPATH=str(ROOT))
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+    return {ln.rsplit("|", 1)[1].strip() for ln in proc.stderr.splitlines() if ln.startswith("import time:")}, proc
+
+def test_import_is_light_and_side_effect_free(tmp_path):
+    mods, _ = _imported(["-c", "import local_assist_agent.main"], tmp_path)
+    assert "local_assist_agent.executor" in mods
+    assert not {"rich", "send2trash", "numpy"} & mods
+    assert list(tmp_path.iterdir()) == []  # no log dir created just by importing
+
+def test_noop_prompt_skips_rich(tmp_path):
+    mods, proc = _imported([str(ROOT / "assist_agent.py"), "--local", "hello"], tmp_path)
+    assert "No actionable step parsed." in proc.stdout
+    assert "rich" not in mods
+
+def test_plain_find_recent_leaves_numpy_alone(tmp_path):
+    (tmp_path / "a.zip").write_bytes(b"x")
+    code = ("import sys; from local_assist_agent.skills.files import find_recent; "
+            f"assert [h.name for h in find_recent([{str(tmp_path)!r}], ['*.zip'], days=None)] == ['a.zip']; "
+            "assert 'numpy' not in sys.modules")
+    _imported(["-c", code], tmp_path)
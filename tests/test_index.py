@@ -0,0 +1,86 @@
+import os, time
+from local_assist_agent.skills import files
+from local_assist_agent.skills.index import open_index, refresh, query
+from local_assist_agent.skills.scan import ScanStats
+
+def _age(p, seconds):
+    t = time.time() - seconds
+    os.utime(p, (t, t))
+
+def test_index_refresh_is_incremental(tmp_path):
+    root = tmp_path / "root"
+    (root / "a" / "deep").mkdir(parents=True)
+    (root / "b").mkdir()
+    (root / "a" / "deep" / "x.zip").write_bytes(b"x")
+    (root / "b" / "y.pdf").write_bytes(b"y" * 4096)
+    for d in (root / "a" / "deep", root / "a", root / "b", root):
+        _age(d, 60)
+
+    conn = open_index(tmp_path / "idx.sqlite3")
+    s1 = ScanStats()
+    refresh(conn, str(root), s1)
+    assert s1.dirs == 4
+
+    # Nothing changed: no directory is re-listed
+    s2 = ScanStats()
+    refresh(conn, str(root), s2)
+    assert s2.dirs == 0
+
+    # A new file only re-lists its own directory
+    (root / "b" / "z.zip").write_bytes(b"z")
+    _age(root / "b", 30)
+    s3 = ScanStats()
+    refresh(conn, str(root), s3)
+    assert s3.dirs == 1
+
+    names = sorted(os.path.basename(r[0]) for r in query(conn, [str(root)], ["*.zip"]))
+    assert names == ["x.zip", "z.zip"]
+    big = query(conn, [str(root)], ["*"], min_bytes=2048)
+    assert [os.path.basename(r[0]) for r in big] == ["y.pdf"]
+    conn.close()
+
+def test_find_recent_use_index_matches_walk(tmp_path, monkeypatch):
+    monkeypatch.setattr(files, "INDEX_DB", tmp_path / "idx.sqlite3")
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "report_q1.zip").write_bytes(b"x")
+    (root / "other.zip").write_bytes(b"x")
+    (root / "report.txt").write_bytes(b"x")
+
+    kw = dict(patterns=["*.zip"], name_hint="report", newer_than_days=7)
+    walked = [h.path for h in files.find_recent([str(root)], **kw)]
+    indexed = [h.path for h in files.find_recent([str(root)], use_index=True, **kw)]
+    assert walked == indexed and [p.name for p in indexed] == ["report_q1.zip"]
+
+def test_query_folds_case_like_the_walker(tmp_path, monkeypatch):
+    from local_assist_agent.skills import index
+    root = tmp_path / "root"; root.mkdir()
+    for n in ("A.ZIP", "b.zip", "Photo1.JPG"):
+        (root / n).write_bytes(b"x")
+    conn = open_index(tmp_path / "idx.sqlite3")
+    refresh(conn, str(root), ScanStats())
+    for ci, want in ((True, ["A.ZIP", "Photo1.JPG", "b.zip"]), (False, ["b.zip"])):
+        monkeypatch.setattr(index, "is_case_insensitive", lambda p, _ci=ci: _ci)
+        got = sorted(os.path.basename(r[0]) for r in query(conn, [str(root)], ["*.zip", "photo*"]))
+        assert got == want
+    conn.close()
+
+def test_index_and_walk_agree_on_tricky_patterns(tmp_path, monkeypatch):
+    from local_assist_agent.skills import index, query as Q
+    monkeypatch.setattr(files, "INDEX_DB", tmp_path / "idx.sqlite3")
+    root = tmp_path / "root"; root.mkdir()
+    for n in (".bashrc", "x.bashrc", "a1.txt", "ab.txt", "ÄRGER.TXT", "ärger.txt", "Ölfass.Log"):
+        (root / n).write_bytes(b"x")
+    cases = [["*.bashrc"], ["a[!1]*"], ["*.txt"], ["ärger*", "*.log"]]
+    for ci in (False, True):
+        monkeypatch.setattr(Q, "is_case_insensitive", lambda p, _ci=ci: _ci)
+        monkeypatch.setattr(index, "is_case_insensitive", lambda p, _ci=ci: _ci)
+        for pats in cases:
+            walked = sorted(h.name for h in files.find_recent([str(root)], pats, days=None))
+            indexed = sorted(h.name for h in files.find_recent([str(root)], pats, days=None, use_index=True))
+            assert walked == indexed, (ci, pats)
+        hint = sorted(h.name for h in files.find_recent([str(root)], ["*"], days=None, name_hint="ÖLF",
+                                                          use_index=True))
+        assert hint == ["Ölfass.Log"]
+    assert sorted(h.name for h in files.find_recent([str(root)], ["ärger*"], days=None, use_index=True)) \
+        == ["ÄRGER.TXT", "ärger.txt"]  # last run was case-insensitive
@@ -0,0 +1,70 @@
+import json
+import multiprocessing as mp
+import local_assist_agent.logging_utils as lu
+
+def test_buffered_events_flush_in_order(temp_logs):
+    _, jsonl = temp_logs
+    for i in range(500):
+        lu.log_event("r1", "tick", {"i": i})
+    lu.log_event("r1", "delete.result", {"ok": 1}, sync=True)  # drains the buffer first
+    recs = [json.loads(l) for l in jsonl.read_text().splitlines()]
+    assert [r["data"].get("i") for r in recs[:-1]] == list(range(500))
+    assert recs[-1]["event"] == "delete.result"
+
+def _child(path, n):
+    lu.LOG_JSONL = path
+    for i in range(n):
+        lu.log_event("c", "tick", {"pad": "x" * 200, "i": i})
+    lu.flush()
+
+def test_concurrent_processes_do_not_interleave(temp_logs):
+    _, jsonl = temp_logs
+    ctx = mp.get_context("spawn")
+    procs = [ctx.Process(target=_child, args=(jsonl, 200)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    lines = jsonl.read_text().splitlines()
+    assert len(lines) == 600
+    assert all(json.loads(l)["event"] == "tick" for l in lines)
+
+def test_rotation_into_indexed_segments(temp_logs, monkeypatch):
+    from local_assist_agent import logstore
+    _, jsonl = temp_logs
+    monkeypatch.setattr(lu, "LOG_ROTATE_BYTES", 4096)
+    monkeypatch.setattr(logstore, "MEMBER_BYTES", 1024)
+    for i in range(60):
+        for rid in ("aaaa1111", "bbbb2222"):
+            lu.log_event(rid, "tick", {"i": i, "pad": "x" * 50}, sync=True)
+
+    segs = list(logstore.segments_dir(jsonl).glob("agent-*.jsonl.gz"))
+    assert segs and jsonl.stat().st_size < 4096 + 200
+    entries = list(logstore.index_entries(jsonl, "aaaa1111"))
+    assert {e["segment"] for e in entries} == {s.name for s in segs}
+
+    events = logstore.read_run(jsonl, "aaaa1111")
+    assert [e["data"]["i"] for e in events] == list(range(60))
+    assert {e["run_id"] for e in events} == {"aaaa1111"}
+
+    # one index entry reaches its events without inflating the rest of the segment
+    e = entries[0]
+    part = logstore.read_segment_range(jsonl, e["segment"], e["offset"], e["end"])
+    whole = logstore.read_segment_range(jsonl, e["segment"])
+    assert b"aaaa1111" in part and len(part) <= len(whole)
+
+def test_writer_survives_failing_batches(temp_logs, monkeypatch):
+    _, jsonl = temp_logs
+    real = lu._append
+    def boom(path, data, rotate=True):
+        if "explode" in data:
+            raise ValueError("rotation failed")
+        real(path, data, rotate)
+    monkeypatch.setattr(lu, "_append", boom)
+    lu.log_event("r", "tick", {"x": "explode"})
+    lu.flush()  # used to hang forever once the writer thread had died
+    lu.log_event("r", "tick", {"path": "/tmp/bad\udcff.zip"})
+    lu.log_event("r", "after", {})
+    lu.flush()
+    text = jsonl.read_text(encoding="utf-8")
+    assert '"after"' in text and "explode" not in text
@@ -0,0 +1,64 @@
+import json
+from local_assist_agent import logquery
+import local_assist_agent.logging_utils as lu
+
+def _write(jsonl, records):
+    jsonl.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+def _ev(ts, rid, event, data=None):
+    return {"ts": ts, "run_id": rid, "level": "INFO", "event": event, "data": data or {}}
+
+def test_query_filters_and_aggregates(tmp_path):
+    jsonl = tmp_path / "agent.jsonl"
+    _write(jsonl, [
+        _ev("2026-10-01T09:00:00", "abc123", "input.prompt"),
+        _ev("2026-10-01T09:00:05", "abc123", "confirm.bulk", {"accepted": True}),
+        _ev("2026-10-01T09:00:09", "abc123", "delete.result", {"ok": 3, "bytes": 3000, "errors": ["x: denied"]}),
+        _ev("2026-10-08T10:00:00", "def456", "input.prompt"),
+        _ev("2026-10-08T10:00:07", "def456", "delete.result", {"ok": 1, "bytes": 500, "errors": []}),
+        _ev("2026-10-15T11:00:00", "ghi789", "noop"),
+    ])
+
+    run = [json.loads(l) for l in logquery.query(jsonl, run_id="abc123")]
+    assert [r["event"] for r in run] == ["input.prompt", "confirm.bulk", "delete.result"]
+
+    week = list(logquery.query(jsonl, event="delete.result",
+                               since=logquery._parse_when("2026-10-05"), until=logquery._parse_when("2026-10-12")))
+    assert len(week) == 1 and b"def456" in week[0]
+
+    stats = logquery.aggregate(logquery.query(jsonl))
+    assert stats["runs"] == 3 and stats["files_trashed"] == 4 and stats["bytes_trashed"] == 3500
+    assert stats["error_rate"] == 0.2 and stats["runs_with_confirm_bulk"] == ["abc123"]
+
+def test_query_reaches_rotated_segments(temp_logs, monkeypatch):
+    _, jsonl = temp_logs
+    monkeypatch.setattr(lu, "LOG_ROTATE_BYTES", 2048)
+    for i in range(40):
+        lu.log_event("old00001" if i < 20 else "new00002", "tick", {"i": i}, sync=True)
+    got = [json.loads(l)["data"]["i"] for l in logquery.query(jsonl, run_id="old00001")]
+    assert got == list(range(20))
+    assert logquery.aggregate(logquery.query(jsonl))["events"] == 40
+
+def test_time_bounds_tolerate_slightly_unordered_records(tmp_path):
+    jsonl = tmp_path / "agent.jsonl"
+    stamps = ["2026-10-01T09:00:00", "2026-10-01T23:59:30", "2026-10-02T00:00:01",
+              "2026-10-01T23:59:59", "2026-10-02T00:00:00", "2026-10-02T12:00:00"]
+    _write(jsonl, [_ev(ts, f"r{i}", "tick") for i, ts in enumerate(stamps)])
+    day = [json.loads(l)["ts"] for l in logquery.query(
+        jsonl, since=logquery._parse_when("2026-10-01T23:59:59"),
+        until=logquery._parse_when("2026-10-01", end_of_day=True))]
+    assert day == ["2026-10-01T23:59:59"]
+    after = [json.loads(l)["ts"] for l in logquery.query(jsonl, since=logquery._parse_when("2026-10-02"))]
+    assert after == ["2026-10-02T00:00:01", "2026-10-02T00:00:00", "2026-10-02T12:00:00"]
+    assert logquery._parse_when("2026-10-01", end_of_day=True) == b"2026-10-01T23:59:59"
+    assert logquery._parse_when("2026-10-01T08:00", end_of_day=True) == b"2026-10-01T08:00:00"
+
+def test_bad_time_bounds_are_a_usage_error(tmp_path, capsys):
+    import pytest
+    for argv in (["--since", "last tuesday"], ["--since", "7d", "--until", "2026-13-01"]):
+        with pytest.raises(SystemExit) as exc:
+            logquery.main(argv + ["--log", str(tmp_path / "agent.jsonl")])
+        assert exc.value.code == 2
+        err = capsys.readouterr().err
+        assert "use YYYY-MM-DD" in err and "Traceback" not in err
+    assert "--until '2026-13-01'" in err
@@ -0,0 +1,48 @@
+import tracemalloc
+from pathlib import Path
+from local_assist_agent.schemas import FileHit, HitView
+from local_assist_agent.skills.files import find_recent, iter_recent
+from local_assist_agent.skills.store import HitStore
+from local_assist_agent import executor as ex
+
+N = 6_000
+
+def _tree(root):
+    for i in range(N):
+        d = root / f"project{i % 60}" / "sub"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"report_{i:06d}.docx").write_bytes(b"")
+    return str(root)
+
+def _measure(run):
+    tracemalloc.start()
+    try:
+        keep = run()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(keep) == N
+    return peak / N, current / N
+
+def _select(view):
+    # the executor's path after a search: filter to a view, then take everything from it
+    sel = view.where(lambda h: h.size >= 0)
+    return sel.select(range(len(sel)))
+
+def test_scan_and_select_stay_small_per_hit(tmp_path):
+    root = _tree(tmp_path / "scope")
+    import rich.live  # noqa: F401  (module imports are not per-hit cost)
+    _select(ex._collect(iter_recent([root], ["*.docx"], days=None))[0][:1])
+
+    peak, kept = _measure(lambda: _select(HitView(find_recent([root], ["*.docx"], days=None))))
+    assert peak < 500 and kept < 250, (peak, kept)  # bytes per hit, walk included
+
+    peak, kept = _measure(lambda: _select(ex._collect(iter_recent([root], ["*.docx"], days=None))[0]))
+    assert peak < 400 and kept < 120, (peak, kept)  # columnar store behind the executor
+
+def test_compact_hits_round_trip():
+    store = HitStore.from_hits([FileHit(Path("/a/b/c.zip"), 1.0, 3), FileHit("/a/b/d.pdf", 2.0, 4)])
+    view = HitView(store, store.newest_first())
+    assert [h.path for h in view] == [Path("/a/b/d.pdf"), Path("/a/b/c.zip")]
+    assert view[0].parent is view[1].parent  # interned prefix
+    assert [h.name for h in view.select([1])] == ["c.zip"]
@@ -14,3 +14,24 @@ def test_planner_types_age_size_name():
     assert params["min_size_kb"] >= 1000
     assert params["name_hint"] == "report"
 
+
+def test_plan_memo_returns_independent_plans():
+    from local_assist_agent.planner import plan_many
+    a, b, c = plan_many(["Delete PDF files", "  delete pdf files ", "hello"])
+    assert _search_params(a) == _search_params(b)
+    _search_params(a)["patterns"].append("*.zip")
+    assert _search_params(b)["patterns"] == ["*.pdf"]
+    assert c.steps[0].action == "noop"
+
+def test_dot_ext_still_reads_as_keyword():
+    p = _search_params(plan_from_prompt("delete .doc files"))
+    assert p["patterns"] == ["*.doc", "*.docx"]
+
+def test_du_scope_hint_skips_time_and_amount_words():
+    def hint(prompt):
+        step = next(s for s in plan_from_prompt(prompt).steps if s.action == "disk_usage")
+        return step.params["scope_hint"]
+    assert hint("what's taking space in the last week") is None
+    assert hint("disk usage in total") is None
+    assert hint("largest folders in the last 30 days under ~/documents") == "~/documents"
+    assert hint("what's taking space in my downloads") == "downloads"
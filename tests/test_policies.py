@@ -15,3 +15,37 @@ def test_in_allowed_scopes(tmp_path):
 def test_requires_extra_confirmation():
     assert requires_extra_confirmation(Path(r"C:\Windows\System32\drivers\etc\hosts")) is True
     assert requires_extra_confirmation(Path(r"C:\Users\me\Downloads\file.txt")) is False
+
+def test_policy_engine_matches_functions(tmp_path):
+    from local_assist_agent.policies import PolicyEngine
+    from local_assist_agent.schemas import FileHit
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    inside = root / "sub" / "a.txt"; inside.write_text("x")
+    outside = tmp_path / "outside.txt"; outside.write_text("y")
+    risky = root / "sub" / ".ssh" / "id_rsa"
+
+    engine = PolicyEngine(scopes=[str(root)])
+    hits = [FileHit(inside, 0, 1), FileHit(outside, 0, 1), FileHit(risky, 0, 1)]
+    verdicts = engine.classify(hits)
+    assert [v.allowed for v in verdicts] == [True, False, True]
+    assert [v.risky for v in verdicts] == [False, False, True]
+    for h, v in zip(hits, verdicts):
+        assert v.risky == requires_extra_confirmation(h.path)
+
+    # patterns straddling the parent/name boundary still match
+    assert engine.is_risky(Path("/opt/binaries")) and requires_extra_confirmation(Path("/opt/binaries"))
+    assert engine.is_risky(Path(r"C:\Windows\System32\drivers\etc\hosts")) is True
+
+def test_policy_engine_resolves_symlinks_like_in_allowed_scopes(tmp_path):
+    from local_assist_agent.policies import PolicyEngine
+    root = tmp_path / "root"; root.mkdir()
+    target_out = tmp_path / "secret.txt"; target_out.write_text("s")
+    target_in = root / "b.txt"; target_in.write_text("b")
+    out_link = root / "out.lnk"; out_link.symlink_to(target_out)
+    in_link = tmp_path / "in.lnk"; in_link.symlink_to(target_in)
+
+    engine = PolicyEngine(scopes=[str(root)])
+    for p in (out_link, in_link, target_in, target_out):
+        assert engine.is_allowed(p) == in_allowed_scopes(p, scopes=[str(root)])
+    assert not engine.is_allowed(out_link) and engine.is_allowed(in_link)
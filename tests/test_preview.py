@@ -0,0 +1,66 @@
+import io, zipfile
+from rich.console import Console
+from local_assist_agent.skills import preview
+
+def _files(tmp_path):
+    txt = tmp_path / "notes.txt"
+    txt.write_text("first line\nsecond line\nthird\nfourth\nfifth\n", encoding="utf-8")
+    z = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(z, "w") as zf:
+        for n in ("a.txt", "b.txt", "c/d.txt"):
+            zf.writestr(n, "data " * 50)
+    exe = tmp_path / "setup.exe"
+    exe.write_bytes(b"MZ\x90\x00" + bytes(range(256)) * 4)
+    return txt, z, exe
+
+def test_inspect_kinds(tmp_path):
+    txt, z, exe = _files(tmp_path)
+    t = preview.inspect(txt, lines=2)
+    assert t["kind"] == "text" and t["text"] == ["first line", "second line"]
+    zi = preview.inspect(z)
+    assert zi["kind"] == "zip archive" and zi["members"] == 3
+    b = preview.inspect(exe)
+    assert b["text"] is None and b["hex"].startswith("4d 5a 90 00")
+    missing = preview.inspect(tmp_path / "gone.bin")
+    assert missing["error"]
+
+def test_inspect_many_keeps_order_and_renders(tmp_path):
+    paths = list(_files(tmp_path))
+    infos = preview.inspect_many(paths * 3, workers=4)
+    assert [i["path"] for i in infos] == [str(p) for p in paths * 3]
+
+    buf = io.StringIO()
+    preview.render_terminal(infos[:3], Console(file=buf, width=120))
+    out = buf.getvalue()
+    assert "3 member(s)" in out and "first line" in out and "notes.txt" in out
+
+def test_terminal_mode_opens_no_windows(tmp_path, monkeypatch):
+    paths = _files(tmp_path)
+    monkeypatch.setattr(preview, "_open_folder", lambda *a: (_ for _ in ()).throw(AssertionError("window")))
+    buf = io.StringIO()
+    res = preview.preview_paths(paths, mode="terminal", console=Console(file=buf, width=120))
+    assert res == (3, 0, None) and "setup.exe" in buf.getvalue()
+    assert preview.resolve_mode("grouped") == "grouped"
+
+def test_folders_are_summarized_not_read(tmp_path):
+    d = tmp_path / "big"
+    (d / "nested").mkdir(parents=True)
+    for n in ("b.bin", "a.txt"):
+        (d / n).write_bytes(b"x")
+    info = preview.inspect(d, lines=3)
+    assert info["kind"] == "folder" and not info["error"]
+    assert info["text"] == ["3 item(s)", "a.txt", "b.bin"]
+
+def test_terminal_preview_message_mentions_no_windows(tmp_path, monkeypatch, temp_logs):
+    import builtins
+    from local_assist_agent import executor as ex
+    from local_assist_agent.planner import plan_from_prompt
+    (tmp_path / "a.zip").write_bytes(b"PK")
+    buf = io.StringIO()
+    monkeypatch.setattr(ex, "_local_console", Console(file=buf, width=200))
+    answers = iter(["1"])
+    monkeypatch.setattr(builtins, "input", lambda: next(answers, ""))
+    ex.execute(plan_from_prompt("delete zip files"), do_execute=False, scopes=[str(tmp_path)], run_id="pv",
+               preview=True, preview_mode="terminal")
+    out = buf.getvalue()
+    assert "Preview: showed 1 item(s) above" in out and "window" not in out
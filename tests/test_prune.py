@@ -0,0 +1,79 @@
+import os
+from local_assist_agent.skills.files import find_recent
+from local_assist_agent.skills.prune import Pruner, compile_rules, _pruned
+from local_assist_agent.skills.scan import ScanStats
+
+def _touch(p):
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_bytes(b"x")
+
+def test_rules_are_gitignore_like():
+    rules = compile_rules(["# comment", "node_modules/", "build/out", "*.egg-info", "!keep.egg-info"])
+    assert _pruned(rules, "node_modules", "a/b/node_modules")
+    assert _pruned(rules, "out", "build/out") and not _pruned(rules, "out", "x/build/out")
+    assert _pruned(rules, "pkg.egg-info", "pkg.egg-info")
+    assert not _pruned(rules, "keep.egg-info", "keep.egg-info")
+    assert not _pruned(rules, "src", "src")
+
+def test_walk_skips_pruned_subtrees_and_counts_them(tmp_path):
+    root = tmp_path / "proj"
+    for rel in ("a.zip", "node_modules/dep/b.zip", "src/.git/objects/c.zip", "src/d.zip",
+                "vendor/e.zip", "vendor/keep/f.zip"):
+        _touch(root / rel)
+    (root / ".assistignore").write_text("vendor\n!keep\n", encoding="utf-8")
+
+    stats = ScanStats()
+    names = sorted(h.name for h in find_recent([str(root)], ["*.zip"], days=None, stats=stats))
+    assert names == ["a.zip", "d.zip"]
+    assert stats.pruned == 3  # node_modules, src/.git, vendor (keep is below vendor, never reached)
+
+    stats = ScanStats()
+    names = sorted(h.name for h in find_recent([str(root)], ["*.zip"], days=None, stats=stats, workers=3))
+    assert names == ["a.zip", "d.zip"] and stats.pruned == 3
+
+    assert len(find_recent([str(root)], ["*.zip"], days=None, prune=False)) == 6
+
+def test_scope_root_is_never_pruned(tmp_path):
+    nm = tmp_path / "node_modules"
+    _touch(nm / "x.zip")
+    _touch(nm / ".cache" / "y.zip")
+    hits = find_recent([str(nm)], ["*.zip"], days=None)
+    assert [h.name for h in hits] == ["x.zip"]
+    p = Pruner([os.path.realpath(nm)])
+    assert not p(os.path.realpath(nm / "src"), "src") and p(os.path.realpath(nm / ".cache"), ".cache")
+
+def test_index_answers_apply_the_same_prune_rules(tmp_path, monkeypatch):
+    from local_assist_agent.skills import files
+    monkeypatch.setattr(files, "INDEX_DB", tmp_path / "idx.sqlite3")
+    root = tmp_path / "proj"
+    for rel in ("a.zip", "node_modules/dep/b.zip", "src/d.zip", "vendor/e.zip"):
+        _touch(root / rel)
+    (root / ".assistignore").write_text("vendor\n", encoding="utf-8")
+    walked = sorted(h.name for h in find_recent([str(root)], ["*.zip"], days=None))
+    indexed = sorted(h.name for h in find_recent([str(root)], ["*.zip"], days=None, use_index=True))
+    assert walked == indexed == ["a.zip", "d.zip"]
+    assert len(find_recent([str(root)], ["*.zip"], days=None, use_index=True, prune=False)) == 4
+
+def test_indexed_refresh_never_lists_pruned_subtrees(tmp_path, monkeypatch):
+    import sqlite3
+    from local_assist_agent.skills import files
+    db = tmp_path / "idx.sqlite3"
+    monkeypatch.setattr(files, "INDEX_DB", db)
+    root = tmp_path / "proj"
+    for rel in ("a.zip", "node_modules/dep/b.zip", "src/d.zip"):
+        _touch(root / rel)
+
+    def indexed_dirs():
+        with sqlite3.connect(str(db)) as c:
+            return {os.path.relpath(r[0], root) for r in c.execute("SELECT path FROM dirs")}
+
+    stats = ScanStats()
+    assert len(find_recent([str(root)], ["*.zip"], days=None, use_index=True, stats=stats)) == 2
+    assert stats.pruned == 1 and stats.dirs == 2 and indexed_dirs() == {".", "src"}
+
+    # an unpruned search lists the skipped subtree, a pruned one drops it again
+    assert len(find_recent([str(root)], ["*.zip"], days=None, use_index=True, prune=False)) == 3
+    assert "node_modules/dep" in indexed_dirs()
+    stats = ScanStats()
+    assert len(find_recent([str(root)], ["*.zip"], days=None, use_index=True, stats=stats)) == 2
+    assert stats.pruned == 1 and not {"node_modules", "node_modules/dep"} & indexed_dirs()
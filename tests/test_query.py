@@ -0,0 +1,27 @@
+import os
+from local_assist_agent.skills.files import find_recent
+from local_assist_agent.skills.query import fold_patterns, normalize_scopes
+
+def test_normalize_scopes_drops_nested(tmp_path):
+    docs = tmp_path / "Documents"
+    (docs / "work").mkdir(parents=True)
+    dl = tmp_path / "Downloads"
+    dl.mkdir()
+    got = normalize_scopes([str(docs / "work"), str(docs), str(dl), str(tmp_path / "missing")])
+    assert got == [os.path.realpath(docs), os.path.realpath(dl)]
+
+def test_fold_patterns():
+    assert fold_patterns(["*.zip", "*", "*.exe"]) == ["*"]
+    assert fold_patterns(["*.zip", "*.ZIP", "*.zip"]) == ["*.zip", "*.ZIP"]
+    assert fold_patterns(["*.zip", "*.ZIP"], case_insensitive=True) == ["*.zip"]
+
+def test_overlapping_scopes_and_hardlinks_counted_once(tmp_path):
+    docs = tmp_path / "Documents"
+    work = docs / "work"
+    work.mkdir(parents=True)
+    (work / "a.zip").write_bytes(b"x" * 10)
+    os.link(work / "a.zip", docs / "a-link.zip")
+
+    hits = find_recent([str(docs), str(work)], patterns=["*", "*.zip"], days=None)
+    assert len(hits) == 1
+    assert sum(h.size for h in hits) == 10
@@ -0,0 +1,117 @@
+import builtins, json
+import pytest
+from local_assist_agent.skills import checkpoint, files, scan
+from local_assist_agent.skills.files import find_recent, iter_recent, save_checkpoint
+from local_assist_agent.skills.scan import Budget
+from local_assist_agent.planner import plan_from_prompt
+from local_assist_agent import executor as ex
+
+@pytest.fixture(autouse=True)
+def ckdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    return tmp_path / "checkpoints"
+
+def _tree(root, dirs=12, per=5):
+    for d in range(dirs):
+        for i in range(per):
+            p = root / f"d{d % 3}" / f"sub{d}" / f"f{i}.zip"
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_bytes(b"x" * (d + 1))
+    return dirs * per
+
+def test_deadline_zero_checkpoints_then_resume_completes(tmp_path, ckdir):
+    root = tmp_path / "scope"; total = _tree(root)
+    b = Budget(0)
+    assert find_recent([str(root)], ["*.zip"], days=None, budget=b) == []
+    assert b.truncated and b.pending and list(ckdir.glob("*.json"))
+
+    b2 = Budget(resume=True)
+    hits = find_recent([str(root)], ["*.zip"], days=None, budget=b2)
+    assert len(hits) == total and not b2.truncated
+    assert not list(ckdir.glob("*.json"))  # a finished search drops its checkpoint
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_cancel_midway_resume_gives_each_file_once(tmp_path, monkeypatch, workers):
+    root = tmp_path / "scope"; total = _tree(root)
+    (root / "top.zip").write_bytes(b"t"); total += 1
+    b = Budget()
+    real_scan = scan._scan_dir
+    def scan_then_cancel(*a):
+        out = real_scan(*a)
+        b.cancel()  # walkers stop before listing another directory
+        return out
+    monkeypatch.setattr(scan, "_scan_dir", scan_then_cancel)
+    got = list(iter_recent([str(root)], ["*.zip"], days=None, workers=workers, budget=b))
+    monkeypatch.setattr(scan, "_scan_dir", real_scan)
+    assert b.truncated and 0 < len(got) < total and len(b.pending) == 3
+    assert save_checkpoint(b, got)
+
+    rest = find_recent([str(root)], ["*.zip"], days=None, workers=workers, budget=Budget(resume=True))
+    paths = [h.fspath for h in rest]
+    assert len(paths) == len(set(paths)) == total
+    assert [h.mtime for h in rest] == sorted((h.mtime for h in rest), reverse=True)
+
+def test_ctrl_c_returns_partial_results(tmp_path, monkeypatch):
+    root = tmp_path / "scope"; total = _tree(root)
+    real_push, calls = files.NewestFirst.push, []
+    def push(self, h):
+        calls.append(h)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        real_push(self, h)
+    monkeypatch.setattr(files.NewestFirst, "push", push)
+    b = Budget()
+    hits = find_recent([str(root)], ["*.zip"], days=None, limit=1000, budget=b)
+    assert len(hits) == 2 and b.truncated and b.cancelled.is_set()
+    monkeypatch.setattr(files.NewestFirst, "push", real_push)
+    assert len(find_recent([str(root)], ["*.zip"], days=None, limit=1000, budget=Budget(resume=True))) == total
+
+def test_executor_records_truncated_search(tmp_path, monkeypatch, temp_logs):
+    root = tmp_path / "scope"; _tree(root)
+    monkeypatch.setattr(builtins, "input", lambda: "")
+    ex.execute(plan_from_prompt("delete zip files"), do_execute=False, scopes=[str(root)], run_id="dl",
+               search_opts={"deadline": 0})
+    _, jsonl = temp_logs
+    ev = [json.loads(l) for l in jsonl.read_text(encoding="utf-8").splitlines() if l.strip()]
+    res = next(e["data"] for e in ev if e.get("event") == "search.results")
+    assert res["complete"] is False and res["stopped_by"] == "deadline" and res["checkpoint"]
+
+def test_plain_search_never_touches_checkpoints(tmp_path, monkeypatch, temp_logs):
+    root = tmp_path / "scope"; _tree(root)
+    touched = []
+    for name in ("load", "save", "clear"):
+        monkeypatch.setattr(checkpoint, name, lambda *a, _n=name: touched.append(_n))
+    monkeypatch.setattr(builtins, "input", lambda: "")
+    ex.execute(plan_from_prompt("delete zip files"), do_execute=False, scopes=[str(root)], run_id="plain")
+    assert touched == []
+
+def test_restored_hits_obey_the_filters(tmp_path):
+    import time
+    from local_assist_agent.schemas import FileHit
+    root = tmp_path / "scope"; _tree(root)
+    b = Budget(0)
+    assert find_recent([str(root)], ["*.zip"], days=1, budget=b) == [] and b.key
+    now = time.time()
+    checkpoint.save(b.key, [], [FileHit(str(root / "fresh.zip"), mtime=now, size=1),
+                                FileHit(str(root / "stale.zip"), mtime=now - 5 * 86400, size=1)])
+    hits = find_recent([str(root)], ["*.zip"], days=1, budget=Budget(resume=True))
+    assert [h.name for h in hits] == ["fresh.zip"]
+
+def test_index_rejects_deadline_and_resume(tmp_path):
+    for b in (Budget(5), Budget(resume=True)):
+        with pytest.raises(ValueError):
+            find_recent([str(tmp_path)], ["*.zip"], use_index=True, budget=b)
+
+def test_configured_deadline_never_meets_the_index(tmp_path, monkeypatch, temp_logs):
+    root = tmp_path / "scope"; total = _tree(root)
+    monkeypatch.setattr(files, "SEARCH_DEADLINE_S", 60)
+    monkeypatch.setattr(files, "INDEX_DB", tmp_path / "idx.sqlite3")
+    assert files.search_deadline(None) == 60 and files.search_deadline(None, use_index=True) is None
+    monkeypatch.setattr(builtins, "input", lambda: "")
+    for opts in ({"use_index": True}, {"use_index": True, "deadline": 30}):
+        ex.execute(plan_from_prompt("delete zip files"), do_execute=False, scopes=[str(root)], run_id="cfg",
+                   search_opts=opts)
+    _, jsonl = temp_logs
+    ev = [json.loads(l) for l in jsonl.read_text(encoding="utf-8").splitlines() if l.strip()]
+    res = [e["data"] for e in ev if e.get("event") == "search.results"]
+    assert [r["count"] for r in res] == [total, total] and all(r["complete"] for r in res)
@@ -0,0 +1,66 @@
+import builtins, io, time
+from rich.console import Console
+from local_assist_agent.schemas import FileHit, HitView
+from local_assist_agent.skills.store import HitStore
+from local_assist_agent import executor as ex
+
+NOW = time.time()
+EXTS = [".zip", ".pdf", ".exe", ".txt"]
+
+def _hits(n=1000):
+    # newest first, as the search hands them over
+    return [FileHit(f"/d/{i % 7}/file{i:05d}{EXTS[i % 4]}", mtime=NOW - i * 3600, size=(i * 37) % 1000 * 1024)
+            for i in range(n)]
+
+def _views(n=1000):
+    hits = _hits(n)
+    store = HitStore.from_hits(hits)
+    return HitView(hits), HitView(store, store.all())
+
+def _run(view, answers, monkeypatch):
+    buf = io.StringIO()
+    monkeypatch.setattr(ex, "_local_console", Console(file=buf, width=200))
+    it = iter(answers)
+    monkeypatch.setattr(builtins, "input", lambda: next(it))
+    return ex._interactive_select(view, rows=20), buf.getvalue()
+
+def test_parse_ranges_merge_and_clip():
+    assert ex._parse_ranges("1-5000, 3, 7-9, x, 10", 8) == [(0, 8)]
+    assert ex._parse_ranges("2,4-5,5-6", 100) == [(1, 2), (3, 6)]
+    assert ex._parse_numbers("1,3-5", 4) == [0, 2, 3]
+
+def test_only_visible_page_is_rendered(monkeypatch):
+    for view in _views():
+        chosen, out = _run(view, ["n", "page"], monkeypatch)
+        assert "page 2/50" in out and "file00020" in out and "file00040" not in out
+        assert [h.name for h in chosen] == [h.name for h in view[20:40]]
+
+def test_range_selection_is_index_slices(monkeypatch):
+    for view in _views():
+        chosen, _ = _run(view, ["1-500,990-5000"], monkeypatch)
+        assert len(chosen) == 511 and chosen[0] == view[0] and chosen[-1] == view[999]
+
+def test_sort_and_filter_without_rescan(monkeypatch):
+    for view in _views():
+        chosen, out = _run(view, ["filter ext:zip >500kb", "sort size", "all"], monkeypatch)
+        assert chosen and all(h.name.endswith(".zip") and h.size >= 500 * 1024 for h in chosen)
+        assert [h.size for h in chosen] == sorted((h.size for h in chosen), reverse=True)
+        assert "size first" in out
+
+        chosen, _ = _run(view, ["filter older:30", "sort oldest", "clear", "1"], monkeypatch)
+        assert [h.name for h in chosen] == [view[0].name]
+
+def test_filter_by_name_and_cancel(monkeypatch):
+    for view in _views():
+        chosen, _ = _run(view, ["filter name:file0001", "all"], monkeypatch)
+        assert len(chosen) == 10
+        chosen, out = _run(view, ["filter bogus", "sort nope", ""], monkeypatch)
+        assert len(chosen) == 0 and "Unknown filter" in out and "Unrecognized" in out
+
+def test_paging_records_one_render_span(monkeypatch):
+    from local_assist_agent import tracing
+    spans = []
+    monkeypatch.setattr(tracing, "record", lambda name, s, **a: spans.append((name, a)))
+    view, _ = _views()
+    _run(view, ["n", "n", "p", "go 7", "all"], monkeypatch)
+    assert spans == [("render", {"rows": 20, "pages": 5, "total": 1000})]
@@ -0,0 +1,94 @@
+import json, threading
+from local_assist_agent import server, client
+
+def test_run_round_trips_confirmations(tmp_path, temp_logs, monkeypatch):
+    (tmp_path / "files").mkdir()
+    (tmp_path / "files" / "pickme.zip").write_text("x")
+    sock = tmp_path / "agent.sock"
+    srv = server.AgentServer(sock, scopes=[str(tmp_path / "files")], use_index=False)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    try:
+        assert client.request(client.connect(sock), {"op": "ping"})["requests"] == 1
+
+        asked, out = [], []
+        answers = iter(["1", "I UNDERSTAND"])
+        def ask(prompt):
+            asked.append(prompt)
+            return next(answers)
+        client.request(client.connect(sock), {"op": "run", "prompt": "delete zip files"},
+                       out=out.append, ask=ask)
+        text = "".join(out)
+        assert asked[0].startswith("Select numbers")
+        assert "pickme.zip" in text and "Dry-run" in text
+
+        # the engine for this scope set is kept warm across requests
+        eng = srv.policy([str(tmp_path / "files")])
+        assert srv.policy([str(tmp_path / "files")]) is eng
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    assert not sock.exists()
+    assert client.connect(sock) is None
+
+def test_claim_socket_removes_stale_file(tmp_path):
+    p = tmp_path / "stale.sock"
+    p.write_text("")
+    server._claim_socket(str(p))
+    assert not p.exists()
+
+def test_relative_scopes_resolve_in_the_client_directory(tmp_path, monkeypatch, capsys):
+    import os, subprocess, sys, time, builtins
+    from pathlib import Path
+    root = Path(__file__).resolve().parents[1]
+    for where, name in (("client", "mine.zip"), ("server", "theirs.zip")):
+        (tmp_path / where / "dl").mkdir(parents=True)
+        (tmp_path / where / "dl" / name).write_text("x")
+    sock = tmp_path / "agent.sock"
+    code = ("import sys; from local_assist_agent.server import serve; "
+            "serve(scopes=[], path=sys.argv[1], use_index=False, watch=False)")
+    env = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=str(root))
+    proc = subprocess.Popen([sys.executable, "-c", code, str(sock)], cwd=tmp_path / "server", env=env)
+    try:
+        for _ in range(200):
+            if client.connect(sock) is not None:
+                break
+            time.sleep(0.05)
+        monkeypatch.chdir(tmp_path / "client")
+        monkeypatch.setattr(builtins, "input", lambda: "")
+        assert client.run_remote("delete zip files", scopes=["dl"], path=sock)
+        out = capsys.readouterr().out
+        assert "mine.zip" in out and "theirs.zip" not in out
+    finally:
+        client.request(client.connect(sock), {"op": "stop"})
+        proc.wait(timeout=10)
+
+def test_warm_index_only_when_no_walk_option_needs_a_walk(tmp_path):
+    srv = server.AgentServer(tmp_path / "agent.sock", scopes=[str(tmp_path)], use_index=True)
+    try:
+        assert srv._search_opts({"search_opts": {"workers": 2}}) == {"workers": 2, "use_index": True}
+        assert srv._search_opts({"search_opts": {"deadline": 5}}) == {"deadline": 5}
+        assert srv._search_opts({"search_opts": {"resume": True, "use_index": False}}) == \
+            {"resume": True, "use_index": False}
+    finally:
+        srv.server_close()
+
+def test_cli_reports_server_errors_cleanly(tmp_path, monkeypatch, capsys):
+    import functools, sys, pytest
+    import assist_agent
+    sock = tmp_path / "agent.sock"
+    srv = server.AgentServer(sock, scopes=[str(tmp_path)], use_index=False)
+    monkeypatch.setattr(srv, "dispatch", lambda req, sess: (_ for _ in ()).throw(RuntimeError("index is locked")))
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    try:
+        monkeypatch.setattr(client, "run_remote", functools.partial(client.run_remote, path=sock))
+        monkeypatch.setattr(sys, "argv", ["assist_agent.py", "delete zip files"])
+        with pytest.raises(SystemExit) as exc:
+            assist_agent.main()
+        assert exc.value.code == 1
+        err = capsys.readouterr().err
+        assert "Agent server error: RuntimeError: index is locked" in err and "Traceback" not in err
+    finally:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,28 @@
+import time
+from pathlib import Path
+from local_assist_agent.schemas import FileHit
+from local_assist_agent.skills.store import HitStore
+
+def _store():
+    now = time.time()
+    return HitStore.from_hits([
+        FileHit(Path("/d/a.zip"), now - 3600, 5_000),
+        FileHit(Path("/d/b.ZIP"), now - 10 * 86400, 1_000),
+        FileHit(Path("/d/c.pdf"), now - 400 * 86400, 20_000),
+        FileHit(Path("/d/README"), now - 2 * 86400, 10),
+    ]), now
+
+def test_filter_is_index_view():
+    store, now = _store()
+    idx = store.filter(newer_cutoff=now - 30 * 86400, min_bytes=500)
+    assert [store.path_of(i) for i in store.newest_first(idx)] == ["/d/a.zip", "/d/b.ZIP"]
+    assert [store.path_of(i) for i in store.filter(exts=["zip"])] == ["/d/a.zip", "/d/b.ZIP"]
+
+def test_usage_report_histograms():
+    store, _ = _store()
+    rep = store.usage_report()
+    assert rep["count"] == 4 and rep["bytes"] == 26_010
+    assert rep["by_ext"][0] == (".pdf", 1, 20_000)
+    assert (".zip", 2, 6_000) in rep["by_ext"]
+    ages = dict((label, (n, b)) for label, n, b in rep["by_age"])
+    assert ages["< 1 day"] == (1, 5_000) and ages["> 1 year"] == (1, 20_000)
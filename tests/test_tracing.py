@@ -0,0 +1,34 @@
+import builtins, json, time
+from local_assist_agent import tracing
+from local_assist_agent.main import run
+
+def _events(jsonl):
+    return [json.loads(l) for l in jsonl.read_text(encoding="utf-8").splitlines() if l.strip()]
+
+def test_spans_nest_and_separate_wait(temp_logs):
+    _, jsonl = temp_logs
+    with tracing.span("outer", "r1"):
+        with tracing.span("inner", kind="x"):
+            with tracing.waiting():
+                time.sleep(0.05)
+        for _ in tracing.timed_iter("producer", iter(range(3))):
+            time.sleep(0.02)  # consumer time, not charged to the producer
+    tracing.L.flush()
+    spans = {e["data"]["name"]: e["data"] for e in _events(jsonl) if e["event"] == "span"}
+    assert spans["inner"]["parent"] == spans["outer"]["id"] and spans["inner"]["kind"] == "x"
+    assert spans["outer"]["wait_ms"] >= 50 and spans["outer"]["machine_ms"] < spans["outer"]["wall_ms"]
+    assert spans["producer"]["items"] == 3 and spans["producer"]["wall_ms"] < 20
+
+def test_run_records_search_counts_and_profile(tmp_path, temp_logs, monkeypatch):
+    _, jsonl = temp_logs
+    (tmp_path / "a.zip").write_text("x")
+    monkeypatch.setattr(builtins, "input", lambda: "")
+    prefix = tmp_path / "prof"
+    with tracing.profile(str(prefix)):
+        run("delete zip files", scopes=[str(tmp_path)])
+    ev = _events(jsonl)
+    res = next(e["data"] for e in ev if e["event"] == "search.results")
+    assert res["files"] >= 1 and res["dirs"] >= 1 and "duration_ms" in res
+    names = {e["data"]["name"] for e in ev if e["event"] == "span"}
+    assert {"plan", "execute", "search", "search.root", "policy", "render"} <= names
+    assert (tmp_path / "prof.prof").stat().st_size > 0 and (tmp_path / "prof.folded").exists()
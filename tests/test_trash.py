@@ -0,0 +1,69 @@
+import os
+import pytest
+from local_assist_agent.skills import trash
+from local_assist_agent.skills.files import move_to_trash
+
+pytestmark = pytest.mark.skipif(not trash.SUPPORTED, reason="freedesktop trash only")
+
+def test_bulk_trash_renames_and_writes_trashinfo(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "xdg"))
+    src = tmp_path / "Downloads"
+    (src / "a").mkdir(parents=True)
+    (src / "b").mkdir()
+    f1 = src / "a" / "setup.exe"; f1.write_bytes(b"1")
+    f2 = src / "b" / "setup.exe"; f2.write_bytes(b"2")   # same name -> unique trash name
+    missing = src / "gone.zip"
+
+    ok, errs, outcomes = move_to_trash([f1, missing, f2])
+
+    assert ok == 2 and len(errs) == 1 and "gone.zip" in errs[0]
+    assert [o["ok"] for o in outcomes] == [True, False, True]
+    assert not f1.exists() and not f2.exists()
+    tdir = tmp_path / "xdg" / "Trash"
+    assert sorted(os.listdir(tdir / "files")) == ["setup.2.exe", "setup.exe"]
+    info = (tdir / "info" / "setup.exe.trashinfo").read_text()
+    assert info.startswith("[Trash Info]\n") and f"Path={f1}" in info
+    assert (tdir / "files" / "setup.2.exe").read_bytes() == b"2"
+
+def test_undecodable_names_duplicates_and_failed_records(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "xdg"))
+    src = tmp_path / "Downloads"; src.mkdir()
+    raw = os.path.join(os.fsencode(src), b"bad\xff.bin")
+    with open(raw, "wb") as f:
+        f.write(b"x")
+    odd = os.fsdecode(raw)  # surrogate-escaped str
+    good = src / "good.zip"; good.write_bytes(b"g")
+
+    ok, errs, outcomes = trash.bulk_trash([odd, good, good], fallback=None)
+    assert [o["ok"] for o in outcomes] == [True, True, False] and ok == 2
+    tdir = tmp_path / "xdg" / "Trash"
+    info = os.path.join(os.fsencode(tdir / "info"), b"bad\xff.bin.trashinfo")
+    with open(info, "rb") as f:
+        assert b"Path=" + os.fsencode(str(src)) + b"/bad%FF.bin" in f.read()
+
+    # a record that cannot be written leaves no empty .trashinfo behind and spares the rest
+    a = src / "a.txt"; a.write_text("a")
+    b = src / "b.txt"; b.write_text("b")
+    real = trash.quote
+    monkeypatch.setattr(trash, "quote", lambda s: (_ for _ in ()).throw(ValueError("boom")) if b"a.txt" in s else real(s))
+    ok, errs, outcomes = trash.bulk_trash([a, b], fallback=None)
+    assert [o["ok"] for o in outcomes] == [False, True] and "boom" in errs[0]
+    assert a.exists() and not os.path.exists(tdir / "info" / "a.txt.trashinfo")
+
+def test_orphaned_trashed_file_is_not_overwritten(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "xdg"))
+    files = tmp_path / "xdg" / "Trash" / "files"; files.mkdir(parents=True)
+    (files / "a.txt").write_text("orphan")  # no matching .trashinfo
+    src = tmp_path / "a.txt"; src.write_text("new")
+    ok, errs, _ = trash.bulk_trash([src], fallback=None)
+    assert ok == 1 and not errs
+    assert (files / "a.txt").read_text() == "orphan" and (files / "a.2.txt").read_text() == "new"
+    assert sorted(os.listdir(files.parent / "info")) == ["a.2.txt.trashinfo"]
+
+def test_private_trash_must_be_our_own_directory(tmp_path):
+    elsewhere = tmp_path / "elsewhere"; elsewhere.mkdir()
+    link = tmp_path / f".Trash-{os.getuid()}"; link.symlink_to(elsewhere)
+    with pytest.raises(PermissionError):
+        trash._ensure_trash(str(link), private=True)
+    assert not (elsewhere / "files").exists()
+    assert trash._ensure_trash(str(tmp_path / "own"), private=True)
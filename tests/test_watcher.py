@@ -0,0 +1,44 @@
+import os, sys, time
+import pytest
+from local_assist_agent.skills.index import open_index, query
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+
+def _names(conn, root, pats=("*",)):
+    return sorted(os.path.basename(r[0]) for r in query(conn, [str(root)], list(pats)))
+
+def test_watcher_mirrors_events_into_index(tmp_path, temp_logs, monkeypatch):
+    from local_assist_agent.watcher import ScopeWatcher, IN_Q_OVERFLOW, _EVENT
+    root = tmp_path / "Downloads"
+    root.mkdir()
+    (root / "old.exe").write_bytes(b"x")
+    conn = open_index(tmp_path / "idx.sqlite3")
+    w = ScopeWatcher(conn, str(root))
+    w.start()
+    try:
+        assert _names(conn, root) == ["old.exe"]
+
+        (root / "setup.exe").write_bytes(b"x")
+        (root / "sub").mkdir()
+        (root / "old.exe").unlink()
+        time.sleep(0.05)
+        w.handle()
+        (root / "sub" / "nested.zip").write_bytes(b"z")
+        time.sleep(0.05)
+        w.handle()
+        assert _names(conn, root) == ["nested.zip", "setup.exe"]
+
+        # Overflow: the kernel queues IN_Q_OVERFLOW (wd -1) ahead of what it kept;
+        # lost events are recovered by rescanning the scope in the same transaction
+        (root / "missed.exe").write_bytes(b"x")
+        time.sleep(0.05)
+        real_read, queued = os.read, [_EVENT.pack(-1, IN_Q_OVERFLOW, 0, 0)]
+        monkeypatch.setattr(os, "read", lambda fd, n: (queued.pop() if queued and fd == w.fd else b"") + real_read(fd, n))
+        assert w.handle() >= 2
+        assert not conn.in_transaction and w.overflows == 1
+        other = open_index(tmp_path / "idx.sqlite3")
+        assert "missed.exe" in _names(other, root, ["*.exe"])  # committed, not just visible to us
+        other.close()
+    finally:
+        w.close()
+        conn.close()